@@ -0,0 +1,442 @@
+import asyncio
+import contextlib
+from abc import ABC, abstractmethod
+from typing import AsyncIterator, Awaitable, Callable, Final, override
+
+import psycopg
+from psycopg import sql
+
+from centralserver.internals.adapters.config import (
+    BackplaneAdapterConfig,
+    LocalBackplaneAdapterConfig,
+    PostgresBackplaneAdapterConfig,
+    UnixSocketBackplaneAdapterConfig,
+)
+from centralserver.internals.logger import LoggerFactory
+
+logger = LoggerFactory().get_logger(__name__)
+
+# PostgreSQL rejects NOTIFY payloads of 8000 bytes or more.
+POSTGRES_MAX_PAYLOAD_SIZE: Final[int] = 7999
+# How long a worker waits for the Unix socket broker when starting up.
+UNIX_SOCKET_START_TIMEOUT: Final[float] = 5.0
+# How many payloads the broker queues for a worker before disconnecting it.
+UNIX_SOCKET_PEER_QUEUE_SIZE: Final[int] = 1024
+# The largest payload in bytes that can be sent through the Unix socket broker.
+UNIX_SOCKET_MAX_PAYLOAD_SIZE: Final[int] = 1024 * 1024
+
+BackplaneHandler = Callable[[str], Awaitable[None]]
+
+
+class BackplaneAdapter(ABC):
+    """Relays WebSocket messages between the server's worker processes.
+
+    Every payload published by a worker is delivered to the handler of every
+    other worker, and may also be delivered back to the publisher. Payloads
+    must not contain newlines, nor be larger than `max_payload_size` bytes.
+    """
+
+    # The largest payload in bytes that can be published, or None if unlimited
+    max_payload_size: int | None = None
+
+    @abstractmethod
+    async def start(self, handler: BackplaneHandler) -> None:
+        """Start receiving payloads from the other workers.
+
+        Args:
+            handler: The coroutine to call with each received payload.
+        """
+
+    @abstractmethod
+    async def stop(self) -> None:
+        """Stop receiving payloads and release the connections."""
+
+    @abstractmethod
+    async def publish(self, payload: str) -> None:
+        """Publish a payload to the other workers.
+
+        Args:
+            payload: The serialized message.
+        """
+
+
+class LocalBackplaneAdapter(BackplaneAdapter):
+    """A backplane for a single worker process, which has nothing to relay."""
+
+    def __init__(self, config: LocalBackplaneAdapterConfig) -> None:
+        self.config = config
+
+    @override
+    async def start(self, handler: BackplaneHandler) -> None:
+        logger.debug("Using the local WebSocket backplane.")
+
+    @override
+    async def stop(self) -> None:
+        pass
+
+    @override
+    async def publish(self, payload: str) -> None:
+        pass
+
+
+class PostgresBackplaneAdapter(BackplaneAdapter):
+    """A backplane using PostgreSQL LISTEN/NOTIFY.
+
+    Payloads of 8000 bytes or more cannot be sent with NOTIFY and are only
+    delivered to the publishing worker's own connections.
+    """
+
+    max_payload_size = POSTGRES_MAX_PAYLOAD_SIZE
+
+    def __init__(self, config: PostgresBackplaneAdapterConfig) -> None:
+        self.config = config
+        self._handler: BackplaneHandler | None = None
+        self._listener: asyncio.Task[None] | None = None
+        self._publisher: psycopg.AsyncConnection[tuple[object, ...]] | None = None
+        self._publish_lock = asyncio.Lock()
+
+    @override
+    async def start(self, handler: BackplaneHandler) -> None:
+        self._handler = handler
+        self._listener = asyncio.create_task(self._listen())
+
+    @override
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._listener
+
+            self._listener = None
+
+        if self._publisher is not None:
+            await self._publisher.close()
+            self._publisher = None
+
+    @override
+    async def publish(self, payload: str) -> None:
+        if len(payload.encode("utf-8")) > POSTGRES_MAX_PAYLOAD_SIZE:
+            logger.warning(
+                "WebSocket message of %d bytes is too large for the PostgreSQL backplane",
+                len(payload.encode("utf-8")),
+            )
+            return
+
+        async with self._publish_lock:
+            if self._publisher is None or self._publisher.closed:
+                self._publisher = await psycopg.AsyncConnection.connect(
+                    self.config.conninfo, autocommit=True
+                )
+
+            try:
+                await self._publisher.execute(
+                    "SELECT pg_notify(%s, %s)", (self.config.channel, payload)
+                )
+
+            except psycopg.OperationalError:
+                # Reconnect on the next publish.
+                await self._publisher.close()
+                raise
+
+    async def _listen(self) -> None:
+        """LISTEN on the channel, reconnecting whenever the connection is lost."""
+
+        while True:
+            try:
+                async with await psycopg.AsyncConnection.connect(
+                    self.config.conninfo, autocommit=True
+                ) as conn:
+                    await conn.execute(
+                        sql.SQL("LISTEN {}").format(sql.Identifier(self.config.channel))
+                    )
+                    logger.info(
+                        "Listening on PostgreSQL backplane channel %s",
+                        self.config.channel,
+                    )
+                    async for notify in conn.notifies():
+                        if self._handler is not None:
+                            await self._handler(notify.payload)
+
+            except asyncio.CancelledError:
+                raise
+
+            except Exception as e:
+                logger.error("PostgreSQL backplane listener failed: %s", e)
+
+            await asyncio.sleep(self.config.reconnect_interval)
+
+
+async def _read_payloads(reader: asyncio.StreamReader) -> AsyncIterator[bytes]:
+    """Read newline-terminated payloads until the connection is closed.
+
+    Payloads larger than `UNIX_SOCKET_MAX_PAYLOAD_SIZE` are skipped without
+    closing the connection.
+
+    Args:
+        reader: A reader opened with `UNIX_SOCKET_MAX_PAYLOAD_SIZE` as its limit.
+
+    Yields:
+        Each payload, including its terminating newline.
+    """
+
+    while True:
+        try:
+            yield await reader.readuntil(b"\n")
+
+        except asyncio.IncompleteReadError:
+            return
+
+        except asyncio.LimitOverrunError as e:
+            logger.warning(
+                "Dropping a WebSocket backplane payload larger than %d bytes",
+                UNIX_SOCKET_MAX_PAYLOAD_SIZE,
+            )
+            # Discard the payload up to and including its newline.
+            consumed = e.consumed
+            while True:
+                await reader.readexactly(consumed)
+                try:
+                    await reader.readuntil(b"\n")
+                    break
+
+                except asyncio.LimitOverrunError as overrun:
+                    consumed = overrun.consumed
+
+
+class UnixSocketBroker:
+    """Relays newline-delimited payloads between clients of a Unix socket.
+
+    Every client has its own send queue and writer task, so a slow client
+    never delays the others. A client whose queue fills up is disconnected
+    and has to reconnect.
+    """
+
+    def __init__(
+        self, socket_path: str, queue_size: int = UNIX_SOCKET_PEER_QUEUE_SIZE
+    ) -> None:
+        self.socket_path = socket_path
+        self.queue_size = queue_size
+        self._server: asyncio.Server | None = None
+        self._clients: dict[asyncio.StreamWriter, asyncio.Queue[bytes]] = {}
+
+    async def start(self) -> None:
+        """Bind the socket and start accepting clients."""
+
+        self._server = await asyncio.start_unix_server(
+            self._handle_client,
+            path=self.socket_path,
+            limit=UNIX_SOCKET_MAX_PAYLOAD_SIZE,
+        )
+        logger.info("WebSocket backplane broker listening on %s", self.socket_path)
+
+    async def stop(self) -> None:
+        """Disconnect every client and stop accepting new ones."""
+
+        if self._server is not None:
+            self._server.close()
+
+        for writer in list(self._clients):
+            self._disconnect(writer)
+
+        self._clients.clear()
+        self._server = None
+
+    async def _handle_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Forward each line received from a client to the other clients."""
+
+        queue: asyncio.Queue[bytes] = asyncio.Queue(self.queue_size)
+        self._clients[writer] = queue
+        sender = asyncio.create_task(self._send_to_client(writer, queue))
+        try:
+            async for line in _read_payloads(reader):
+                for client, client_queue in list(self._clients.items()):
+                    if client is writer:
+                        continue
+
+                    try:
+                        client_queue.put_nowait(line)
+
+                    except asyncio.QueueFull:
+                        logger.warning(
+                            "Disconnecting a WebSocket backplane client that is too slow"
+                        )
+                        self._disconnect(client)
+
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+
+        finally:
+            sender.cancel()
+            self._disconnect(writer)
+
+    async def _send_to_client(
+        self, writer: asyncio.StreamWriter, queue: asyncio.Queue[bytes]
+    ) -> None:
+        """Write the payloads queued for a client until it is disconnected."""
+
+        try:
+            while True:
+                writer.write(await queue.get())
+                await writer.drain()
+
+        except (ConnectionError, RuntimeError):
+            self._disconnect(writer)
+
+    def _disconnect(self, writer: asyncio.StreamWriter) -> None:
+        """Stop relaying to a client and close its connection."""
+
+        self._clients.pop(writer, None)
+        writer.close()
+
+
+class UnixSocketBackplaneAdapter(BackplaneAdapter):
+    """A backplane using a broker on a local Unix socket.
+
+    This works for workers on the same machine without any external service.
+    If no broker is listening and `host_broker` is set, the first worker to
+    notice starts one inside its own process.
+    """
+
+    max_payload_size = UNIX_SOCKET_MAX_PAYLOAD_SIZE
+
+    def __init__(self, config: UnixSocketBackplaneAdapterConfig) -> None:
+        self.config = config
+        self.broker: UnixSocketBroker | None = None
+        self._handler: BackplaneHandler | None = None
+        self._reader_task: asyncio.Task[None] | None = None
+        self._writer: asyncio.StreamWriter | None = None
+        self._connected = asyncio.Event()
+
+    @override
+    async def start(self, handler: BackplaneHandler) -> None:
+        self._handler = handler
+        self._reader_task = asyncio.create_task(self._run())
+        try:
+            await asyncio.wait_for(
+                self._connected.wait(), timeout=UNIX_SOCKET_START_TIMEOUT
+            )
+
+        except asyncio.TimeoutError:
+            logger.warning(
+                "WebSocket backplane broker is not available yet; retrying in the background"
+            )
+
+    @override
+    async def stop(self) -> None:
+        if self._reader_task is not None:
+            self._reader_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._reader_task
+
+            self._reader_task = None
+
+        if self.broker is not None:
+            await self.broker.stop()
+            self.broker = None
+
+    @override
+    async def publish(self, payload: str) -> None:
+        if self._writer is None:
+            logger.debug("WebSocket backplane is not connected; message not relayed")
+            return
+
+        if len(payload.encode("utf-8")) > UNIX_SOCKET_MAX_PAYLOAD_SIZE:
+            logger.warning(
+                "WebSocket message of %d bytes is too large for the Unix socket backplane",
+                len(payload.encode("utf-8")),
+            )
+            return
+
+        self._writer.write(payload.encode("utf-8") + b"\n")
+        await self._writer.drain()
+
+    async def _open(self) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        """Connect to the broker, starting one if needed and allowed."""
+
+        path = str(self.config.socket_path)
+        try:
+            return await asyncio.open_unix_connection(
+                path, limit=UNIX_SOCKET_MAX_PAYLOAD_SIZE
+            )
+
+        except (FileNotFoundError, ConnectionRefusedError):
+            if not self.config.host_broker:
+                raise
+
+        broker = UnixSocketBroker(path)
+        try:
+            await broker.start()
+
+        except OSError:
+            # Either another worker won the race to start the broker, or the
+            # socket file was left behind by a broker that is no longer running.
+            try:
+                return await asyncio.open_unix_connection(
+                    path, limit=UNIX_SOCKET_MAX_PAYLOAD_SIZE
+                )
+
+            except ConnectionRefusedError:
+                logger.warning("Removing stale WebSocket backplane socket %s", path)
+                self.config.socket_path.unlink(missing_ok=True)
+                await broker.start()
+
+        self.broker = broker
+        return await asyncio.open_unix_connection(
+            path, limit=UNIX_SOCKET_MAX_PAYLOAD_SIZE
+        )
+
+    async def _run(self) -> None:
+        """Read payloads from the broker, reconnecting whenever it is lost."""
+
+        while True:
+            writer: asyncio.StreamWriter | None = None
+            try:
+                reader, writer = await self._open()
+                self._writer = writer
+                self._connected.set()
+                async for line in _read_payloads(reader):
+                    if self._handler is not None:
+                        await self._handler(line.decode("utf-8").rstrip("\n"))
+
+                logger.warning("Lost connection to the WebSocket backplane broker")
+
+            except asyncio.CancelledError:
+                raise
+
+            except Exception as e:
+                logger.error("WebSocket backplane connection failed: %s", e)
+
+            finally:
+                self._writer = None
+                if writer is not None:
+                    writer.close()
+
+            await asyncio.sleep(self.config.reconnect_interval)
+
+
+async def get_backplane_handler(conf: BackplaneAdapterConfig) -> BackplaneAdapter:
+    """Get the appropriate backplane adapter based on the configuration.
+
+    Args:
+        The backplane adapter configuration.
+
+    Returns:
+        The backplane adapter instance.
+    """
+
+    if isinstance(conf, LocalBackplaneAdapterConfig):
+        return LocalBackplaneAdapter(conf)
+
+    elif isinstance(conf, PostgresBackplaneAdapterConfig):
+        logger.debug("Using PostgreSQL WebSocket backplane.")
+        return PostgresBackplaneAdapter(conf)
+
+    elif isinstance(conf, UnixSocketBackplaneAdapterConfig):
+        logger.debug("Using Unix socket WebSocket backplane.")
+        return UnixSocketBackplaneAdapter(conf)
+
+    else:
+        logger.error("Invalid backplane configuration.")
+        raise ValueError("Invalid backplane configuration.")
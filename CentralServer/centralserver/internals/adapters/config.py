@@ -232,17 +232,44 @@ class PostgreSQLDatabaseConfig(DatabaseAdapterConfig):
 
 ##### Object Store Adapter Configurations #####
 
+# The ways downloads from S3-compatible object stores can be served
+PRESIGNED_DOWNLOAD_MODES = ("off", "redirect")
+
 
 class ObjectStoreAdapterConfig(ABC):
     """Superclass for object store configurations."""
 
+    # Only S3-compatible object stores can serve downloads directly.
+    presigned_downloads: str = "off"
+    presigned_expiry: int = 300
+
     def __init__(
         self,
         max_file_size: int | None = None,
         min_image_size: int | None = None,
         allowed_image_types: set[str] | None = None,
+        io_workers: int | None = None,
+        image_workers: int | None = None,
+        image_timeout: float | None = None,
+        max_image_pixels: int | None = None,
+        cache_size: int | None = None,
+        cache_max_object_size: int | None = None,
+        cache_buckets: set[str] | None = None,
     ):
-        """Adapter configuration for object store."""
+        """Adapter configuration for object store.
+
+        Args:
+            max_file_size: The maximum size of an uploaded image in bytes. (default: 2 MB)
+            min_image_size: The minimum width of an avatar in pixels. (default: 256)
+            allowed_image_types: The accepted image formats.
+            io_workers: The number of threads doing blocking object store I/O. (default: 8)
+            image_workers: The number of processes decoding and resizing images. (default: 2)
+            image_timeout: The number of seconds an image may take to process. (default: 10.0)
+            max_image_pixels: The maximum number of pixels of an uploaded image. (default: 40000000)
+            cache_size: The number of bytes of objects cached in memory, or 0 to disable the cache. (default: 16 MB)
+            cache_max_object_size: The size in bytes of the largest object to cache. (default: 1 MB)
+            cache_buckets: The buckets whose objects are cached. (default: avatars, esignatures, school_logos)
+        """
 
         self.max_file_size: int = max_file_size or 2097152  # Default to 2 MB
         self.min_image_size: int = min_image_size or 256  # Minimum image size in pixels
@@ -252,6 +279,15 @@ class ObjectStoreAdapterConfig(ABC):
             "jpg",
             "webp",
         }
+        self.io_workers: int = io_workers or 8
+        self.image_workers: int = image_workers or 2
+        self.image_timeout: float = image_timeout or 10.0
+        self.max_image_pixels: int = max_image_pixels or 40_000_000
+        self.cache_size: int = cache_size if cache_size is not None else 16777216
+        self.cache_max_object_size: int = cache_max_object_size or 1048576
+        self.cache_buckets: set[str] = set(
+            cache_buckets or {"avatars", "esignatures", "school_logos"}
+        )
 
     @property
     @abstractmethod
@@ -271,12 +307,26 @@ class LocalObjectStoreAdapterConfig(ObjectStoreAdapterConfig):
         max_file_size: int | None = None,
         min_image_size: int | None = None,
         allowed_image_types: set[str] | None = None,
+        io_workers: int | None = None,
+        image_workers: int | None = None,
+        image_timeout: float | None = None,
+        max_image_pixels: int | None = None,
+        cache_size: int | None = None,
+        cache_max_object_size: int | None = None,
+        cache_buckets: set[str] | None = None,
         filepath: str | None = None,
     ) -> None:
         super().__init__(
             max_file_size=max_file_size,
             min_image_size=min_image_size,
             allowed_image_types=allowed_image_types,
+            io_workers=io_workers,
+            image_workers=image_workers,
+            image_timeout=image_timeout,
+            max_image_pixels=max_image_pixels,
+            cache_size=cache_size,
+            cache_max_object_size=cache_max_object_size,
+            cache_buckets=cache_buckets,
         )
         self.filepath: Path = Path(filepath or os.path.join(os.getcwd(), "data"))
 
@@ -296,6 +346,13 @@ class LocalObjectStoreAdapterConfig(ObjectStoreAdapterConfig):
             "max_file_size": self.max_file_size,
             "min_image_size": self.min_image_size,
             "allowed_image_types": list(self.allowed_image_types),
+            "io_workers": self.io_workers,
+            "image_workers": self.image_workers,
+            "image_timeout": self.image_timeout,
+            "max_image_pixels": self.max_image_pixels,
+            "cache_size": self.cache_size,
+            "cache_max_object_size": self.cache_max_object_size,
+            "cache_buckets": list(self.cache_buckets),
             "filepath": str(self.filepath),
         }
 
@@ -308,10 +365,24 @@ class MinIOObjectStoreAdapterConfig(ObjectStoreAdapterConfig):
         max_file_size: int | None = None,
         min_image_size: int | None = None,
         allowed_image_types: set[str] | None = None,
+        io_workers: int | None = None,
+        image_workers: int | None = None,
+        image_timeout: float | None = None,
+        max_image_pixels: int | None = None,
+        cache_size: int | None = None,
+        cache_max_object_size: int | None = None,
+        cache_buckets: set[str] | None = None,
         access_key: str | None = None,
         secret_key: str | None = None,
         endpoint: str | None = None,
         secure: bool | None = None,
+        pool_size: int | None = None,
+        keepalive: bool | None = None,
+        timeout: float | None = None,
+        max_retries: int | None = None,
+        retry_backoff: float | None = None,
+        presigned_downloads: str | None = None,
+        presigned_expiry: int | None = None,
     ):
         """Configuration for MinIO object store adapter.
 
@@ -320,12 +391,26 @@ class MinIOObjectStoreAdapterConfig(ObjectStoreAdapterConfig):
             secret_key: The secret key for MinIO. (required)
             endpoint: The URL of the MinIO server. (default: localhost:9000)
             secure: Use secure (TLS) connection. (default: False)
+            pool_size: The maximum number of HTTP connections kept open. (default: 10)
+            keepalive: Enable TCP keep-alive on the HTTP connections. (default: True)
+            timeout: The number of seconds before a connect or read is abandoned. (default: 300.0)
+            max_retries: The number of retries of a failed request. (default: 5)
+            retry_backoff: The backoff factor in seconds between retries. (default: 0.2)
+            presigned_downloads: How downloads are served: "off" proxies them through the server, and "redirect" redirects to a presigned URL. (default: "off")
+            presigned_expiry: The number of seconds a presigned URL is valid. (default: 300)
         """
 
         super().__init__(
             max_file_size=max_file_size,
             min_image_size=min_image_size,
             allowed_image_types=allowed_image_types,
+            io_workers=io_workers,
+            image_workers=image_workers,
+            image_timeout=image_timeout,
+            max_image_pixels=max_image_pixels,
+            cache_size=cache_size,
+            cache_max_object_size=cache_max_object_size,
+            cache_buckets=cache_buckets,
         )
 
         if access_key is None or secret_key is None:
@@ -335,6 +420,19 @@ class MinIOObjectStoreAdapterConfig(ObjectStoreAdapterConfig):
         self.secret_key: str = secret_key
         self.endpoint: str = endpoint or "localhost:9000"
         self.secure: bool = secure or False
+        self.pool_size: int = pool_size or 10
+        self.keepalive: bool = keepalive if keepalive is not None else True
+        self.timeout: float = timeout or 300.0
+        self.max_retries: int = max_retries if max_retries is not None else 5
+        self.retry_backoff: float = retry_backoff if retry_backoff is not None else 0.2
+        if (
+            presigned_downloads is not None
+            and presigned_downloads not in PRESIGNED_DOWNLOAD_MODES
+        ):
+            raise ValueError(f"Invalid presigned download mode: {presigned_downloads}")
+
+        self.presigned_downloads: str = presigned_downloads or "off"
+        self.presigned_expiry: int = presigned_expiry or 300
 
     @property
     @override
@@ -345,6 +443,13 @@ class MinIOObjectStoreAdapterConfig(ObjectStoreAdapterConfig):
             "secret_key_set": self.secret_key != "",
             "endpoint": self.endpoint,
             "secure": self.secure,
+            "pool_size": self.pool_size,
+            "keepalive": self.keepalive,
+            "timeout": self.timeout,
+            "max_retries": self.max_retries,
+            "retry_backoff": self.retry_backoff,
+            "presigned_downloads": self.presigned_downloads,
+            "presigned_expiry": self.presigned_expiry,
         }
 
     @override
@@ -353,10 +458,24 @@ class MinIOObjectStoreAdapterConfig(ObjectStoreAdapterConfig):
             "max_file_size": self.max_file_size,
             "min_image_size": self.min_image_size,
             "allowed_image_types": list(self.allowed_image_types),
+            "io_workers": self.io_workers,
+            "image_workers": self.image_workers,
+            "image_timeout": self.image_timeout,
+            "max_image_pixels": self.max_image_pixels,
+            "cache_size": self.cache_size,
+            "cache_max_object_size": self.cache_max_object_size,
+            "cache_buckets": list(self.cache_buckets),
             "access_key": self.access_key,
             "secret_key": self.secret_key,
             "endpoint": self.endpoint,
             "secure": self.secure,
+            "pool_size": self.pool_size,
+            "keepalive": self.keepalive,
+            "timeout": self.timeout,
+            "max_retries": self.max_retries,
+            "retry_backoff": self.retry_backoff,
+            "presigned_downloads": self.presigned_downloads,
+            "presigned_expiry": self.presigned_expiry,
         }
 
 
@@ -368,10 +487,24 @@ class GarageObjectStoreAdapterConfig(ObjectStoreAdapterConfig):
         max_file_size: int | None = None,
         min_image_size: int | None = None,
         allowed_image_types: set[str] | None = None,
+        io_workers: int | None = None,
+        image_workers: int | None = None,
+        image_timeout: float | None = None,
+        max_image_pixels: int | None = None,
+        cache_size: int | None = None,
+        cache_max_object_size: int | None = None,
+        cache_buckets: set[str] | None = None,
         access_key: str | None = None,
         secret_key: str | None = None,
         endpoint: str | None = None,
         secure: bool | None = None,
+        pool_size: int | None = None,
+        keepalive: bool | None = None,
+        timeout: float | None = None,
+        max_retries: int | None = None,
+        retry_backoff: float | None = None,
+        presigned_downloads: str | None = None,
+        presigned_expiry: int | None = None,
     ):
         """Configuration for Garage object store adapter.
 
@@ -380,12 +513,26 @@ class GarageObjectStoreAdapterConfig(ObjectStoreAdapterConfig):
             secret_key: The secret key for Garage. (required)
             endpoint: The URL of the Garage server. (default: localhost:3900)
             secure: Use secure (TLS) connection. (default: False)
+            pool_size: The maximum number of HTTP connections kept open. (default: 10)
+            keepalive: Enable TCP keep-alive on the HTTP connections. (default: True)
+            timeout: The number of seconds before a connect or read is abandoned. (default: 300.0)
+            max_retries: The number of retries of a failed request. (default: 5)
+            retry_backoff: The backoff factor in seconds between retries. (default: 0.2)
+            presigned_downloads: How downloads are served: "off" proxies them through the server, and "redirect" redirects to a presigned URL. (default: "off")
+            presigned_expiry: The number of seconds a presigned URL is valid. (default: 300)
         """
 
         super().__init__(
             max_file_size=max_file_size,
             min_image_size=min_image_size,
             allowed_image_types=allowed_image_types,
+            io_workers=io_workers,
+            image_workers=image_workers,
+            image_timeout=image_timeout,
+            max_image_pixels=max_image_pixels,
+            cache_size=cache_size,
+            cache_max_object_size=cache_max_object_size,
+            cache_buckets=cache_buckets,
         )
 
         if access_key is None or secret_key is None:
@@ -395,6 +542,19 @@ class GarageObjectStoreAdapterConfig(ObjectStoreAdapterConfig):
         self.secret_key: str = secret_key
         self.endpoint: str = endpoint or "localhost:3900"
         self.secure: bool = secure or False
+        self.pool_size: int = pool_size or 10
+        self.keepalive: bool = keepalive if keepalive is not None else True
+        self.timeout: float = timeout or 300.0
+        self.max_retries: int = max_retries if max_retries is not None else 5
+        self.retry_backoff: float = retry_backoff if retry_backoff is not None else 0.2
+        if (
+            presigned_downloads is not None
+            and presigned_downloads not in PRESIGNED_DOWNLOAD_MODES
+        ):
+            raise ValueError(f"Invalid presigned download mode: {presigned_downloads}")
+
+        self.presigned_downloads: str = presigned_downloads or "off"
+        self.presigned_expiry: int = presigned_expiry or 300
 
     @property
     @override
@@ -405,6 +565,13 @@ class GarageObjectStoreAdapterConfig(ObjectStoreAdapterConfig):
             "secret_key_set": self.secret_key != "",
             "endpoint": self.endpoint,
             "secure": self.secure,
+            "pool_size": self.pool_size,
+            "keepalive": self.keepalive,
+            "timeout": self.timeout,
+            "max_retries": self.max_retries,
+            "retry_backoff": self.retry_backoff,
+            "presigned_downloads": self.presigned_downloads,
+            "presigned_expiry": self.presigned_expiry,
         }
 
     @override
@@ -413,10 +580,24 @@ class GarageObjectStoreAdapterConfig(ObjectStoreAdapterConfig):
             "max_file_size": self.max_file_size,
             "min_image_size": self.min_image_size,
             "allowed_image_types": list(self.allowed_image_types),
+            "io_workers": self.io_workers,
+            "image_workers": self.image_workers,
+            "image_timeout": self.image_timeout,
+            "max_image_pixels": self.max_image_pixels,
+            "cache_size": self.cache_size,
+            "cache_max_object_size": self.cache_max_object_size,
+            "cache_buckets": list(self.cache_buckets),
             "access_key": self.access_key,
             "secret_key": self.secret_key,
             "endpoint": self.endpoint,
             "secure": self.secure,
+            "pool_size": self.pool_size,
+            "keepalive": self.keepalive,
+            "timeout": self.timeout,
+            "max_retries": self.max_retries,
+            "retry_backoff": self.retry_backoff,
+            "presigned_downloads": self.presigned_downloads,
+            "presigned_expiry": self.presigned_expiry,
         }
 
 
@@ -479,3 +660,148 @@ class GoogleOAuthAdapterConfig(OAuthAdapterConfig):
             "client_secret": self.client_secret,
             "redirect_uri": self.redirect_uri,
         }
+
+
+##### Backplane Adapter Configurations #####
+
+
+class BackplaneAdapterConfig(ABC):
+    """Superclass for WebSocket backplane configurations."""
+
+    def __init__(self, channel: str | None = None):
+        """Adapter configuration for the WebSocket backplane.
+
+        Args:
+            channel: The name of the channel the workers exchange messages on.
+        """
+
+        self.channel: str = channel or "centralserver_websocket"
+
+    @property
+    @abstractmethod
+    def info(self) -> dict[str, Any]:
+        """Get the backplane adapter information."""
+
+    @abstractmethod
+    def export(self) -> dict[str, Any]:
+        """Export the configuration to a dictionary."""
+
+
+class LocalBackplaneAdapterConfig(BackplaneAdapterConfig):
+    """Configuration for a single-process backplane that relays nothing."""
+
+    @property
+    @override
+    def info(self) -> dict[str, Any]:
+        return {"name": "Local"}
+
+    @override
+    def export(self) -> dict[str, Any]:
+        return {}
+
+
+class PostgresBackplaneAdapterConfig(BackplaneAdapterConfig):
+    """Configuration for a backplane using PostgreSQL LISTEN/NOTIFY."""
+
+    def __init__(
+        self,
+        channel: str | None = None,
+        username: str | None = None,
+        password: str | None = None,
+        host: str | None = None,
+        port: int | None = None,
+        database: str | None = None,
+        reconnect_interval: float | None = None,
+    ):
+        """Create a configuration object for the PostgreSQL backplane.
+
+        Args:
+            channel: The name of the channel to LISTEN and NOTIFY on.
+            username: The database username.
+            password: The database password.
+            host: The hostname of the database server.
+            port: The port number of the database server.
+            database: The database name.
+            reconnect_interval: Seconds to wait before reconnecting after the listener connection is lost.
+        """
+
+        super().__init__(channel=channel)
+        self.username: str = username or "ProjectSCARS_DatabaseAdmin"
+        self.password: str = password or "ProjectSCARS_postgres143"
+        self.host: str = host or "localhost"
+        self.port: int = port or 5432
+        self.database: str = database or "ProjectSCARS_CentralServer"
+        self.reconnect_interval: float = reconnect_interval or 5.0
+
+    @property
+    def conninfo(self) -> str:
+        """Get the connection string for psycopg."""
+
+        return f"postgresql://{self.username}:{self.password}@{self.host}:{self.port}/{self.database}"
+
+    @property
+    @override
+    def info(self) -> dict[str, Any]:
+        return {
+            "name": "PostgreSQL",
+            "channel": self.channel,
+            "username": self.username,
+            "password_set": self.password != "",
+            "host": self.host,
+            "port": self.port,
+            "database": self.database,
+        }
+
+    @override
+    def export(self) -> dict[str, Any]:
+        return {
+            "channel": self.channel,
+            "username": self.username,
+            "password": self.password,
+            "host": self.host,
+            "port": self.port,
+            "database": self.database,
+            "reconnect_interval": self.reconnect_interval,
+        }
+
+
+class UnixSocketBackplaneAdapterConfig(BackplaneAdapterConfig):
+    """Configuration for a backplane using a broker on a local Unix socket."""
+
+    def __init__(
+        self,
+        socket_path: str | None = None,
+        host_broker: bool | None = None,
+        reconnect_interval: float | None = None,
+    ):
+        """Create a configuration object for the Unix socket backplane.
+
+        Args:
+            socket_path: The path of the broker's Unix socket.
+            host_broker: Whether a worker may start the broker if it is not running. (Default: True)
+            reconnect_interval: Seconds to wait before reconnecting after the broker connection is lost.
+        """
+
+        super().__init__()
+        self.socket_path: Path = Path(
+            socket_path or os.path.join(os.getcwd(), "backplane.sock")
+        )
+        self.host_broker: bool = True if host_broker is None else host_broker
+        self.reconnect_interval: float = reconnect_interval or 1.0
+
+    @property
+    @override
+    def info(self) -> dict[str, Any]:
+        return {
+            "name": "Unix Socket",
+            "socket_path": str(self.socket_path),
+            "host_broker": self.host_broker,
+        }
+
+    @override
+    def export(self) -> dict[str, Any]:
+        return {
+            "socket_path": str(self.socket_path),
+            "host_broker": self.host_broker,
+            "reconnect_interval": self.reconnect_interval,
+        }
@@ -1,11 +1,28 @@
+import asyncio
+import contextvars
+import datetime
+import hashlib
+import multiprocessing
 import os
+import socket
+import uuid
+import warnings
 from abc import ABC, abstractmethod
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from enum import Enum
+from functools import partial
 from io import BytesIO
-from typing import Final, override
+from pathlib import Path
+from typing import Any, AsyncIterator, BinaryIO, Callable, Final, TypeVar, override
 
+import certifi
+import urllib3
 from minio import Minio
+from minio.error import S3Error
 from PIL import Image
+from urllib3.connection import HTTPConnection
+from urllib3.util import Retry, Timeout
 
 from centralserver.internals.adapters.config import (
     GarageObjectStoreAdapterConfig,
@@ -15,10 +32,129 @@ from centralserver.internals.adapters.config import (
 )
 from centralserver.internals.config_handler import app_config
 from centralserver.internals.logger import LoggerFactory
-from centralserver.internals.models.object_store import BucketObject
+from centralserver.internals.models.object_store import (
+    BucketObject,
+    ObjectCacheStats,
+)
 
 logger = LoggerFactory().get_logger(__name__)
 
+T = TypeVar("T")
+
+# The number of bytes read from the object store at a time when streaming
+STREAM_CHUNK_SIZE: Final[int] = 64 * 1024
+# The size of each part of a multipart upload (the minimum allowed by S3)
+MULTIPART_PART_SIZE: Final[int] = 5 * 1024 * 1024
+# The maximum size of a report attachment (more generous than for images)
+MAX_ATTACHMENT_SIZE: Final[int] = 10 * 1024 * 1024
+
+# The threads that run the blocking object store I/O, off the event loop
+_io_executor: ThreadPoolExecutor | None = None
+
+
+def get_io_executor() -> ThreadPoolExecutor:
+    """Get the thread pool used for blocking object store I/O."""
+
+    global _io_executor  # pylint: disable=W0603
+    if _io_executor is None:
+        _io_executor = ThreadPoolExecutor(
+            max_workers=app_config.object_store.io_workers,
+            thread_name_prefix="object-store-io",
+        )
+
+    return _io_executor
+
+
+async def run_io(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a blocking I/O function in the object store I/O thread pool.
+
+    The function runs in a copy of the caller's context, so that its log
+    lines carry the ID of the current request.
+
+    Args:
+        func: The blocking function to run.
+        *args: The positional arguments of the function.
+        **kwargs: The keyword arguments of the function.
+
+    Returns:
+        The return value of the function.
+    """
+
+    ctx = contextvars.copy_context()
+    return await asyncio.get_running_loop().run_in_executor(
+        get_io_executor(), partial(ctx.run, func, *args, **kwargs)
+    )
+
+
+# The processes that decode and resize images, off the event loop
+_image_executor: ProcessPoolExecutor | None = None
+
+
+def _init_image_worker(max_image_pixels: int) -> None:
+    """Set the decompression bomb limit of an image worker process."""
+
+    Image.MAX_IMAGE_PIXELS = max_image_pixels
+    warnings.simplefilter("error", Image.DecompressionBombWarning)
+
+
+def get_image_executor() -> ProcessPoolExecutor:
+    """Get the process pool used for CPU-bound image processing."""
+
+    global _image_executor  # pylint: disable=W0603
+    if _image_executor is None:
+        _image_executor = ProcessPoolExecutor(
+            max_workers=app_config.object_store.image_workers,
+            # Forking a process with running threads is unsafe.
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_image_worker,
+            initargs=(app_config.object_store.max_image_pixels,),
+        )
+
+    return _image_executor
+
+
+async def run_image_job(func: Callable[..., T], *args: Any) -> T:
+    """Run a CPU-bound image function in the image process pool.
+
+    The request waits for at most `image_timeout` seconds. A job that has not
+    started by then is cancelled, while a running one is left to finish.
+
+    Args:
+        func: The module-level function to run.
+        *args: The positional arguments of the function.
+
+    Returns:
+        The return value of the function.
+
+    Raises:
+        ValueError: If the job does not finish in time.
+    """
+
+    try:
+        return await asyncio.wait_for(
+            asyncio.get_running_loop().run_in_executor(
+                get_image_executor(), partial(func, *args)
+            ),
+            timeout=app_config.object_store.image_timeout,
+        )
+
+    except TimeoutError as e:
+        raise ValueError("The image took too long to process.") from e
+
+
+def content_object_name(prefix: str, obj: bytes) -> str:
+    """Get an object name that changes whenever the content of the object does.
+
+    Args:
+        prefix: The start of the object name, such as the ID of its owner.
+        obj: The content of the object.
+
+    Returns:
+        The prefix followed by the first 16 hex digits of the SHA-256 digest.
+    """
+
+    return f"{prefix}-{hashlib.sha256(obj).hexdigest()[:16]}"
+
 
 class BucketNames(Enum):
     """Names of the buckets in the object store."""
@@ -35,6 +171,8 @@ async def validate_and_process_image(
 ) -> bytes:
     """Validate and process an image file.
 
+    The image is decoded and resized in the image process pool.
+
     Args:
         contents: The raw bytes of the image file.
         is_signature: If True, maintains 2:1 aspect ratio for signatures. If False, crops to square for avatars.
@@ -47,7 +185,6 @@ async def validate_and_process_image(
     """
 
     allowed_fs = app_config.object_store.max_file_size / (1024 * 1024)
-    allowed_ft = ", ".join(app_config.object_store.allowed_image_types)
 
     if len(contents) > app_config.object_store.max_file_size:
         size_mb = len(contents) / (1024 * 1024)
@@ -55,15 +192,63 @@ async def validate_and_process_image(
             f"Image size {size_mb:.2f} MB exceeds the {allowed_fs:.2f} MB size limit."
         )
 
+    return await run_image_job(
+        process_image,
+        contents,
+        is_signature,
+        app_config.object_store.allowed_image_types,
+        app_config.object_store.min_image_size,
+        app_config.object_store.max_image_pixels,
+    )
+
+
+def process_image(
+    contents: bytes,
+    is_signature: bool,
+    allowed_image_types: set[str],
+    min_image_size: int,
+    max_image_pixels: int,
+) -> bytes:
+    """Validate, crop and resize an image. This runs in an image worker process.
+
+    Args:
+        contents: The raw bytes of the image file.
+        is_signature: If True, maintains 2:1 aspect ratio for signatures. If False, crops to square for avatars.
+        allowed_image_types: The accepted image formats.
+        min_image_size: The minimum width of an avatar in pixels.
+        max_image_pixels: The maximum number of pixels of the image.
+
+    Returns:
+        The processed image bytes.
+
+    Raises:
+        ValueError: If the image is invalid or too large.
+    """
+
+    allowed_ft = ", ".join(allowed_image_types)
+
+    pixel_limit = f"Image dimensions exceed the {max_image_pixels} pixel limit."
     try:
+        # Only the header is read here, so the pixel count is checked before decoding.
         image = Image.open(BytesIO(contents))
+
+    except (Image.DecompressionBombError, Image.DecompressionBombWarning) as e:
+        raise ValueError(pixel_limit) from e
+
+    except Exception as e:
+        raise ValueError("Invalid image file.") from e
+
+    if image.size[0] * image.size[1] > max_image_pixels:
+        raise ValueError(pixel_limit)
+
+    try:
         image.load()
         logger.debug("Image size: %s", image.size)
         logger.debug("Image format: %s", image.format)
         if image.format is None:
             raise ValueError("Image format not recognized.")
 
-        if image.format.lower() not in app_config.object_store.allowed_image_types:
+        if image.format.lower() not in allowed_image_types:
             raise ValueError(
                 f"Unsupported image format: {image.format}. Allowed: {allowed_ft}."
             )
@@ -111,9 +296,9 @@ async def validate_and_process_image(
 
         logger.debug("Cropped avatar image dimensions: %s", image.size)
         # We don't need to check image.size[1] because we are cropping it to a square.
-        if image.size[0] < app_config.object_store.min_image_size:
+        if image.size[0] < min_image_size:
             raise ValueError(
-                f"Avatar dimensions {image.size} are smaller than the minimum required size of {app_config.object_store.min_image_size} pixels."
+                f"Avatar dimensions {image.size} are smaller than the minimum required size of {min_image_size} pixels."
             )
 
     output_buffer = BytesIO()
@@ -153,12 +338,9 @@ async def validate_attachment_file(contents: bytes, filename: str) -> bytes:
     Raises:
         ValueError: If the file exceeds the size limit.
     """
-    # Use a more generous file size limit for attachments (e.g., 10MB instead of 2MB for images)
-    max_attachment_size = 10 * 1024 * 1024  # 10MB
-
-    if len(contents) > max_attachment_size:
+    if len(contents) > MAX_ATTACHMENT_SIZE:
         size_mb = len(contents) / (1024 * 1024)
-        max_size_mb = max_attachment_size / (1024 * 1024)
+        max_size_mb = MAX_ATTACHMENT_SIZE / (1024 * 1024)
         raise ValueError(
             f"File '{filename}' size {size_mb:.2f} MB exceeds the {max_size_mb:.2f} MB size limit."
         )
@@ -170,6 +352,251 @@ async def validate_attachment_file(contents: bytes, filename: str) -> bytes:
     return contents
 
 
+class UploadStream:
+    """Read an uploaded file in chunks, enforcing a size limit as it is read.
+
+    The SHA-256 digest and the size of the file are computed while it is
+    read, so the file never has to be held in memory as a whole.
+    """
+
+    def __init__(
+        self,
+        file: Any,
+        max_size: int,
+        filename: str | None = None,
+        chunk_size: int = STREAM_CHUNK_SIZE,
+    ) -> None:
+        """Create a new upload stream.
+
+        Args:
+            file: The uploaded file, with an async `read(size)` method.
+            max_size: The maximum size of the file in bytes.
+            filename: The filename for context in error messages. (Optional)
+            chunk_size: The number of bytes to read at a time.
+        """
+
+        self.file = file
+        self.max_size = max_size
+        self.filename = filename
+        self.chunk_size = chunk_size
+        self.size = 0
+        self.hasher = hashlib.sha256()
+
+    @property
+    def digest(self) -> str:
+        """The hex SHA-256 digest of the bytes read so far."""
+
+        return self.hasher.hexdigest()
+
+    async def chunks(self) -> AsyncIterator[bytes]:
+        """Read the file in chunks.
+
+        Raises:
+            ValueError: As soon as the file exceeds the size limit.
+        """
+
+        while chunk := await self.file.read(self.chunk_size):
+            self.size += len(chunk)
+            if self.size > self.max_size:
+                max_size_mb = self.max_size / (1024 * 1024)
+                raise ValueError(
+                    f"File '{self.filename}' exceeds the {max_size_mb:.2f} MB size limit."
+                )
+
+            self.hasher.update(chunk)
+            yield chunk
+
+
+class _ChunkReader:
+    """A blocking file-like reader over an async iterator of chunks.
+
+    This lets the synchronous MinIO client, running in the I/O thread pool,
+    pull the chunks of an upload from the event loop as it needs them.
+    """
+
+    def __init__(
+        self, chunks: AsyncIterator[bytes], loop: asyncio.AbstractEventLoop
+    ) -> None:
+        self._chunks = chunks
+        self._loop = loop
+        self._buffer = bytearray()
+        self._done = False
+
+    async def _next_chunk(self) -> bytes:
+        return await anext(self._chunks)
+
+    def read(self, size: int = -1) -> bytes:
+        while not self._done and (size < 0 or len(self._buffer) < size):
+            try:
+                self._buffer += asyncio.run_coroutine_threadsafe(
+                    self._next_chunk(), self._loop
+                ).result()
+
+            except StopAsyncIteration:
+                self._done = True
+
+        if size < 0:
+            size = len(self._buffer)
+
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return data
+
+
+async def _put_minio_stream(
+    client: Minio, bucket: str, object_name: str, chunks: AsyncIterator[bytes]
+) -> None:
+    """Upload an object with a MinIO client as a multipart upload.
+
+    Only one part is held in memory at a time, and the upload is aborted if
+    reading the chunks fails.
+    """
+
+    await run_io(
+        client.put_object,
+        bucket_name=bucket,
+        object_name=object_name,
+        data=_ChunkReader(chunks, asyncio.get_running_loop()),
+        length=-1,
+        part_size=MULTIPART_PART_SIZE,
+    )
+
+
+def _read_minio_object(client: Minio, bucket: str, object_name: str) -> bytes:
+    """Download an object with a MinIO client, releasing the connection after.
+
+    Args:
+        client: The MinIO client to use.
+        bucket: The name of the bucket to get the object from.
+        object_name: The name of the object to get.
+
+    Returns:
+        The content of the object.
+    """
+
+    response = None
+    try:
+        logger.debug("Retrieving object: %s", object_name)
+        response = client.get_object(bucket_name=bucket, object_name=object_name)
+        logger.debug("Object retrieved successfully. Reading...")
+        return response.read()
+
+    finally:
+        if response is not None:
+            logger.debug("Closing object store response.")
+            # Close the response to release the connection
+            # and avoid resource leaks.
+            response.close()  # WARN: Why are these not implemented according to source?
+            response.release_conn()
+
+
+def _presign_minio_object(
+    client: Minio,
+    bucket: str,
+    object_name: str,
+    expiry: int,
+    response_headers: dict[str, str] | None,
+) -> str:
+    """Create a presigned GET URL of an object with a MinIO client."""
+
+    return client.presigned_get_object(
+        bucket,
+        object_name,
+        expires=datetime.timedelta(seconds=expiry),
+        response_headers={
+            f"response-{header.lower()}": value
+            for header, value in (response_headers or {}).items()
+        },
+    )
+
+
+def _stat_minio_object(client: Minio, bucket: str, object_name: str) -> int | None:
+    """Get the size of an object with a MinIO client.
+
+    Returns:
+        The size of the object in bytes, or None if it does not exist.
+    """
+
+    try:
+        return client.stat_object(bucket, object_name).size
+
+    except S3Error as e:
+        if e.code in ("NoSuchKey", "NoSuchObject"):
+            return None
+
+        raise
+
+
+async def _stream_minio_object(
+    client: Minio, bucket: str, object_name: str, offset: int, length: int | None
+) -> AsyncIterator[bytes]:
+    """Download part of an object with a MinIO client in chunks.
+
+    Each chunk is read in the I/O thread pool, and the connection is
+    released once the download finishes or is abandoned.
+    """
+
+    response = await run_io(
+        client.get_object,
+        bucket_name=bucket,
+        object_name=object_name,
+        offset=offset,
+        length=length or 0,
+    )
+    try:
+        chunks = response.stream(STREAM_CHUNK_SIZE)
+        while (chunk := await run_io(next, chunks, None)) is not None:
+            yield chunk
+
+    finally:
+        response.close()
+        response.release_conn()
+
+
+def _create_http_client(
+    config: MinIOObjectStoreAdapterConfig | GarageObjectStoreAdapterConfig,
+) -> urllib3.PoolManager:
+    """Create the pooled HTTP client used by a MinIO client.
+
+    The connections to the object store are kept open and reused by every
+    request instead of being opened again for each object.
+
+    Args:
+        config: The configuration of the S3-compatible object store.
+
+    Returns:
+        The HTTP connection pool manager.
+    """
+
+    socket_options = list(HTTPConnection.default_socket_options)
+    if config.keepalive:
+        socket_options.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+
+    return urllib3.PoolManager(
+        maxsize=config.pool_size,
+        block=False,
+        timeout=Timeout(connect=config.timeout, read=config.timeout),
+        cert_reqs="CERT_REQUIRED",
+        ca_certs=os.environ.get("SSL_CERT_FILE") or certifi.where(),
+        retries=Retry(
+            total=config.max_retries,
+            backoff_factor=config.retry_backoff,
+            status_forcelist=[500, 502, 503, 504],
+        ),
+        socket_options=socket_options,
+    )
+
+
+def _ensure_minio_buckets(client: Minio) -> None:
+    """Create the missing buckets with a MinIO client."""
+
+    for bucket in BucketNames:
+        logger.debug("Ensuring existence of bucket: %s", bucket.value)
+        if not client.bucket_exists(bucket.value):
+            logger.debug("Creating bucket: %s", bucket.value)
+            client.make_bucket(bucket.value)
+
+
 class ObjectStoreAdapter(ABC):
     """Superclass for object store adapter configuration."""
 
@@ -177,6 +604,9 @@ class ObjectStoreAdapter(ABC):
     async def check(self) -> None:
         """Verify the health of the object store."""
 
+    async def close(self) -> None:
+        """Release the connections held by the adapter."""
+
     @abstractmethod
     async def put(self, bucket: BucketNames, fn: str, obj: bytes) -> BucketObject:
         """Put the object into the object store and return its ID.
@@ -187,6 +617,21 @@ class ObjectStoreAdapter(ABC):
             obj: The object to put into the object store.
         """
 
+    @abstractmethod
+    async def put_stream(
+        self, bucket: BucketNames, fn: str, chunks: AsyncIterator[bytes]
+    ) -> None:
+        """Put an object into the object store as it is read, chunk by chunk.
+
+        An existing object with the same name is replaced. Nothing is stored
+        if reading the chunks fails.
+
+        Args:
+            bucket: The name of the bucket to put the object into.
+            fn: The name of the file in the object store.
+            chunks: The content of the object.
+        """
+
     @abstractmethod
     async def get(
         self, bucket: BucketNames, hashed_filename: str
@@ -197,6 +642,50 @@ class ObjectStoreAdapter(ABC):
     async def delete(self, bucket: BucketNames, hashed_filename: str) -> None:
         """Delete the object with the given ID from the object store."""
 
+    @abstractmethod
+    async def stat(self, bucket: BucketNames, hashed_filename: str) -> int | None:
+        """Get the size in bytes of the object with the given ID.
+
+        Returns:
+            The size of the object, or None if it does not exist.
+        """
+
+    @abstractmethod
+    def stream(
+        self,
+        bucket: BucketNames,
+        hashed_filename: str,
+        offset: int = 0,
+        length: int | None = None,
+    ) -> AsyncIterator[bytes]:
+        """Read the object with the given ID in chunks.
+
+        Args:
+            bucket: The name of the bucket to get the object from.
+            hashed_filename: The hashed filename of the object to read.
+            offset: The position of the first byte to read.
+            length: The number of bytes to read, or None to read to the end.
+        """
+
+    async def presigned_url(
+        self,
+        bucket: BucketNames,
+        hashed_filename: str,
+        response_headers: dict[str, str] | None = None,
+    ) -> str | None:
+        """Get a short-lived URL to download the object directly from the store.
+
+        Args:
+            bucket: The name of the bucket of the object.
+            hashed_filename: The hashed filename of the object.
+            response_headers: The headers the store should send with the object.
+
+        Returns:
+            The presigned URL, or None if the store cannot serve objects directly.
+        """
+
+        return None
+
 
 class LocalObjectStoreAdapter(ObjectStoreAdapter):
     """Use the local filesystem as the central server's object store."""
@@ -234,12 +723,41 @@ class LocalObjectStoreAdapter(ObjectStoreAdapter):
         """Check if the local object store is healthy."""
 
         logger.debug("Ensuring existence of local object store directories.")
+        await run_io(self._make_directories)
+
+    def _make_directories(self) -> None:
+        """Create the missing bucket directories."""
+
         self.config.filepath.mkdir(parents=True, exist_ok=True)
         for directory in BucketNames:
             logger.debug("Ensuring existence of directory: %s", directory.value)
             subdir = self.config.filepath / directory.value
             subdir.mkdir(parents=True, exist_ok=True)
 
+    @staticmethod
+    def _create(fp: Path) -> BinaryIO:
+        """Create and open a new file, failing if it already exists."""
+
+        fp.parent.mkdir(parents=True, exist_ok=True)
+        return open(fp, "xb")
+
+    @classmethod
+    def _write(cls, fp: Path, obj: bytes) -> None:
+        """Write a new file, failing if it already exists."""
+
+        with cls._create(fp) as f:
+            f.write(obj)
+
+    @staticmethod
+    def _read(fp: Path) -> bytes | None:
+        """Read a file, or return None if it does not exist."""
+
+        try:
+            return fp.read_bytes()
+
+        except FileNotFoundError:
+            return None
+
     @override
     async def put(self, bucket: BucketNames, fn: str, obj: bytes) -> BucketObject:
         """Store the object in the local object store.
@@ -255,18 +773,15 @@ class LocalObjectStoreAdapter(ObjectStoreAdapter):
             logger.warning("Invalid object name: %s", fn)
             raise ValueError(f"Invalid object name: {fn}")
 
-        new_file_dir = self.config.filepath / bucket.value / fn[:2]
-        new_file_dir.mkdir(parents=True, exist_ok=True)
-        new_fp = new_file_dir / fn
-        if new_fp.exists():
-            logger.warning("File already exists: %s", new_fp)
-            raise FileExistsError("File already exists. Please use a different name.")
+        new_fp = self.config.filepath / bucket.value / fn[:2] / fn
+        try:
+            await run_io(self._write, new_fp, obj)
 
-        with open(
-            self.config.filepath / bucket.value / fn[:2] / fn,
-            "wb",
-        ) as f:
-            f.write(obj)
+        except FileExistsError as e:
+            logger.warning("File already exists: %s", new_fp)
+            raise FileExistsError(
+                "File already exists. Please use a different name."
+            ) from e
 
         return BucketObject(
             bucket=bucket.value,
@@ -274,6 +789,41 @@ class LocalObjectStoreAdapter(ObjectStoreAdapter):
             obj=obj,
         )
 
+    @override
+    async def put_stream(
+        self, bucket: BucketNames, fn: str, chunks: AsyncIterator[bytes]
+    ) -> None:
+        """Write an object to the local object store as it is read.
+
+        The object is written to a temporary file first, which then replaces
+        any existing object at once.
+
+        Args:
+            bucket: The name of the bucket to put the object into.
+            fn: The name of the file in the object store.
+            chunks: The content of the object.
+        """
+
+        logger.debug("Streaming object into local object store.")
+        if not await self.validate_object_name(fn):
+            logger.warning("Invalid object name: %s", fn)
+            raise ValueError(f"Invalid object name: {fn}")
+
+        new_fp = self.config.filepath / bucket.value / fn[:2] / fn
+        temp_fp = new_fp.with_name(f".{fn}.{uuid.uuid4().hex}")
+        f = await run_io(self._create, temp_fp)
+        try:
+            async for chunk in chunks:
+                await run_io(f.write, chunk)
+
+        except BaseException:
+            await run_io(f.close)
+            await run_io(os.remove, temp_fp)
+            raise
+
+        await run_io(f.close)
+        await run_io(os.replace, temp_fp, new_fp)
+
     @override
     async def get(
         self, bucket: BucketNames, hashed_filename: str
@@ -289,12 +839,11 @@ class LocalObjectStoreAdapter(ObjectStoreAdapter):
         object_fp = (
             self.config.filepath / bucket.value / hashed_filename[:2] / hashed_filename
         )
-        if not object_fp.exists():
+        data = await run_io(self._read, object_fp)
+        if data is None:
             logger.warning("File does not exist: %s", object_fp)
             return None
 
-        data = object_fp.read_bytes()
-
         return BucketObject(
             bucket=bucket.value,
             fn=hashed_filename,
@@ -314,11 +863,74 @@ class LocalObjectStoreAdapter(ObjectStoreAdapter):
         object_fp = (
             self.config.filepath / bucket.value / hashed_filename[:2] / hashed_filename
         )
-        if not object_fp.exists():
+        try:
+            await run_io(os.remove, object_fp)
+
+        except FileNotFoundError as e:
             logger.warning("File does not exist: %s", object_fp)
-            raise FileNotFoundError(f"File {object_fp} does not exist.")
+            raise FileNotFoundError(f"File {object_fp} does not exist.") from e
+
+    @override
+    async def stat(self, bucket: BucketNames, hashed_filename: str) -> int | None:
+        """Get the size of an object in the local object store.
+
+        Args:
+            bucket: The name of the bucket of the object.
+            hashed_filename: The hashed filename of the object.
+        """
+
+        object_fp = (
+            self.config.filepath / bucket.value / hashed_filename[:2] / hashed_filename
+        )
+        try:
+            return await run_io(os.path.getsize, object_fp)
 
-        os.remove(object_fp)
+        except FileNotFoundError:
+            return None
+
+    @override
+    async def stream(
+        self,
+        bucket: BucketNames,
+        hashed_filename: str,
+        offset: int = 0,
+        length: int | None = None,
+    ) -> AsyncIterator[bytes]:
+        """Read an object from the local object store in chunks.
+
+        Args:
+            bucket: The name of the bucket to get the object from.
+            hashed_filename: The hashed filename of the object to read.
+            offset: The position of the first byte to read.
+            length: The number of bytes to read, or None to read to the end.
+        """
+
+        object_fp = (
+            self.config.filepath / bucket.value / hashed_filename[:2] / hashed_filename
+        )
+        f = await run_io(open, object_fp, "rb")
+        try:
+            await run_io(f.seek, offset)
+            remaining = length
+            while remaining is None or remaining > 0:
+                chunk = await run_io(
+                    f.read,
+                    (
+                        STREAM_CHUNK_SIZE
+                        if remaining is None
+                        else min(STREAM_CHUNK_SIZE, remaining)
+                    ),
+                )
+                if not chunk:
+                    break
+
+                if remaining is not None:
+                    remaining -= len(chunk)
+
+                yield chunk
+
+        finally:
+            await run_io(f.close)
 
 
 class MinIOObjectStoreAdapter(ObjectStoreAdapter):
@@ -334,11 +946,13 @@ class MinIOObjectStoreAdapter(ObjectStoreAdapter):
         self.config = config
 
         logger.debug("Initializing MinIO object store adapter.")
+        self.http_client = _create_http_client(config)
         self.client = Minio(
             config.endpoint,
             access_key=config.access_key,
             secret_key=config.secret_key,
             secure=config.secure,
+            http_client=self.http_client,
         )
 
     @staticmethod
@@ -367,11 +981,14 @@ class MinIOObjectStoreAdapter(ObjectStoreAdapter):
         """Check if the MinIO object store is healthy."""
 
         logger.debug("Ensuring existence of MinIO buckets.")
-        for bucket in BucketNames:
-            logger.debug("Ensuring existence of bucket: %s", bucket.value)
-            if not self.client.bucket_exists(bucket.value):
-                logger.debug("Creating bucket: %s", bucket.value)
-                self.client.make_bucket(bucket.value)
+        await run_io(_ensure_minio_buckets, self.client)
+
+    @override
+    async def close(self) -> None:
+        """Close the pooled HTTP connections to the MinIO object store."""
+
+        logger.debug("Closing MinIO HTTP connections.")
+        self.http_client.clear()
 
     @override
     async def put(self, bucket: BucketNames, fn: str, obj: bytes) -> BucketObject:
@@ -390,7 +1007,8 @@ class MinIOObjectStoreAdapter(ObjectStoreAdapter):
 
         length = len(obj)
         logger.debug("Object length: %d", length)
-        self.client.put_object(
+        await run_io(
+            self.client.put_object,
             bucket_name=bucket.value,
             object_name=fn,
             data=BytesIO(obj),
@@ -403,6 +1021,25 @@ class MinIOObjectStoreAdapter(ObjectStoreAdapter):
             obj=obj,
         )
 
+    @override
+    async def put_stream(
+        self, bucket: BucketNames, fn: str, chunks: AsyncIterator[bytes]
+    ) -> None:
+        """Upload an object to the MinIO object store as a multipart upload.
+
+        Args:
+            bucket: The name of the bucket to put the object into.
+            fn: The name of the file in the object store.
+            chunks: The content of the object.
+        """
+
+        logger.debug("Streaming object into MinIO object store.")
+        if not await self.validate_object_name(fn):
+            logger.warning("Invalid object name: %s", fn)
+            raise ValueError(f"Invalid object name: {fn}")
+
+        await _put_minio_stream(self.client, bucket.value, fn, chunks)
+
     @override
     async def get(
         self, bucket: BucketNames, hashed_filename: str
@@ -415,22 +1052,9 @@ class MinIOObjectStoreAdapter(ObjectStoreAdapter):
         """
 
         logger.debug("Getting object from MinIO object store.")
-        response = None
-        try:
-            logger.debug("Retrieving object: %s", hashed_filename)
-            response = self.client.get_object(
-                bucket_name=bucket.value, object_name=hashed_filename
-            )
-            logger.debug("Object retrieved successfully. Reading...")
-            response_data = response.read()
-
-        finally:
-            if response is not None:
-                logger.debug("Closing MinIO response.")
-                # Close the response to release the connection
-                # and avoid resource leaks.
-                response.close()  # WARN: Why are these not implemented according to source?
-                response.release_conn()
+        response_data = await run_io(
+            _read_minio_object, self.client, bucket.value, hashed_filename
+        )
 
         return BucketObject(
             bucket=bucket.value,
@@ -449,12 +1073,76 @@ class MinIOObjectStoreAdapter(ObjectStoreAdapter):
 
         logger.debug("Deleting object from MinIO object store.")
         try:
-            self.client.remove_object(bucket.value, hashed_filename)
+            await run_io(self.client.remove_object, bucket.value, hashed_filename)
 
         except Exception as e:
             logger.warning("File does not exist: %s", hashed_filename)
             raise FileNotFoundError(f"File {hashed_filename} does not exist.") from e
 
+    @override
+    async def stat(self, bucket: BucketNames, hashed_filename: str) -> int | None:
+        """Get the size of an object in the MinIO object store.
+
+        Args:
+            bucket: The name of the bucket of the object.
+            hashed_filename: The hashed filename of the object.
+        """
+
+        return await run_io(
+            _stat_minio_object, self.client, bucket.value, hashed_filename
+        )
+
+    @override
+    def stream(
+        self,
+        bucket: BucketNames,
+        hashed_filename: str,
+        offset: int = 0,
+        length: int | None = None,
+    ) -> AsyncIterator[bytes]:
+        """Download an object from the MinIO object store in chunks.
+
+        Args:
+            bucket: The name of the bucket to get the object from.
+            hashed_filename: The hashed filename of the object to read.
+            offset: The position of the first byte to read.
+            length: The number of bytes to read, or None to read to the end.
+        """
+
+        return _stream_minio_object(
+            self.client, bucket.value, hashed_filename, offset, length
+        )
+
+    @override
+    async def presigned_url(
+        self,
+        bucket: BucketNames,
+        hashed_filename: str,
+        response_headers: dict[str, str] | None = None,
+    ) -> str | None:
+        """Get a presigned GET URL of an object in the MinIO object store.
+
+        Args:
+            bucket: The name of the bucket of the object.
+            hashed_filename: The hashed filename of the object.
+            response_headers: The headers the store should send with the object.
+
+        Returns:
+            The presigned URL, or None if presigned downloads are disabled.
+        """
+
+        if self.config.presigned_downloads == "off":
+            return None
+
+        return await run_io(
+            _presign_minio_object,
+            self.client,
+            bucket.value,
+            hashed_filename,
+            self.config.presigned_expiry,
+            response_headers,
+        )
+
 
 class GarageObjectStoreAdapter(ObjectStoreAdapter):
     """Use Garage as the central server's object store."""
@@ -469,12 +1157,14 @@ class GarageObjectStoreAdapter(ObjectStoreAdapter):
         self.config = config
 
         logger.debug("Initializing Garage object store adapter.")
+        self.http_client = _create_http_client(config)
         self.client = Minio(
             config.endpoint,
             access_key=config.access_key,
             secret_key=config.secret_key,
             secure=config.secure,
             region="garage",  # Garage uses a specific region
+            http_client=self.http_client,
         )
 
     @staticmethod
@@ -503,11 +1193,14 @@ class GarageObjectStoreAdapter(ObjectStoreAdapter):
         """Check if the Garage object store is healthy."""
 
         logger.debug("Ensuring existence of Garage buckets.")
-        for bucket in BucketNames:
-            logger.debug("Ensuring existence of bucket: %s", bucket.value)
-            if not self.client.bucket_exists(bucket.value):
-                logger.debug("Creating bucket: %s", bucket.value)
-                self.client.make_bucket(bucket.value)
+        await run_io(_ensure_minio_buckets, self.client)
+
+    @override
+    async def close(self) -> None:
+        """Close the pooled HTTP connections to the Garage object store."""
+
+        logger.debug("Closing Garage HTTP connections.")
+        self.http_client.clear()
 
     @override
     async def put(self, bucket: BucketNames, fn: str, obj: bytes) -> BucketObject:
@@ -526,7 +1219,8 @@ class GarageObjectStoreAdapter(ObjectStoreAdapter):
 
         length = len(obj)
         logger.debug("Object length: %d", length)
-        self.client.put_object(
+        await run_io(
+            self.client.put_object,
             bucket_name=bucket.value,
             object_name=fn,
             data=BytesIO(obj),
@@ -539,6 +1233,25 @@ class GarageObjectStoreAdapter(ObjectStoreAdapter):
             obj=obj,
         )
 
+    @override
+    async def put_stream(
+        self, bucket: BucketNames, fn: str, chunks: AsyncIterator[bytes]
+    ) -> None:
+        """Upload an object to the Garage object store as a multipart upload.
+
+        Args:
+            bucket: The name of the bucket to put the object into.
+            fn: The name of the file in the object store.
+            chunks: The content of the object.
+        """
+
+        logger.debug("Streaming object into Garage object store.")
+        if not await self.validate_object_name(fn):
+            logger.warning("Invalid object name: %s", fn)
+            raise ValueError(f"Invalid object name: {fn}")
+
+        await _put_minio_stream(self.client, bucket.value, fn, chunks)
+
     @override
     async def get(
         self, bucket: BucketNames, hashed_filename: str
@@ -551,22 +1264,9 @@ class GarageObjectStoreAdapter(ObjectStoreAdapter):
         """
 
         logger.debug("Getting object from Garage object store.")
-        response = None
-        try:
-            logger.debug("Retrieving object: %s", hashed_filename)
-            response = self.client.get_object(
-                bucket_name=bucket.value, object_name=hashed_filename
-            )
-            logger.debug("Object retrieved successfully. Reading...")
-            response_data = response.read()
-
-        finally:
-            if response is not None:
-                logger.debug("Closing Garage response.")
-                # Close the response to release the connection
-                # and avoid resource leaks.
-                response.close()  # WARN: Why are these not implemented according to source?
-                response.release_conn()
+        response_data = await run_io(
+            _read_minio_object, self.client, bucket.value, hashed_filename
+        )
 
         return BucketObject(
             bucket=bucket.value,
@@ -585,12 +1285,76 @@ class GarageObjectStoreAdapter(ObjectStoreAdapter):
 
         logger.debug("Deleting object from Garage object store.")
         try:
-            self.client.remove_object(bucket.value, hashed_filename)
+            await run_io(self.client.remove_object, bucket.value, hashed_filename)
 
         except Exception as e:
             logger.warning("File does not exist: %s", hashed_filename)
             raise FileNotFoundError(f"File {hashed_filename} does not exist.") from e
 
+    @override
+    async def stat(self, bucket: BucketNames, hashed_filename: str) -> int | None:
+        """Get the size of an object in the Garage object store.
+
+        Args:
+            bucket: The name of the bucket of the object.
+            hashed_filename: The hashed filename of the object.
+        """
+
+        return await run_io(
+            _stat_minio_object, self.client, bucket.value, hashed_filename
+        )
+
+    @override
+    def stream(
+        self,
+        bucket: BucketNames,
+        hashed_filename: str,
+        offset: int = 0,
+        length: int | None = None,
+    ) -> AsyncIterator[bytes]:
+        """Download an object from the Garage object store in chunks.
+
+        Args:
+            bucket: The name of the bucket to get the object from.
+            hashed_filename: The hashed filename of the object to read.
+            offset: The position of the first byte to read.
+            length: The number of bytes to read, or None to read to the end.
+        """
+
+        return _stream_minio_object(
+            self.client, bucket.value, hashed_filename, offset, length
+        )
+
+    @override
+    async def presigned_url(
+        self,
+        bucket: BucketNames,
+        hashed_filename: str,
+        response_headers: dict[str, str] | None = None,
+    ) -> str | None:
+        """Get a presigned GET URL of an object in the Garage object store.
+
+        Args:
+            bucket: The name of the bucket of the object.
+            hashed_filename: The hashed filename of the object.
+            response_headers: The headers the store should send with the object.
+
+        Returns:
+            The presigned URL, or None if presigned downloads are disabled.
+        """
+
+        if self.config.presigned_downloads == "off":
+            return None
+
+        return await run_io(
+            _presign_minio_object,
+            self.client,
+            bucket.value,
+            hashed_filename,
+            self.config.presigned_expiry,
+            response_headers,
+        )
+
 
 async def get_object_store_handler(
     conf: ObjectStoreAdapterConfig,
@@ -619,3 +1383,288 @@ async def get_object_store_handler(
     else:
         logger.error("Invalid object store configuration.")
         raise ValueError("Invalid object store configuration.")
+
+
+class ObjectCache:
+    """A least recently used cache of objects, bounded by their total size."""
+
+    def __init__(self, capacity: int, max_object_size: int) -> None:
+        """Create a new object cache.
+
+        Args:
+            capacity: The maximum total size of the cached objects in bytes.
+            max_object_size: The size in bytes of the largest object to cache.
+        """
+
+        self.capacity = capacity
+        self.max_object_size = max_object_size
+        self.entries: OrderedDict[tuple[BucketNames, str], bytes] = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        # Incremented on every invalidation, so that a read that started
+        # before a write does not cache the old content after it.
+        self.version = 0
+
+    def get(self, bucket: BucketNames, fn: str) -> bytes | None:
+        """Get a cached object and mark it as the most recently used."""
+
+        obj = self.entries.get((bucket, fn))
+        if obj is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.entries.move_to_end((bucket, fn))
+        return obj
+
+    def put(self, bucket: BucketNames, fn: str, obj: bytes, version: int) -> None:
+        """Cache an object read when the cache was at the given version."""
+
+        if version != self.version or len(obj) > self.max_object_size:
+            return
+
+        self.invalidate(bucket, fn, count=False)
+        self.entries[(bucket, fn)] = obj
+        self.size += len(obj)
+        while self.size > self.capacity:
+            _, evicted = self.entries.popitem(last=False)
+            self.size -= len(evicted)
+            self.evictions += 1
+
+    def invalidate(self, bucket: BucketNames, fn: str, count: bool = True) -> None:
+        """Remove an object from the cache."""
+
+        if count:
+            self.version += 1
+            self.invalidations += 1
+
+        obj = self.entries.pop((bucket, fn), None)
+        if obj is not None:
+            self.size -= len(obj)
+
+    @property
+    def stats(self) -> ObjectCacheStats:
+        """The statistics of the cache."""
+
+        requests = self.hits + self.misses
+        return ObjectCacheStats(
+            enabled=True,
+            hits=self.hits,
+            misses=self.misses,
+            hit_rate=self.hits / requests if requests else 0.0,
+            evictions=self.evictions,
+            invalidations=self.invalidations,
+            entries=len(self.entries),
+            size=self.size,
+            capacity=self.capacity,
+        )
+
+
+class CachedObjectStoreAdapter(ObjectStoreAdapter):
+    """An object store adapter that keeps small objects of some buckets in memory.
+
+    The objects of the other buckets are passed through to the wrapped adapter.
+    """
+
+    def __init__(
+        self, adapter: ObjectStoreAdapter, cache: ObjectCache, buckets: set[BucketNames]
+    ) -> None:
+        """Wrap an object store adapter with a cache.
+
+        Args:
+            adapter: The adapter of the object store.
+            cache: The cache of the objects.
+            buckets: The buckets whose objects are cached.
+        """
+
+        self.adapter = adapter
+        self.cache = cache
+        self.buckets = buckets
+
+    @override
+    async def check(self) -> None:
+        """Check if the wrapped object store is healthy."""
+
+        await self.adapter.check()
+
+    @override
+    async def close(self) -> None:
+        """Release the connections held by the wrapped adapter."""
+
+        await self.adapter.close()
+
+    @override
+    async def put(self, bucket: BucketNames, fn: str, obj: bytes) -> BucketObject:
+        """Put an object into the object store, replacing its cached copy."""
+
+        self.cache.invalidate(bucket, fn)
+        return await self.adapter.put(bucket, fn, obj)
+
+    @override
+    async def put_stream(
+        self, bucket: BucketNames, fn: str, chunks: AsyncIterator[bytes]
+    ) -> None:
+        """Stream an object into the object store, replacing its cached copy."""
+
+        self.cache.invalidate(bucket, fn)
+        await self.adapter.put_stream(bucket, fn, chunks)
+
+    @override
+    async def get(
+        self, bucket: BucketNames, hashed_filename: str
+    ) -> BucketObject | None:
+        """Get an object from the cache, or from the object store on a miss."""
+
+        if bucket not in self.buckets:
+            return await self.adapter.get(bucket, hashed_filename)
+
+        obj = self.cache.get(bucket, hashed_filename)
+        if obj is not None:
+            return BucketObject(bucket=bucket.value, fn=hashed_filename, obj=obj)
+
+        version = self.cache.version
+        bucket_object = await self.adapter.get(bucket, hashed_filename)
+        if bucket_object is not None:
+            self.cache.put(bucket, hashed_filename, bucket_object.obj, version)
+
+        return bucket_object
+
+    @override
+    async def delete(self, bucket: BucketNames, hashed_filename: str) -> None:
+        """Delete an object from the object store and the cache."""
+
+        self.cache.invalidate(bucket, hashed_filename)
+        await self.adapter.delete(bucket, hashed_filename)
+
+    @override
+    async def stat(self, bucket: BucketNames, hashed_filename: str) -> int | None:
+        """Get the size of an object, from the cache if it is cached."""
+
+        if bucket in self.buckets:
+            obj = self.cache.entries.get((bucket, hashed_filename))
+            if obj is not None:
+                return len(obj)
+
+        return await self.adapter.stat(bucket, hashed_filename)
+
+    @override
+    async def stream(
+        self,
+        bucket: BucketNames,
+        hashed_filename: str,
+        offset: int = 0,
+        length: int | None = None,
+    ) -> AsyncIterator[bytes]:
+        """Read an object in chunks, through the cache if its bucket is cached."""
+
+        if bucket not in self.buckets:
+            async for chunk in self.adapter.stream(
+                bucket, hashed_filename, offset, length
+            ):
+                yield chunk
+
+            return
+
+        # The objects of the cached buckets are small, so they are read whole.
+        bucket_object = await self.get(bucket, hashed_filename)
+        if bucket_object is None:
+            raise FileNotFoundError(f"File {hashed_filename} does not exist.")
+
+        end = len(bucket_object.obj) if length is None else offset + length
+        for start in range(offset, end, STREAM_CHUNK_SIZE):
+            yield bucket_object.obj[start : min(start + STREAM_CHUNK_SIZE, end)]
+
+    @override
+    async def presigned_url(
+        self,
+        bucket: BucketNames,
+        hashed_filename: str,
+        response_headers: dict[str, str] | None = None,
+    ) -> str | None:
+        """Get a presigned URL of an object from the wrapped adapter."""
+
+        return await self.adapter.presigned_url(
+            bucket, hashed_filename, response_headers
+        )
+
+
+# The object store adapter shared by every request of the process
+_object_store: ObjectStoreAdapter | None = None
+
+
+async def get_object_store() -> ObjectStoreAdapter:
+    """Get the object store adapter shared by the process.
+
+    The adapter, and its pooled connections, are created once and reused
+    instead of being created again for every request. The small objects of
+    the configured buckets are also cached in memory.
+
+    Returns:
+        The object store adapter instance.
+    """
+
+    global _object_store  # pylint: disable=W0603
+    if _object_store is None:
+        conf = app_config.object_store
+        _object_store = await get_object_store_handler(conf)
+        if conf.cache_size > 0:
+            logger.debug("Caching objects of buckets: %s", conf.cache_buckets)
+            _object_store = CachedObjectStoreAdapter(
+                _object_store,
+                ObjectCache(conf.cache_size, conf.cache_max_object_size),
+                {BucketNames[name.upper()] for name in conf.cache_buckets},
+            )
+
+    return _object_store
+
+
+async def get_object_cache_stats() -> ObjectCacheStats:
+    """Get the statistics of the object cache of this worker process."""
+
+    adapter = await get_object_store()
+    if isinstance(adapter, CachedObjectStoreAdapter):
+        return adapter.cache.stats
+
+    return ObjectCacheStats(
+        enabled=False,
+        hits=0,
+        misses=0,
+        hit_rate=0.0,
+        evictions=0,
+        invalidations=0,
+        entries=0,
+        size=0,
+        capacity=0,
+    )
+
+
+async def init_object_store() -> ObjectStoreAdapter:
+    """Create the shared object store adapter and check its health.
+
+    Returns:
+        The object store adapter instance.
+    """
+
+    adapter = await get_object_store()
+    await adapter.check()
+    return adapter
+
+
+async def close_object_store() -> None:
+    """Close the shared object store adapter and its I/O and image pools."""
+
+    global _object_store, _io_executor, _image_executor  # pylint: disable=W0603
+    if _object_store is not None:
+        await _object_store.close()
+        _object_store = None
+
+    if _io_executor is not None:
+        _io_executor.shutdown(wait=True)
+        _io_executor = None
+
+    if _image_executor is not None:
+        _image_executor.shutdown(wait=False, cancel_futures=True)
+        _image_executor = None
@@ -1,24 +1,48 @@
 import json
-import time
-import uuid
+from typing import Final
 
 from fastapi import HTTPException, UploadFile, status
-from sqlmodel import Session, select
+from fastapi.responses import Response
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, col, select
 
 from centralserver.internals.adapters.object_store import (
+    MAX_ATTACHMENT_SIZE,
     BucketNames,
-    get_object_store_handler,
-    validate_attachment_file,
+    UploadStream,
+    get_object_store,
 )
-from centralserver.internals.config_handler import app_config
+from centralserver.internals.download_handler import stream_object
 from centralserver.internals.logger import LoggerFactory
 from centralserver.internals.models.reports.attachments import (
+    AttachmentBlob,
     AttachmentUploadResponse,
     ReportAttachment,
 )
 
 logger = LoggerFactory().get_logger(__name__)
 
+# How many times an upload races the deletion of its stored file before failing.
+BLOB_REFERENCE_ATTEMPTS: Final[int] = 3
+
+
+def _add_blob_reference(session: Session, digest: str) -> bool:
+    """Count another attachment sharing a stored file.
+
+    The increment is done in SQL so that concurrent uploads are all counted.
+
+    Returns:
+        False if the file's record was deleted in the meantime.
+    """
+
+    result = session.execute(
+        update(AttachmentBlob)
+        .where(col(AttachmentBlob.sha256) == digest)
+        .values(reference_count=col(AttachmentBlob.reference_count) + 1)
+    )
+    return bool(result.rowcount)
+
 
 async def upload_report_attachment(
     file: UploadFile, session: Session, description: str | None = None
@@ -49,34 +73,70 @@ async def upload_report_attachment(
         )
 
     try:
-        # Read and validate the file
-        file_content = await file.read()
-        processed_file = await validate_attachment_file(file_content, file.filename)
-
         # Get object store manager
-        object_store_manager = await get_object_store_handler(app_config.object_store)
-
-        # Generate a unique filename using timestamp
-        unique_filename = f"{uuid.uuid4()}-{time.strftime('%Y%m%d%H%M%S')}"
-
-        # Upload to object storage
-        bucket_object = await object_store_manager.put(
-            BucketNames.ATTACHMENTS, unique_filename, processed_file
-        )
-
-        # Create database record (let SQLModel auto-generate the ID)
+        object_store_manager = await get_object_store()
+
+        # Hash the file first, enforcing the size limit as it is read. The
+        # upload is already spooled by Starlette, so this does not hold it
+        # in memory, and it lets duplicates skip the write altogether.
+        hashing = UploadStream(file, MAX_ATTACHMENT_SIZE, file.filename)
+        async for _ in hashing.chunks():
+            pass
+
+        # Files are stored once under their SHA-256 digest, while every
+        # upload gets its own attachment with its own name and description.
+        digest = hashing.digest
         attachment = ReportAttachment(
             filename=file.filename,
-            file_urn=bucket_object.fn,
+            sha256=digest,
             file_type=file.content_type,
-            file_size=len(processed_file),
+            file_size=hashing.size,
             description=description,
         )
 
-        session.add(attachment)
-        session.commit()
-        session.refresh(attachment)
+        for _ in range(BLOB_REFERENCE_ATTEMPTS):
+            if session.get(AttachmentBlob, digest, populate_existing=True) is None:
+                # Always write the file, since a file without a record may be
+                # in the middle of being deleted.
+                await file.seek(0)
+                upload = UploadStream(file, MAX_ATTACHMENT_SIZE, file.filename)
+                await object_store_manager.put_stream(
+                    BucketNames.ATTACHMENTS, digest, upload.chunks()
+                )
+                logger.debug(
+                    "File '%s' uploaded. Size: %d bytes, SHA-256: %s",
+                    file.filename,
+                    hashing.size,
+                    digest,
+                )
+
+                try:
+                    session.add(AttachmentBlob(sha256=digest, file_size=hashing.size))
+                    session.add(attachment)
+                    session.commit()
+                    break
+
+                except IntegrityError:
+                    # A concurrent upload of the same file stored it first.
+                    session.rollback()
+
+            if _add_blob_reference(session, digest):
+                session.add(attachment)
+                session.commit()
+                logger.info(
+                    "Report attachment '%s' is a duplicate of %s",
+                    file.filename,
+                    digest,
+                )
+                break
+
+            # The file's record was deleted since it was read, so store it again.
+            session.rollback()
+
+        else:
+            raise RuntimeError(f"Could not store the attachment file {digest}.")
 
+        session.refresh(attachment)
         logger.info("Report attachment uploaded: %s", attachment.file_urn)
 
         return AttachmentUploadResponse(
@@ -84,8 +144,16 @@ async def upload_report_attachment(
             filename=attachment.filename,
             file_size=attachment.file_size,
             file_type=attachment.file_type,
+            sha256=digest,
         )
 
+    except ValueError as e:
+        logger.warning("Rejected report attachment: %s", str(e))
+        raise HTTPException(
+            status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+            detail=str(e),
+        ) from e
+
     except Exception as e:
         logger.error("Failed to upload report attachment: %s", str(e))
         raise HTTPException(
@@ -95,16 +163,17 @@ async def upload_report_attachment(
 
 
 async def get_report_attachment(
-    file_urn: str, session: Session
-) -> tuple[bytes, str, str]:
-    """Get a report attachment from object storage.
+    file_urn: str, session: Session, range_header: str | None = None
+) -> Response:
+    """Stream a report attachment from object storage.
 
     Args:
         file_urn: The URN of the file to retrieve.
         session: Database session.
+        range_header: The byte range of the file to retrieve. (Optional)
 
     Returns:
-        Tuple of (file_content, filename, content_type).
+        The response streaming the file, or the requested range of it.
 
     Raises:
         HTTPException: If file not found or retrieval fails.
@@ -120,21 +189,18 @@ async def get_report_attachment(
         )
 
     try:
-        # Get object store manager
-        object_store_manager = await get_object_store_handler(app_config.object_store)
-
-        # Get file from object storage
-        bucket_object = await object_store_manager.get(
-            BucketNames.ATTACHMENTS, file_urn
+        # Attachments uploaded before files were shared are stored under their URN.
+        return await stream_object(
+            BucketNames.ATTACHMENTS,
+            attachment.sha256 or attachment.file_urn,
+            attachment.file_type,
+            range_header,
+            "File not found in storage.",
+            {"Content-Disposition": f"attachment; filename={attachment.filename}"},
         )
 
-        if not bucket_object:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="File not found in storage.",
-            )
-
-        return bucket_object.obj, attachment.filename, attachment.file_type
+    except HTTPException:
+        raise
 
     except Exception as e:
         logger.error("Failed to retrieve report attachment: %s", str(e))
@@ -246,7 +312,9 @@ def get_attachment_urns_list(urns_json: str | None) -> list[str]:
 
 
 async def delete_report_attachment(file_urn: str, session: Session) -> None:
-    """Delete a report attachment from both database and object storage.
+    """Delete a report attachment.
+
+    Its file is deleted from object storage when no other attachment shares it.
 
     Args:
         file_urn: The URN of the file to delete.
@@ -267,17 +335,43 @@ async def delete_report_attachment(file_urn: str, session: Session) -> None:
 
     try:
         # Get object store manager
-        object_store_manager = await get_object_store_handler(app_config.object_store)
-
-        # Delete from object storage
-        await object_store_manager.delete(BucketNames.ATTACHMENTS, file_urn)
+        object_store_manager = await get_object_store()
+
+        digest = attachment.sha256
+        if digest is None:
+            # Attachments uploaded before files were shared own their file.
+            session.delete(attachment)
+            session.commit()
+            await object_store_manager.delete(
+                BucketNames.ATTACHMENTS, attachment.file_urn
+            )
+            logger.info("Report attachment deleted: %s", file_urn)
+            return
 
-        # Delete from database
         session.delete(attachment)
+        session.execute(
+            update(AttachmentBlob)
+            .where(col(AttachmentBlob.sha256) == digest)
+            .values(reference_count=col(AttachmentBlob.reference_count) - 1)
+        )
         session.commit()
-
         logger.info("Report attachment deleted: %s", file_urn)
 
+        # The file's record is locked until the file is deleted, so an upload
+        # of the same file either counts it before, or stores it again after.
+        blob = session.exec(
+            select(AttachmentBlob)
+            .where(col(AttachmentBlob.sha256) == digest)
+            .with_for_update()
+            .execution_options(populate_existing=True)
+        ).first()
+        if blob is not None and blob.reference_count <= 0:
+            await object_store_manager.delete(BucketNames.ATTACHMENTS, digest)
+            session.delete(blob)
+            logger.info("Report attachment file deleted: %s", digest)
+
+        session.commit()
+
     except Exception as e:
         logger.error("Failed to delete report attachment: %s", str(e))
         session.rollback()
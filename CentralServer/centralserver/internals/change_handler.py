@@ -0,0 +1,507 @@
+"""Change log recording and retrieval for incremental client sync."""
+
+import asyncio
+import datetime
+import json
+from typing import Any
+
+from sqlalchemy import ColumnElement, delete, event, insert, inspect, literal
+from sqlalchemy.orm import Session as ORMSession
+from sqlalchemy.orm import UOWTransaction
+from sqlmodel import Session, SQLModel, col, func, or_, select
+
+from centralserver.internals.config_handler import app_config
+from centralserver.internals.logger import LoggerFactory
+from centralserver.internals.models.change_log import (
+    ChangeAction,
+    ChangeEntity,
+    ChangeFeedPage,
+    ChangeLogEntry,
+    ChangeRetentionReport,
+)
+from centralserver.internals.models.notification import (
+    AnnouncementReceipt,
+    Notification,
+)
+from centralserver.internals.models.reports.attachments import (
+    AttachmentBlob,
+    ReportAttachment,
+)
+from centralserver.internals.models.reports.monthly_report import MonthlyReport
+from centralserver.internals.models.user import User
+
+logger = LoggerFactory().get_logger(__name__)
+
+# User attributes that are part of the user's profile. Bookkeeping columns such
+# as login timestamps and token hashes are left out so that logging in does not
+# flood the change feed.
+USER_PROFILE_FIELDS = frozenset(
+    {
+        "username",
+        "email",
+        "nameFirst",
+        "nameMiddle",
+        "nameLast",
+        "position",
+        "avatarUrn",
+        "signatureUrn",
+        "schoolId",
+        "roleId",
+        "deactivated",
+        "finishedTutorials",
+        "otpVerified",
+        "oauthLinkedGoogleId",
+        "forceUpdateInfo",
+        "emailVerified",
+    }
+)
+
+# The running change log retention job, if any
+_retention_task: asyncio.Task[None] | None = None
+
+REPORT_ENTITIES = (ChangeEntity.REPORT, ChangeEntity.ENTRY, ChangeEntity.STATUS)
+_REPORT_MODELS_PACKAGE = "centralserver.internals.models.reports."
+
+
+def _primary_key(obj: SQLModel) -> str:
+    """Get the JSON-encoded primary key of a mapped object."""
+
+    mapper = inspect(obj).mapper
+    return json.dumps(
+        [
+            getattr(obj, mapper.get_property_by_column(column).key)
+            for column in mapper.primary_key
+        ],
+        default=str,
+    )
+
+
+def _changed_fields(obj: SQLModel) -> list[str]:
+    """Get the names of the column attributes modified on a dirty object."""
+
+    state = inspect(obj)
+    return [
+        attr.key
+        for attr in state.attrs
+        if attr.key in state.mapper.column_attrs and attr.history.has_changes()
+    ]
+
+
+def _build_entry(obj: SQLModel, action: ChangeAction) -> ChangeLogEntry | None:
+    """Build a change log entry for a mutated object.
+
+    Args:
+        obj: The object that was created, updated, or deleted.
+        action: The kind of mutation.
+
+    Returns:
+        The change log entry, or None if the object is not tracked.
+    """
+
+    fields = _changed_fields(obj) if action == ChangeAction.UPDATED else []
+
+    if isinstance(obj, (Notification, AnnouncementReceipt)):
+        entity, owner_id, school_id, report_month = (
+            ChangeEntity.NOTIFICATION,
+            obj.ownerId,
+            None,
+            None,
+        )
+
+    elif isinstance(obj, User):
+        if action == ChangeAction.UPDATED:
+            fields = [f for f in fields if f in USER_PROFILE_FIELDS]
+            if not fields:
+                return None
+
+        entity, owner_id, school_id, report_month = (
+            ChangeEntity.USER,
+            obj.id,
+            obj.schoolId,
+            None,
+        )
+
+    elif isinstance(obj, MonthlyReport):
+        entity, owner_id, school_id, report_month = (
+            ChangeEntity.REPORT,
+            None,
+            obj.submittedBySchool,
+            obj.id,
+        )
+
+    elif type(obj).__module__.startswith(_REPORT_MODELS_PACKAGE) and not isinstance(
+        obj, (AttachmentBlob, ReportAttachment)
+    ):
+        table_name: str = getattr(obj, "__tablename__")
+        entity = (
+            ChangeEntity.ENTRY
+            if table_name.endswith("Entries")
+            else ChangeEntity.REPORT
+        )
+        owner_id = None
+        school_id = getattr(obj, "schoolId", None) or getattr(obj, "school", None)
+        report_month = getattr(obj, "parent", None)
+
+    else:
+        return None
+
+    if action == ChangeAction.UPDATED and not fields:
+        return None
+
+    if entity == ChangeEntity.REPORT and "reportStatus" in fields:
+        entity = ChangeEntity.STATUS
+
+    return ChangeLogEntry(
+        entity=entity,
+        action=action,
+        resource=getattr(obj, "__tablename__"),
+        key=_primary_key(obj),
+        schoolId=school_id,
+        ownerId=owner_id,
+        reportMonth=report_month,
+        changedFields=json.dumps(fields) if fields else None,
+    )
+
+
+@event.listens_for(ORMSession, "before_flush")
+def record_changes(
+    session: ORMSession,
+    flush_context: UOWTransaction,  # pylint: disable=W0613
+    instances: Any,  # pylint: disable=W0613
+) -> None:
+    """Record tracked mutations into the change log before they are flushed.
+
+    The change log entries are added to the same session, so they are
+    committed (or rolled back) together with the mutations they describe.
+    """
+
+    entries: list[ChangeLogEntry] = []
+    for action, objects in (
+        (ChangeAction.CREATED, session.new),
+        (ChangeAction.UPDATED, session.dirty),
+        (ChangeAction.DELETED, session.deleted),
+    ):
+        for obj in objects:
+            if isinstance(obj, ChangeLogEntry):
+                continue
+
+            if action == ChangeAction.UPDATED and not session.is_modified(
+                obj, include_collections=False
+            ):
+                continue
+
+            entry = _build_entry(obj, action)
+            if entry is not None:
+                entries.append(entry)
+
+    if entries:
+        logger.debug("Recording %d change log entries", len(entries))
+        session.add_all(entries)
+
+
+def record_notification_changes(
+    session: Session,
+    action: ChangeAction,
+    table: type[Notification] | type[AnnouncementReceipt],
+    condition: ColumnElement[bool],
+    fields: list[str] | None = None,
+) -> None:
+    """Record changes to notifications made with bulk statements.
+
+    Bulk INSERT, UPDATE, and DELETE statements are not flushed by the ORM, so
+    `record_changes` never sees them. The entries are inserted with a single
+    INSERT ... SELECT, which must run after the rows are inserted or updated,
+    and before they are deleted.
+
+    Args:
+        session: The database session to use.
+        action: The kind of mutation.
+        table: The notifications or the announcement receipts table.
+        condition: The condition that selects the changed rows.
+        fields: The attributes changed by an update.
+    """
+
+    # The keys are encoded the same way as `_primary_key` does.
+    if table is Notification:
+        key = literal('["') + Notification.id + literal('"]')
+
+    else:
+        key = (
+            literal('["')
+            + AnnouncementReceipt.ownerId
+            + literal('", "')
+            + AnnouncementReceipt.announcementId
+            + literal('"]')
+        )
+
+    columns = ChangeLogEntry.__table__.c  # type: ignore
+    session.execute(
+        insert(ChangeLogEntry).from_select(
+            [
+                "created",
+                "entity",
+                "action",
+                "resource",
+                "key",
+                "ownerId",
+                "changedFields",
+            ],
+            select(
+                literal(
+                    datetime.datetime.now(datetime.timezone.utc), columns.created.type
+                ),
+                literal(ChangeEntity.NOTIFICATION, columns.entity.type),
+                literal(action, columns.action.type),
+                literal(getattr(table, "__tablename__"), columns.resource.type),
+                key,
+                table.ownerId,
+                literal(
+                    json.dumps(fields) if fields else None, columns.changedFields.type
+                ),
+            ).where(condition),
+        )
+    )
+
+
+async def get_change_cursor(session: Session) -> int:
+    """Get the cursor of the latest recorded change.
+
+    Args:
+        session: The database session to use.
+
+    Returns:
+        The ID of the latest change, or 0 if there are none.
+    """
+
+    return session.exec(select(func.max(ChangeLogEntry.id))).one() or 0
+
+
+def _settled_cursor(session: Session, since: int, head: int) -> int:
+    """Get the highest cursor below which no change can still be committed.
+
+    Change IDs are handed out when a change is inserted, not when it is
+    committed, so a missing ID may belong to a transaction that is still
+    running. The cursor is held before the first missing ID that is followed
+    by a change recorded within the settle window. Older gaps are assumed to
+    be rolled back transactions.
+
+    Args:
+        session: The database session to use.
+        since: The cursor of the client.
+        head: The ID of the latest change.
+
+    Returns:
+        The cursor that no change committed later can fall behind.
+    """
+
+    cutoff = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(
+        seconds=app_config.changes.settle_window
+    )
+    young_start = session.exec(
+        select(func.min(ChangeLogEntry.id)).where(
+            col(ChangeLogEntry.id) > since, col(ChangeLogEntry.created) > cutoff
+        )
+    ).one()
+    if young_start is None:
+        return head
+
+    # Only gaps after the last old change can still be filled. If there is
+    # none, the changes before the first recent one were deleted.
+    settled = session.exec(
+        select(func.max(ChangeLogEntry.id)).where(col(ChangeLogEntry.id) < young_start)
+    ).one()
+    expected = max(since + 1, young_start if settled is None else settled + 1)
+    for change_id in session.exec(
+        select(ChangeLogEntry.id)
+        .where(col(ChangeLogEntry.id) >= expected)
+        .where(col(ChangeLogEntry.id) <= head)
+        .order_by(col(ChangeLogEntry.id))
+    ).all():
+        if change_id != expected:
+            logger.debug("Holding the change cursor before ID %d", expected)
+            return expected - 1
+
+        expected = change_id + 1
+
+    return head
+
+
+async def get_settled_change_cursor(session: Session) -> int:
+    """Get the cursor to take a full snapshot at.
+
+    Unlike the latest change, this cursor is held before the changes that may
+    not be committed yet, so that a client polling from it receives them.
+
+    Args:
+        session: The database session to use.
+
+    Returns:
+        The settled cursor, or 0 if there are no changes.
+    """
+
+    return _settled_cursor(session, 0, await get_change_cursor(session))
+
+
+async def get_changes(
+    session: Session,
+    since: int,
+    user_id: str,
+    school_id: int | None,
+    limit: int = 100,
+    local_reports: bool = False,
+    global_reports: bool = False,
+    global_users: bool = False,
+) -> ChangeFeedPage:
+    """Get the changes recorded after a cursor that are visible to a user.
+
+    Args:
+        session: The database session to use.
+        since: Only return changes with a cursor greater than this.
+        user_id: The ID of the user requesting the changes.
+        school_id: The ID of the school the user is assigned to.
+        limit: The maximum number of changes to return.
+        local_reports: Whether the user can read their school's reports.
+        global_reports: Whether the user can read all reports.
+        global_users: Whether the user can read all users.
+
+    Returns:
+        A page of changes, and the cursor to resume from. If the changes after
+        the cursor have been deleted by the retention job, `resync` is set
+        and the client must fetch a full snapshot before resuming.
+    """
+
+    visibility = [
+        (ChangeLogEntry.entity == ChangeEntity.NOTIFICATION)
+        & (ChangeLogEntry.ownerId == user_id),
+        (
+            ChangeLogEntry.entity == ChangeEntity.USER
+            if global_users
+            else (ChangeLogEntry.entity == ChangeEntity.USER)
+            & (ChangeLogEntry.ownerId == user_id)
+        ),
+    ]
+    if global_reports:
+        visibility.append(col(ChangeLogEntry.entity).in_(REPORT_ENTITIES))
+
+    elif local_reports and school_id is not None:
+        visibility.append(
+            col(ChangeLogEntry.entity).in_(REPORT_ENTITIES)
+            & (ChangeLogEntry.schoolId == school_id)
+        )
+
+    # Bound the page by the head cursor read up front so that changes
+    # committed while this request runs are picked up by the next poll, and
+    # hold it behind the changes that may not be committed yet.
+    head = _settled_cursor(session, since, await get_change_cursor(session))
+    oldest = session.exec(select(func.min(ChangeLogEntry.id))).one()
+    if oldest is not None and since < oldest - 1:
+        logger.debug("Change cursor %d is older than the change log", since)
+        return ChangeFeedPage(cursor=head, more=False, changes=[], resync=True)
+
+    changes = list(
+        session.exec(
+            select(ChangeLogEntry)
+            .where(col(ChangeLogEntry.id) > since)
+            .where(col(ChangeLogEntry.id) <= head)
+            .where(or_(*visibility))
+            .order_by(col(ChangeLogEntry.id))
+            .limit(limit + 1)
+        ).all()
+    )
+
+    more = len(changes) > limit
+    changes = changes[:limit]
+    if more:
+        cursor = changes[-1].id or since
+    else:
+        # Skip over changes the user cannot see so idle polls stay cheap.
+        cursor = max(since, head)
+
+    return ChangeFeedPage(cursor=cursor, more=more, changes=changes)
+
+
+async def apply_change_retention(
+    session: Session, retention_days: int, batch_size: int
+) -> ChangeRetentionReport:
+    """Delete the changes older than the retention period.
+
+    The latest change is always kept, so that its ID is never handed out
+    again and the cursors of the clients stay valid.
+
+    Args:
+        session: The database session to use.
+        retention_days: Delete changes older than this many days.
+        batch_size: The maximum number of rows deleted per transaction.
+
+    Returns:
+        The number of deleted changes.
+    """
+
+    report = ChangeRetentionReport()
+    cutoff = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(
+        days=retention_days
+    )
+    head = await get_change_cursor(session)
+    while True:
+        change_ids = session.exec(
+            select(ChangeLogEntry.id)
+            .where(col(ChangeLogEntry.created) < cutoff)
+            .where(col(ChangeLogEntry.id) < head)
+            .order_by(col(ChangeLogEntry.id))
+            .limit(batch_size)
+        ).all()
+        if not change_ids:
+            break
+
+        session.execute(
+            delete(ChangeLogEntry).where(col(ChangeLogEntry.id).in_(change_ids))
+        )
+        session.commit()
+        report.deleted += len(change_ids)
+        await asyncio.sleep(0)
+
+    logger.info("Change log retention deleted %d rows", report.deleted)
+    return report
+
+
+async def run_change_retention() -> None:
+    """Apply the configured change log retention periodically."""
+
+    # Imported here to avoid a circular import with the database handler.
+    from centralserver.internals.db_handler import get_db_session
+
+    config = app_config.changes
+    while True:
+        try:
+            with next(get_db_session()) as session:
+                await apply_change_retention(
+                    session, config.retention_days, config.retention_batch_size
+                )
+
+        except Exception as e:
+            logger.error("Change log retention failed: %s", e)
+
+        await asyncio.sleep(config.retention_interval)
+
+
+def start_change_retention() -> None:
+    """Start the change log retention job."""
+
+    global _retention_task  # pylint: disable=W0603
+    if _retention_task is None:
+        _retention_task = asyncio.create_task(run_change_retention())
+
+
+async def stop_change_retention() -> None:
+    """Stop the change log retention job."""
+
+    global _retention_task  # pylint: disable=W0603
+    if _retention_task is not None:
+        _retention_task.cancel()
+        try:
+            await _retention_task
+
+        except asyncio.CancelledError:
+            pass
+
+        _retention_task = None
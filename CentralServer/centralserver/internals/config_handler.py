@@ -5,15 +5,19 @@ from typing import Any
 
 from centralserver import info
 from centralserver.internals.adapters.config import (
+    BackplaneAdapterConfig,
     DatabaseAdapterConfig,
     GarageObjectStoreAdapterConfig,
     GoogleOAuthAdapterConfig,
+    LocalBackplaneAdapterConfig,
     LocalObjectStoreAdapterConfig,
     MinIOObjectStoreAdapterConfig,
     MySQLDatabaseConfig,
     ObjectStoreAdapterConfig,
+    PostgresBackplaneAdapterConfig,
     PostgreSQLDatabaseConfig,
     SQLiteDatabaseConfig,
+    UnixSocketBackplaneAdapterConfig,
 )
 from centralserver.internals.models.oauth import OAuthConfigs
 
@@ -139,7 +143,12 @@ class Logging:
         "encoding",
         "log_format",
         "date_format",
+        "formatter",
+        "slow_request_threshold",
+        "request_log_level",
     ]
+    __formatters = ["text", "json"]
+    __request_log_levels = ["DEBUG", "INFO", "WARNING"]
 
     def __init__(
         self,
@@ -150,6 +159,9 @@ class Logging:
         encoding: str | None = None,
         log_format: str | None = None,
         date_format: str | None = None,
+        formatter: str | None = None,
+        slow_request_threshold: float | None = None,
+        request_log_level: str | None = None,
     ):
         """Create a configuration object for logging.
 
@@ -161,8 +173,20 @@ class Logging:
             encoding: The encoding of the log file.
             log_format: The format of the log messages.
             date_format: The format of the date in the log messages.
+            formatter: The format of the log lines: "text" uses `log_format`, and "json" writes one JSON object per line. (Default: "text")
+            slow_request_threshold: The number of seconds after which a request is logged as slow. (Default: 1.0)
+            request_log_level: The level of the line logged for every request, regardless of debug mode. Slow requests are always logged as warnings. (Default: "INFO")
         """
 
+        if formatter is not None and formatter not in Logging.__formatters:
+            raise ValueError(f"Invalid log formatter: {formatter}")
+
+        if (
+            request_log_level is not None
+            and request_log_level.upper() not in Logging.__request_log_levels
+        ):
+            raise ValueError(f"Invalid request log level: {request_log_level}")
+
         self.file_logging_enabled: bool = (
             file_logging_enabled if file_logging_enabled is not None else True
         )
@@ -176,6 +200,9 @@ class Logging:
             log_format or "%(asctime)s:%(name)s:%(levelname)s:%(message)s"
         )
         self.date_format: str = date_format or "%d-%m-%y_%H-%M-%S"
+        self.formatter: str = formatter or "text"
+        self.slow_request_threshold: float = slow_request_threshold or 1.0
+        self.request_log_level: str = (request_log_level or "INFO").upper()
 
     def export(self) -> dict[str, Any]:
         """Export the logging configuration as a dictionary."""
@@ -367,6 +394,16 @@ class Mailing:
         "password",
         "templates_dir",
         "templates_encoding",
+        "starttls",
+        "pool_size",
+        "max_concurrency",
+        "timeout",
+        "outbox_poll_interval",
+        "domain_rate_limit",
+        "max_attempts",
+        "retry_backoff",
+        "digest_window",
+        "claim_timeout",
     ]
 
     def __init__(
@@ -379,6 +416,16 @@ class Mailing:
         password: str | None = None,
         templates_dir: str | None = None,
         templates_encoding: str | None = None,
+        starttls: bool | None = None,
+        pool_size: int | None = None,
+        max_concurrency: int | None = None,
+        timeout: float | None = None,
+        outbox_poll_interval: float | None = None,
+        domain_rate_limit: int | None = None,
+        max_attempts: int | None = None,
+        retry_backoff: float | None = None,
+        digest_window: float | None = None,
+        claim_timeout: float | None = None,
     ) -> None:
         """The mailing configuration.
 
@@ -391,6 +438,16 @@ class Mailing:
             password: The password for the SMTP server.
             templates_dir: The directory containing email templates. (Default: "./templates/mail/")
             templates_encoding: The encoding of the email templates. (Default: "utf-8")
+            starttls: Whether to upgrade SMTP connections with STARTTLS. (Default: True)
+            pool_size: The maximum number of idle SMTP connections kept open for reuse. (Default: 2)
+            max_concurrency: The maximum number of emails sent at the same time. (Default: 4)
+            timeout: The number of seconds before an SMTP operation is abandoned. (Default: 30.0)
+            outbox_poll_interval: The number of seconds between checks of the mail outbox. (Default: 5.0)
+            domain_rate_limit: The maximum number of emails each worker process sends to a recipient domain per minute. (Default: 30)
+            max_attempts: The number of attempts to send an email before giving up. (Default: 5)
+            retry_backoff: The number of seconds before the first retry, doubled for each following one. (Default: 30.0)
+            digest_window: The number of seconds to collect notification emails to a recipient into one digest, or 0 to send them separately. (Default: 0)
+            claim_timeout: The number of seconds a worker holds the emails it is sending before other workers may take them over. (Default: 300.0)
         """
 
         if enabled and (not server or not from_address or not username or not password):
@@ -406,6 +463,16 @@ class Mailing:
             os.getcwd(), "templates", "mail"
         )
         self.templates_encoding: str = templates_encoding or "utf-8"
+        self.starttls: bool = True if starttls is None else starttls
+        self.pool_size: int = pool_size or 2
+        self.max_concurrency: int = max_concurrency or 4
+        self.timeout: float = timeout or 30.0
+        self.outbox_poll_interval: float = outbox_poll_interval or 5.0
+        self.domain_rate_limit: int = domain_rate_limit or 30
+        self.max_attempts: int = max_attempts or 5
+        self.retry_backoff: float = retry_backoff or 30.0
+        self.digest_window: float = digest_window or 0.0
+        self.claim_timeout: float = claim_timeout or 300.0
 
     def export(self) -> dict[str, Any]:
         """Export the mailing configuration as a dictionary."""
@@ -417,6 +484,159 @@ class Mailing:
         }
 
 
+class WebSocket:
+    """The WebSocket configuration."""
+
+    __exportable_fields = [
+        "send_timeout",
+        "queue_size",
+        "overflow_policy",
+        "heartbeat_interval",
+        "max_missed_pongs",
+        "coalesce_window",
+        "relay_queue_size",
+    ]
+    __overflow_policies = ("drop_oldest", "drop_newest", "close")
+
+    def __init__(
+        self,
+        send_timeout: float | None = None,
+        queue_size: int | None = None,
+        overflow_policy: str | None = None,
+        heartbeat_interval: float | None = None,
+        max_missed_pongs: int | None = None,
+        coalesce_window: float | None = None,
+        relay_queue_size: int | None = None,
+    ) -> None:
+        """The WebSocket configuration.
+
+        Args:
+            send_timeout: The number of seconds before a send to a connection is abandoned. (Default: 5.0)
+            queue_size: The maximum number of messages waiting to be sent to a connection. (Default: 256)
+            overflow_policy: What to do with a full outbox: "drop_oldest", "drop_newest", or "close". (Default: "drop_oldest")
+            heartbeat_interval: The number of seconds between server pings to a connection. (Default: 30.0)
+            max_missed_pongs: The number of unanswered pings in a row before a connection is closed. (Default: 2)
+            coalesce_window: The number of seconds to collect messages for a connection before sending them as one batch frame, or 0 to disable batching. (Default: 0.01)
+            relay_queue_size: The maximum number of messages waiting to be relayed to the other workers. (Default: 1024)
+        """
+
+        if (
+            overflow_policy is not None
+            and overflow_policy not in WebSocket.__overflow_policies
+        ):
+            raise ValueError(f"Invalid WebSocket overflow policy: {overflow_policy}")
+
+        self.send_timeout: float = send_timeout or 5.0
+        self.queue_size: int = queue_size or 256
+        self.overflow_policy: str = overflow_policy or "drop_oldest"
+        self.heartbeat_interval: float = heartbeat_interval or 30.0
+        self.max_missed_pongs: int = max_missed_pongs or 2
+        self.coalesce_window: float = (
+            0.01 if coalesce_window is None else coalesce_window
+        )
+        self.relay_queue_size: int = relay_queue_size or 1024
+
+    def export(self) -> dict[str, Any]:
+        """Export the WebSocket configuration as a dictionary."""
+
+        return {
+            field: getattr(self, field)
+            for field in WebSocket.__exportable_fields
+            if hasattr(self, field)
+        }
+
+
+class Notifications:
+    """The notification retention configuration."""
+
+    __exportable_fields = [
+        "archive_after_days",
+        "delete_after_days",
+        "retention_interval",
+        "retention_batch_size",
+    ]
+
+    def __init__(
+        self,
+        archive_after_days: int | None = None,
+        delete_after_days: int | None = None,
+        retention_interval: float | None = None,
+        retention_batch_size: int | None = None,
+    ) -> None:
+        """The notification retention configuration.
+
+        Args:
+            archive_after_days: Archive notifications older than this many days. (Default: None, never archive)
+            delete_after_days: Delete notifications archived more than this many days ago. (Default: None, never delete)
+            retention_interval: The number of seconds between runs of the retention job. (Default: 3600.0)
+            retention_batch_size: The maximum number of rows changed per transaction. (Default: 1000)
+        """
+
+        if archive_after_days is not None and archive_after_days < 1:
+            raise ValueError("archive_after_days must be at least 1.")
+
+        if delete_after_days is not None and delete_after_days < 1:
+            raise ValueError("delete_after_days must be at least 1.")
+
+        self.archive_after_days: int | None = archive_after_days
+        self.delete_after_days: int | None = delete_after_days
+        self.retention_interval: float = retention_interval or 3600.0
+        self.retention_batch_size: int = retention_batch_size or 1000
+
+    def export(self) -> dict[str, Any]:
+        """Export the notification retention configuration as a dictionary."""
+
+        return {
+            field: getattr(self, field)
+            for field in Notifications.__exportable_fields
+            if hasattr(self, field)
+        }
+
+
+class Changes:
+    """The change feed configuration."""
+
+    __exportable_fields = [
+        "settle_window",
+        "retention_days",
+        "retention_interval",
+        "retention_batch_size",
+    ]
+
+    def __init__(
+        self,
+        settle_window: float | None = None,
+        retention_days: int | None = None,
+        retention_interval: float | None = None,
+        retention_batch_size: int | None = None,
+    ) -> None:
+        """The change feed configuration.
+
+        Args:
+            settle_window: The number of seconds a missing change ID may still be committed. (Default: 30.0)
+            retention_days: Delete changes older than this many days. (Default: 30)
+            retention_interval: The number of seconds between runs of the retention job. (Default: 3600.0)
+            retention_batch_size: The maximum number of rows deleted per transaction. (Default: 1000)
+        """
+
+        if retention_days is not None and retention_days < 1:
+            raise ValueError("retention_days must be at least 1.")
+
+        self.settle_window: float = settle_window if settle_window is not None else 30.0
+        self.retention_days: int = retention_days or 30
+        self.retention_interval: float = retention_interval or 3600.0
+        self.retention_batch_size: int = retention_batch_size or 1000
+
+    def export(self) -> dict[str, Any]:
+        """Export the change feed configuration as a dictionary."""
+
+        return {
+            field: getattr(self, field)
+            for field in Changes.__exportable_fields
+            if hasattr(self, field)
+        }
+
+
 class AppConfig:
     """The main configuration object for the application."""
 
@@ -433,6 +653,10 @@ class AppConfig:
         authentication: Authentication | None = None,
         security: Security | None = None,
         mailing: Mailing | None = None,
+        websocket: WebSocket | None = None,
+        backplane: BackplaneAdapterConfig | None = None,
+        notifications: Notifications | None = None,
+        changes: Changes | None = None,
     ):
         """Create a configuration object for the application.
 
@@ -449,6 +673,10 @@ class AppConfig:
             authentication: Authentication configuration.
             security: Security configuration.
             mailing: Mailing configuration.
+            websocket: WebSocket configuration.
+            backplane: WebSocket backplane configuration.
+            notifications: Notification retention configuration.
+            changes: Change feed configuration.
         """
 
         self.__filepath: str | Path = fp
@@ -467,6 +695,13 @@ class AppConfig:
         self.authentication: Authentication = authentication or Authentication()
         self.security: Security = security or Security()
         self.mailing: Mailing = mailing or Mailing()
+        self.websocket: WebSocket = websocket or WebSocket()
+        # By default, assume a single worker process.
+        self.backplane: BackplaneAdapterConfig = (
+            backplane or LocalBackplaneAdapterConfig()
+        )
+        self.notifications: Notifications = notifications or Notifications()
+        self.changes: Changes = changes or Changes()
 
     @property
     def filepath(self) -> str | Path:
@@ -491,6 +726,10 @@ class AppConfig:
             "authentication": self.authentication.export(),
             "security": self.security.export(),
             "mailing": self.mailing.export(),
+            "websocket": self.websocket.export(),
+            "backplane": self.backplane.export() if self.backplane else None,
+            "notifications": self.notifications.export(),
+            "changes": self.changes.export(),
         }
 
     def save(self) -> None:
@@ -533,6 +772,9 @@ def read_config(
     authentication_config = config.get("authentication", {})
     security_config = config.get("security", {})
     mailing_config = config.get("mailing", {})
+    websocket_config = config.get("websocket", {})
+    notifications_config = config.get("notifications", {})
+    changes_config = config.get("changes", {})
 
     # Determine database type and create the appropriate config object
     database: dict[str, Any] = config.get("database", {})
@@ -585,6 +827,15 @@ def read_config(
                 allowed_image_types=object_store_config.get(
                     "allowed_image_types", None
                 ),
+                io_workers=object_store_config.get("io_workers", None),
+                image_workers=object_store_config.get("image_workers", None),
+                image_timeout=object_store_config.get("image_timeout", None),
+                max_image_pixels=object_store_config.get("max_image_pixels", None),
+                cache_size=object_store_config.get("cache_size", None),
+                cache_max_object_size=object_store_config.get(
+                    "cache_max_object_size", None
+                ),
+                cache_buckets=object_store_config.get("cache_buckets", None),
                 filepath=object_store_config.get("filepath", None),
             )
 
@@ -595,10 +846,28 @@ def read_config(
                 allowed_image_types=object_store_config.get(
                     "allowed_image_types", None
                 ),
+                io_workers=object_store_config.get("io_workers", None),
+                image_workers=object_store_config.get("image_workers", None),
+                image_timeout=object_store_config.get("image_timeout", None),
+                max_image_pixels=object_store_config.get("max_image_pixels", None),
+                cache_size=object_store_config.get("cache_size", None),
+                cache_max_object_size=object_store_config.get(
+                    "cache_max_object_size", None
+                ),
+                cache_buckets=object_store_config.get("cache_buckets", None),
                 access_key=object_store_config.get("access_key", None),
                 secret_key=object_store_config.get("secret_key", None),
                 endpoint=object_store_config.get("endpoint", None),
                 secure=object_store_config.get("secure", None),
+                pool_size=object_store_config.get("pool_size", None),
+                keepalive=object_store_config.get("keepalive", None),
+                timeout=object_store_config.get("timeout", None),
+                max_retries=object_store_config.get("max_retries", None),
+                retry_backoff=object_store_config.get("retry_backoff", None),
+                presigned_downloads=object_store_config.get(
+                    "presigned_downloads", None
+                ),
+                presigned_expiry=object_store_config.get("presigned_expiry", None),
             )
 
         case "garage":
@@ -608,10 +877,28 @@ def read_config(
                 allowed_image_types=object_store_config.get(
                     "allowed_image_types", None
                 ),
+                io_workers=object_store_config.get("io_workers", None),
+                image_workers=object_store_config.get("image_workers", None),
+                image_timeout=object_store_config.get("image_timeout", None),
+                max_image_pixels=object_store_config.get("max_image_pixels", None),
+                cache_size=object_store_config.get("cache_size", None),
+                cache_max_object_size=object_store_config.get(
+                    "cache_max_object_size", None
+                ),
+                cache_buckets=object_store_config.get("cache_buckets", None),
                 access_key=object_store_config.get("access_key", None),
                 secret_key=object_store_config.get("secret_key", None),
                 endpoint=object_store_config.get("endpoint", None),
                 secure=object_store_config.get("secure", None),
+                pool_size=object_store_config.get("pool_size", None),
+                keepalive=object_store_config.get("keepalive", None),
+                timeout=object_store_config.get("timeout", None),
+                max_retries=object_store_config.get("max_retries", None),
+                retry_backoff=object_store_config.get("retry_backoff", None),
+                presigned_downloads=object_store_config.get(
+                    "presigned_downloads", None
+                ),
+                presigned_expiry=object_store_config.get("presigned_expiry", None),
             )
 
         case None:  # Skip if no object store is specified
@@ -620,6 +907,51 @@ def read_config(
         case _:  # Error if the object store type is not supported
             raise ValueError(f"Unsupported {object_store_type} object store type.")
 
+    # Determine backplane type and create the appropriate config object
+    backplane: dict[str, Any] = config.get("backplane", {})
+    backplane_type: None | str = backplane.get("type", None)
+    backplane_config: dict[str, Any] = backplane.get("config", {})
+    final_backplane_config: BackplaneAdapterConfig | None = None
+    match backplane_type:
+        case "local":
+            final_backplane_config = LocalBackplaneAdapterConfig()
+
+        case "postgres":
+            # Reuse the database connection settings when they are not given.
+            db_defaults: dict[str, Any] = (
+                final_db_config.export()
+                if isinstance(final_db_config, PostgreSQLDatabaseConfig)
+                else {}
+            )
+            final_backplane_config = PostgresBackplaneAdapterConfig(
+                channel=backplane_config.get("channel", None),
+                username=backplane_config.get(
+                    "username", db_defaults.get("username", None)
+                ),
+                password=backplane_config.get(
+                    "password", db_defaults.get("password", None)
+                ),
+                host=backplane_config.get("host", db_defaults.get("host", None)),
+                port=backplane_config.get("port", db_defaults.get("port", None)),
+                database=backplane_config.get(
+                    "database", db_defaults.get("database", None)
+                ),
+                reconnect_interval=backplane_config.get("reconnect_interval", None),
+            )
+
+        case "unix":
+            final_backplane_config = UnixSocketBackplaneAdapterConfig(
+                socket_path=backplane_config.get("socket_path", None),
+                host_broker=backplane_config.get("host_broker", None),
+                reconnect_interval=backplane_config.get("reconnect_interval", None),
+            )
+
+        case None:  # Skip if no backplane is specified
+            pass
+
+        case _:  # Error if the backplane type is not supported
+            raise ValueError(f"Unsupported {backplane_type} backplane type.")
+
     oauth_config: dict[str, dict[str, str]] | None = authentication_config.get(
         "oauth", None
     )
@@ -666,6 +998,9 @@ def read_config(
             encoding=logging_config.get("encoding", None),
             log_format=logging_config.get("log_format", None),
             date_format=logging_config.get("date_format", None),
+            formatter=logging_config.get("formatter", None),
+            slow_request_threshold=logging_config.get("slow_request_threshold", None),
+            request_log_level=logging_config.get("request_log_level", None),
         ),
         database=final_db_config,
         object_store=final_object_store_config,
@@ -721,6 +1056,38 @@ def read_config(
             password=mailing_config.get("password", None),
             templates_dir=mailing_config.get("templates_dir", None),
             templates_encoding=mailing_config.get("templates_encoding", None),
+            starttls=mailing_config.get("starttls", None),
+            pool_size=mailing_config.get("pool_size", None),
+            max_concurrency=mailing_config.get("max_concurrency", None),
+            timeout=mailing_config.get("timeout", None),
+            outbox_poll_interval=mailing_config.get("outbox_poll_interval", None),
+            domain_rate_limit=mailing_config.get("domain_rate_limit", None),
+            max_attempts=mailing_config.get("max_attempts", None),
+            retry_backoff=mailing_config.get("retry_backoff", None),
+            digest_window=mailing_config.get("digest_window", None),
+            claim_timeout=mailing_config.get("claim_timeout", None),
+        ),
+        websocket=WebSocket(
+            send_timeout=websocket_config.get("send_timeout", None),
+            queue_size=websocket_config.get("queue_size", None),
+            overflow_policy=websocket_config.get("overflow_policy", None),
+            heartbeat_interval=websocket_config.get("heartbeat_interval", None),
+            max_missed_pongs=websocket_config.get("max_missed_pongs", None),
+            coalesce_window=websocket_config.get("coalesce_window", None),
+            relay_queue_size=websocket_config.get("relay_queue_size", None),
+        ),
+        backplane=final_backplane_config,
+        notifications=Notifications(
+            archive_after_days=notifications_config.get("archive_after_days", None),
+            delete_after_days=notifications_config.get("delete_after_days", None),
+            retention_interval=notifications_config.get("retention_interval", None),
+            retention_batch_size=notifications_config.get("retention_batch_size", None),
+        ),
+        changes=Changes(
+            settle_window=changes_config.get("settle_window", None),
+            retention_days=changes_config.get("retention_days", None),
+            retention_interval=changes_config.get("retention_interval", None),
+            retention_batch_size=changes_config.get("retention_batch_size", None),
         ),
     )
 
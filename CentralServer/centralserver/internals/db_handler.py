@@ -4,9 +4,14 @@ from fastapi import BackgroundTasks
 from sqlmodel import Session, SQLModel, create_engine, select
 
 from centralserver import info
-from centralserver.internals import models, permissions
+from centralserver.internals import (  # pylint: disable=W0611
+    change_handler,
+    models,
+    permissions,
+)
 from centralserver.internals.config_handler import app_config
 from centralserver.internals.logger import LoggerFactory
+from centralserver.internals.request_context import track_queries
 from centralserver.internals.user_handler import create_user
 
 logger = LoggerFactory().get_logger(__name__)
@@ -15,6 +20,7 @@ engine = create_engine(
     connect_args=app_config.database.connect_args,
     echo=app_config.debug.show_sql,
 )
+track_queries(engine)
 
 
 def get_db_session() -> Generator[Session, None, None]:
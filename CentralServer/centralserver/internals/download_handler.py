@@ -0,0 +1,161 @@
+from typing import Final
+
+from fastapi import HTTPException, status
+from fastapi.responses import RedirectResponse, Response, StreamingResponse
+
+from centralserver.internals.adapters.object_store import (
+    BucketNames,
+    get_object_store,
+)
+from centralserver.internals.config_handler import app_config
+from centralserver.internals.logger import LoggerFactory
+
+logger = LoggerFactory().get_logger(__name__)
+
+# The Cache-Control header of objects whose names change with their content
+IMMUTABLE_CACHE_CONTROL: Final[str] = "private, max-age=31536000, immutable"
+# The response headers that the object store can send for a presigned URL
+PRESIGNED_HEADERS: Final[set[str]] = {"Cache-Control", "Content-Disposition"}
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Check if the If-None-Match header of a request matches an ETag.
+
+    Args:
+        if_none_match: The value of the If-None-Match header, if any.
+        etag: The quoted ETag of the object.
+
+    Returns:
+        True if the client already has the object.
+    """
+
+    if not if_none_match:
+        return False
+
+    if if_none_match.strip() == "*":
+        return True
+
+    # Weak comparison, as required for If-None-Match by RFC 9110
+    return any(
+        tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(",")
+    )
+
+
+def parse_range(range_header: str | None, size: int) -> tuple[int, int] | None:
+    """Parse the HTTP Range header of a request for an object.
+
+    Only single byte ranges are supported. Other ranges are ignored, and the
+    whole object is sent instead, as allowed by RFC 9110.
+
+    Args:
+        range_header: The value of the Range header, if any.
+        size: The size of the object in bytes.
+
+    Returns:
+        The offset and length of the requested range, or None for the whole object.
+
+    Raises:
+        HTTPException: If the range is outside of the object.
+    """
+
+    if not range_header:
+        return None
+
+    unit, _, ranges = range_header.partition("=")
+    first, separator, last = ranges.strip().partition("-")
+    if unit.strip().lower() != "bytes" or "," in ranges or not separator:
+        return None
+
+    try:
+        if first:
+            offset = int(first)
+            end = min(int(last), size - 1) if last else size - 1
+
+        else:
+            # A suffix range requests the last bytes of the object.
+            offset = max(size - int(last), 0)
+            end = size - 1 if int(last) > 0 else -1
+
+    except ValueError:
+        return None
+
+    if offset < 0 or offset >= size or end < offset:
+        raise HTTPException(
+            status_code=status.HTTP_416_RANGE_NOT_SATISFIABLE,
+            detail="The requested range is not satisfiable.",
+            headers={"Content-Range": f"bytes */{size}"},
+        )
+
+    return offset, end - offset + 1
+
+
+async def stream_object(
+    bucket: BucketNames,
+    fn: str,
+    media_type: str,
+    range_header: str | None = None,
+    not_found_detail: str = "File not found.",
+    headers: dict[str, str] | None = None,
+) -> Response:
+    """Stream an object from the object store to the client in chunks.
+
+    If presigned downloads are enabled for an S3-compatible object store, the
+    client is redirected to a presigned URL of the object instead.
+
+    Args:
+        bucket: The bucket of the object.
+        fn: The name of the object.
+        media_type: The content type of the response.
+        range_header: The value of the request's Range header, if any.
+        not_found_detail: The error message if the object does not exist.
+        headers: Additional response headers. (Optional)
+
+    Returns:
+        The response streaming the whole object or the requested range of it,
+        or the redirect to the presigned URL of the object.
+
+    Raises:
+        HTTPException: If the object does not exist or the range is invalid.
+    """
+
+    handler = await get_object_store()
+    size = await handler.stat(bucket, fn)
+    if size is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=not_found_detail,
+        )
+
+    if app_config.object_store.presigned_downloads == "redirect":
+        url = await handler.presigned_url(
+            bucket,
+            fn,
+            {
+                "Content-Type": media_type,
+                **{k: v for k, v in (headers or {}).items() if k in PRESIGNED_HEADERS},
+            },
+        )
+        if url is not None:
+            logger.debug("Redirecting to a presigned URL of %s", fn)
+            return RedirectResponse(url, status_code=status.HTTP_307_TEMPORARY_REDIRECT)
+
+    response_headers = {"Accept-Ranges": "bytes", **(headers or {})}
+    requested = parse_range(range_header, size)
+    if requested is None:
+        response_headers["Content-Length"] = str(size)
+        return StreamingResponse(
+            handler.stream(bucket, fn),
+            media_type=media_type,
+            headers=response_headers,
+        )
+
+    offset, length = requested
+    logger.debug("Streaming bytes %d-%d of %s", offset, offset + length - 1, fn)
+    response_headers["Content-Length"] = str(length)
+    response_headers["Content-Range"] = f"bytes {offset}-{offset + length - 1}/{size}"
+    return StreamingResponse(
+        handler.stream(bucket, fn, offset, length),
+        status_code=status.HTTP_206_PARTIAL_CONTENT,
+        media_type=media_type,
+        headers=response_headers,
+    )
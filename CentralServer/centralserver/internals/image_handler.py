@@ -0,0 +1,233 @@
+from io import BytesIO
+from typing import Final
+
+from fastapi import HTTPException, status
+from fastapi.responses import Response
+from PIL import Image
+
+from centralserver.internals.adapters.object_store import (
+    BucketNames,
+    get_object_store,
+    run_image_job,
+)
+from centralserver.internals.download_handler import (
+    IMMUTABLE_CACHE_CONTROL,
+    etag_matches,
+    stream_object,
+)
+from centralserver.internals.logger import LoggerFactory
+
+logger = LoggerFactory().get_logger(__name__)
+
+# The sizes in pixels of the longest side of the image derivatives
+IMAGE_DERIVATIVE_SIZES: Final[tuple[int, ...]] = (32, 64, 128, 256)
+# The quality of the WebP derivatives (0-100)
+WEBP_QUALITY: Final[int] = 80
+
+
+def derivative_name(fn: str, size: int, webp: bool) -> str:
+    """Get the object name of an image derivative.
+
+    Args:
+        fn: The object name of the original image.
+        size: The size of the longest side of the derivative.
+        webp: Whether the derivative is in WebP instead of the original format.
+
+    Returns:
+        The object name of the derivative.
+    """
+
+    return f"{fn}_{size}.webp" if webp else f"{fn}_{size}"
+
+
+def create_image_derivative(contents: bytes, size: int, webp: bool) -> bytes:
+    """Resize an image so that its longest side is at most `size` pixels.
+
+    This runs in an image worker process.
+
+    Args:
+        contents: The bytes of the original image.
+        size: The maximum size of the longest side of the derivative.
+        webp: Encode the derivative in WebP instead of the original format.
+
+    Returns:
+        The bytes of the derivative.
+    """
+
+    image = Image.open(BytesIO(contents))
+    save_format = "webp" if webp else image.format
+    image.thumbnail((size, size), Image.Resampling.LANCZOS)
+    if webp and image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA")
+
+    output_buffer = BytesIO()
+    if webp:
+        image.save(output_buffer, format=save_format, quality=WEBP_QUALITY)
+
+    else:
+        image.save(output_buffer, format=save_format)
+
+    return output_buffer.getvalue()
+
+
+async def _put_derivative(
+    bucket: BucketNames, fn: str, contents: bytes, size: int, webp: bool
+) -> None:
+    """Create an image derivative and put it into the object store."""
+
+    name = derivative_name(fn, size, webp)
+    handler = await get_object_store()
+    try:
+        derivative = await run_image_job(create_image_derivative, contents, size, webp)
+        await handler.put(bucket, name, derivative)
+
+    except FileExistsError:
+        logger.debug("Image derivative already exists: %s", name)
+
+
+async def put_image_derivatives(bucket: BucketNames, fn: str, contents: bytes) -> None:
+    """Create every derivative of an uploaded image in the object store.
+
+    Failures are logged and ignored, as missing derivatives are created again
+    the first time they are requested.
+
+    Args:
+        bucket: The bucket of the original image.
+        fn: The object name of the original image.
+        contents: The bytes of the original image.
+    """
+
+    for size in IMAGE_DERIVATIVE_SIZES:
+        for webp in (True, False):
+            try:
+                await _put_derivative(bucket, fn, contents, size, webp)
+
+            except Exception as e:
+                logger.warning(
+                    "Failed to create the %d px derivative of %s: %s", size, fn, e
+                )
+
+
+async def delete_image_derivatives(bucket: BucketNames, fn: str) -> None:
+    """Delete every derivative of an image from the object store.
+
+    Args:
+        bucket: The bucket of the original image.
+        fn: The object name of the original image.
+    """
+
+    handler = await get_object_store()
+    for size in IMAGE_DERIVATIVE_SIZES:
+        for webp in (True, False):
+            try:
+                await handler.delete(bucket, derivative_name(fn, size, webp))
+
+            except FileNotFoundError:
+                pass
+
+
+async def get_image_derivative(
+    bucket: BucketNames, fn: str, size: int, webp: bool
+) -> str | None:
+    """Get the object name of an image derivative, creating it if it is missing.
+
+    Args:
+        bucket: The bucket of the original image.
+        fn: The object name of the original image.
+        size: The size of the longest side of the derivative.
+        webp: Whether to get the WebP derivative.
+
+    Returns:
+        The object name of the derivative, the object name of the original
+        image if it cannot be resized, or None if the image does not exist.
+    """
+
+    name = derivative_name(fn, size, webp)
+    handler = await get_object_store()
+    if await handler.stat(bucket, name) is not None:
+        return name
+
+    original = await handler.get(bucket, fn)
+    if original is None:
+        return None
+
+    logger.debug("Creating missing image derivative: %s", name)
+    try:
+        await _put_derivative(bucket, fn, original.obj, size, webp)
+
+    except Exception as e:
+        logger.warning("Failed to create image derivative %s: %s", name, e)
+        return fn
+
+    return name
+
+
+async def stream_image(
+    bucket: BucketNames,
+    fn: str,
+    range_header: str | None = None,
+    not_found_detail: str = "Image not found.",
+    size: int | None = None,
+    accept: str | None = None,
+    if_none_match: str | None = None,
+) -> Response:
+    """Stream an image, or one of its derivatives, from the object store.
+
+    Image names change whenever their content does, so the responses may be
+    cached forever, and their ETag is the name of the object sent.
+
+    Args:
+        bucket: The bucket of the image.
+        fn: The object name of the image.
+        range_header: The value of the request's Range header, if any.
+        not_found_detail: The error message if the image does not exist.
+        size: The size of the derivative to get, or None for the full image.
+        accept: The value of the request's Accept header, if any.
+        if_none_match: The value of the request's If-None-Match header, if any.
+
+    Returns:
+        The response streaming the image, or 304 if the client already has it.
+
+    Raises:
+        HTTPException: If the size is not supported or the image does not exist.
+    """
+
+    headers = {"Cache-Control": IMMUTABLE_CACHE_CONTROL}
+    if size is None:
+        headers["ETag"] = f'"{fn}"'
+        if etag_matches(if_none_match, headers["ETag"]):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        return await stream_object(
+            bucket, fn, "image/*", range_header, not_found_detail, headers
+        )
+
+    if size not in IMAGE_DERIVATIVE_SIZES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported image size. Allowed: {', '.join(map(str, IMAGE_DERIVATIVE_SIZES))}.",
+        )
+
+    # Serve WebP to the clients that accept it
+    webp = accept is not None and "image/webp" in accept
+    headers["Vary"] = "Accept"
+    headers["ETag"] = f'"{derivative_name(fn, size, webp)}"'
+    if etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    name = await get_image_derivative(bucket, fn, size, webp)
+    if name is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=not_found_detail,
+        )
+
+    headers["ETag"] = f'"{name}"'
+    return await stream_object(
+        bucket,
+        name,
+        "image/webp" if webp and name != fn else "image/*",
+        range_header,
+        not_found_detail,
+        headers,
+    )
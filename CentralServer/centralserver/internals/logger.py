@@ -1,12 +1,155 @@
+import atexit
+import copy
+import json
 import logging
 import os
+import queue
 import sys
+from logging.handlers import QueueHandler, QueueListener
 from time import strftime
+from typing import Any
 
 from concurrent_log_handler import ConcurrentRotatingFileHandler
 
 from centralserver import info
 from centralserver.internals.config_handler import app_config
+from centralserver.internals.request_context import RequestContextFilter
+
+# The attributes of log records that are written as JSON fields when present
+JSON_LOG_FIELDS = (
+    "request_id",
+    "method",
+    "path",
+    "status",
+    "latency_ms",
+    "db_queries",
+    "db_time_ms",
+    "response_bytes",
+)
+
+
+class JSONFormatter(logging.Formatter):
+    """Format log records as one JSON object per line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: dict[str, Any] = {
+            "time": self.formatTime(record, self.datefmt),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        entry.update(
+            (field, getattr(record, field))
+            for field in JSON_LOG_FIELDS
+            if hasattr(record, field)
+        )
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+
+        elif record.exc_text:
+            entry["exception"] = record.exc_text
+
+        return json.dumps(entry, default=str)
+
+
+class LogQueueHandler(QueueHandler):
+    """A queue handler that keeps the exception of the records it queues.
+
+    The default handler merges the traceback into the message and drops the
+    exception, which leaves the JSON formatter nothing to write in the
+    "exception" field.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        # The traceback is formatted now, as it refers to the frames of the
+        # logging thread; the output formatters write out `exc_text`.
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+
+        record.exc_info = None
+        return record
+
+
+# The handler shared by every logger, and the listener thread that drains it
+_queue_handler: LogQueueHandler | None = None
+_queue_listener: QueueListener | None = None
+
+
+def get_output_handlers() -> list[logging.Handler]:
+    """Create the handlers that write log records to their destinations.
+
+    Returns:
+        A stream handler, and a file handler if file logging is enabled.
+    """
+
+    formatter = (
+        JSONFormatter(datefmt=app_config.logging.date_format)
+        if app_config.logging.formatter == "json"
+        else logging.Formatter(
+            fmt=app_config.logging.log_format,
+            datefmt=app_config.logging.date_format,
+        )
+    )
+
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(formatter)
+    handlers: list[logging.Handler] = [stream_handler]
+
+    # Only add file handler if file logging is enabled
+    if app_config.logging.file_logging_enabled:
+        file_handler = ConcurrentRotatingFileHandler(
+            app_config.logging.filepath.format(strftime("%Y-%m-%d_%H-%M-%S")),
+            maxBytes=app_config.logging.max_bytes,
+            backupCount=app_config.logging.backup_count,
+            encoding=app_config.logging.encoding,
+        )
+        file_handler.setFormatter(formatter)
+        handlers.append(file_handler)
+
+    return handlers
+
+
+def get_queue_handler() -> LogQueueHandler:
+    """Get the queue handler shared by every logger, starting its listener.
+
+    Loggers only put their records on a queue, and a single listener thread
+    writes them out with the stream and file handlers. This keeps the file
+    lock and the writes themselves out of the request path.
+
+    Returns:
+        The shared queue handler.
+    """
+
+    global _queue_handler, _queue_listener  # pylint: disable=W0603
+    if _queue_handler is None:
+        log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+        _queue_handler = LogQueueHandler(log_queue)
+        # The request is only known on the thread that logs the record.
+        _queue_handler.addFilter(RequestContextFilter())
+        _queue_listener = QueueListener(
+            log_queue, *get_output_handlers(), respect_handler_level=True
+        )
+        _queue_listener.start()
+        atexit.register(stop_queue_listener)
+
+    return _queue_handler
+
+
+def stop_queue_listener() -> None:
+    """Write out the queued log records and stop the listener thread."""
+
+    global _queue_handler, _queue_listener  # pylint: disable=W0603
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        for handler in _queue_listener.handlers:
+            handler.close()
+
+        _queue_handler = None
+        _queue_listener = None
 
 
 class LoggerFactory:
@@ -46,33 +189,9 @@ class LoggerFactory:
         else:
             raise ValueError("Invalid log level type. Must be int or str.")
 
-        # Add a handler if one does not already exist.
+        # Add the shared queue handler if a handler does not already exist.
         if not logger.handlers:
-            # handlers
-            stream_handler = logging.StreamHandler()
-
-            # formatters
-            formatter = logging.Formatter(
-                fmt=app_config.logging.log_format,
-                datefmt=app_config.logging.date_format,
-            )
-
-            # add formatters to handlers
-            stream_handler.setFormatter(formatter)
-
-            # add handlers to logger
-            logger.addHandler(stream_handler)
-
-            # Only add file handler if file logging is enabled
-            if app_config.logging.file_logging_enabled:
-                file_handler = ConcurrentRotatingFileHandler(
-                    app_config.logging.filepath.format(strftime("%Y-%m-%d_%H-%M-%S")),
-                    maxBytes=app_config.logging.max_bytes,
-                    backupCount=app_config.logging.backup_count,
-                    encoding=app_config.logging.encoding,
-                )
-                file_handler.setFormatter(formatter)
-                logger.addHandler(file_handler)
+            logger.addHandler(get_queue_handler())
 
         return logger
 
@@ -134,6 +253,11 @@ def log_app_info(logger: logging.Logger):
         stats["Log Encoding"] = app_config.logging.encoding
         stats["Log Format"] = app_config.logging.log_format
         stats["Date Format"] = app_config.logging.date_format
+        stats["Log Formatter"] = app_config.logging.formatter
+        stats["Slow Request Threshold"] = (
+            f"{app_config.logging.slow_request_threshold} seconds"
+        )
+        stats["Request Log Level"] = app_config.logging.request_log_level
 
         # Database
         for key, value in app_config.database.export().items():
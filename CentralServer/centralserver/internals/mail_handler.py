@@ -1,22 +1,193 @@
+import asyncio
+import contextlib
 import datetime
+import email
 import hashlib
-import smtplib
+import json
+import time
+import uuid
 from email import encoders
+from email.message import Message
 from email.mime.base import MIMEBase
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
+from html import escape
+from typing import AsyncIterator
 
+import aiosmtplib
 from pydantic import EmailStr
+from sqlalchemy import or_, update
+from sqlmodel import Session, col, select
 
 from centralserver import info
 from centralserver.internals.config_handler import app_config
 from centralserver.internals.exceptions import EmailTemplateNotFoundError
 from centralserver.internals.logger import LoggerFactory
+from centralserver.internals.models.mail import MailOutboxEntry, MailOutboxReport
 from centralserver.internals.templater import templater
 
 logger = LoggerFactory().get_logger(__name__)
 
 
+class SMTPConnectionPool:
+    """A pool of connected and authenticated SMTP connections.
+
+    Connections are kept open between emails, so the cost of connecting,
+    upgrading with STARTTLS, and logging in is only paid once per connection
+    instead of once per email. A semaphore bounds the number of emails sent
+    at the same time, which also bounds the number of open connections.
+    """
+
+    def __init__(
+        self,
+        hostname: str,
+        port: int,
+        username: str | None = None,
+        password: str | None = None,
+        starttls: bool = True,
+        pool_size: int = 2,
+        max_concurrency: int = 4,
+        timeout: float = 30.0,
+    ) -> None:
+        """Create a new SMTP connection pool.
+
+        Args:
+            hostname: The SMTP server to connect to.
+            port: The port of the SMTP server.
+            username: The username for the SMTP server. (Optional)
+            password: The password for the SMTP server. (Optional)
+            starttls: Whether to upgrade connections with STARTTLS.
+            pool_size: The maximum number of idle connections kept for reuse.
+            max_concurrency: The maximum number of emails sent at the same time.
+            timeout: The number of seconds before an SMTP operation is abandoned.
+        """
+
+        self.hostname = hostname
+        self.port = port
+        self.username = username
+        self.password = password
+        self.starttls = starttls
+        self.pool_size = pool_size
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.connections_opened = 0
+        self._idle: list[aiosmtplib.SMTP] = []
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def _connect(self) -> aiosmtplib.SMTP:
+        """Open, upgrade, and authenticate a new connection."""
+
+        client = aiosmtplib.SMTP(
+            hostname=self.hostname,
+            port=self.port,
+            start_tls=self.starttls,
+            timeout=self.timeout,
+        )
+        await client.connect()
+        if self.username:
+            await client.login(self.username, self.password or "")
+
+        self.connections_opened += 1
+        logger.debug("Opened SMTP connection to %s:%s", self.hostname, self.port)
+        return client
+
+    @contextlib.asynccontextmanager
+    async def connection(self) -> AsyncIterator[aiosmtplib.SMTP]:
+        """Borrow a connection, returning it to the pool if it is still usable."""
+
+        async with self._semaphore:
+            client: aiosmtplib.SMTP | None = None
+            while self._idle and client is None:
+                candidate = self._idle.pop()
+                if candidate.is_connected:
+                    client = candidate
+
+            if client is None:
+                client = await self._connect()
+
+            try:
+                yield client
+
+            except Exception:
+                client.close()
+                raise
+
+            if client.is_connected and len(self._idle) < self.pool_size:
+                self._idle.append(client)
+
+            else:
+                client.close()
+
+    async def send(self, message: Message, sender: str, recipients: list[str]) -> None:
+        """Send an email through a pooled connection.
+
+        An idle connection may have been closed by the server since its last
+        use, so a send that fails because of a lost connection is retried
+        once on a new connection.
+
+        Args:
+            message: The email to send.
+            sender: The envelope sender address.
+            recipients: The envelope recipient addresses.
+        """
+
+        for attempt in range(2):
+            try:
+                async with self.connection() as client:
+                    await client.send_message(
+                        message, sender=sender, recipients=recipients
+                    )
+                    return
+
+            except aiosmtplib.SMTPServerDisconnected:
+                if attempt:
+                    raise
+
+                logger.debug("SMTP connection was lost, retrying on a new one")
+
+    async def close(self) -> None:
+        """Close every idle connection."""
+
+        while self._idle:
+            client = self._idle.pop()
+            try:
+                await client.quit()
+
+            except aiosmtplib.SMTPException:
+                client.close()
+
+
+_smtp_pool: SMTPConnectionPool | None = None
+
+
+def get_smtp_pool() -> SMTPConnectionPool:
+    """Get the application's SMTP connection pool, creating it if needed."""
+
+    global _smtp_pool  # pylint: disable=W0603
+    if _smtp_pool is None:
+        _smtp_pool = SMTPConnectionPool(
+            hostname=app_config.mailing.server,
+            port=app_config.mailing.port,
+            username=app_config.mailing.username,
+            password=app_config.mailing.password,
+            starttls=app_config.mailing.starttls,
+            pool_size=app_config.mailing.pool_size,
+            max_concurrency=app_config.mailing.max_concurrency,
+            timeout=app_config.mailing.timeout,
+        )
+
+    return _smtp_pool
+
+
+async def close_smtp_pool() -> None:
+    """Close the connections of the application's SMTP connection pool."""
+
+    global _smtp_pool  # pylint: disable=W0603
+    if _smtp_pool is not None:
+        await _smtp_pool.close()
+        _smtp_pool = None
+
+
 def create_attachment(bytes_data: bytes, filename: str, content_type: str) -> MIMEBase:
     """Create an email attachment from bytes data.
 
@@ -36,16 +207,151 @@ def create_attachment(bytes_data: bytes, filename: str, content_type: str) -> MI
     return attachment
 
 
+def _build_message(
+    to_address: str,
+    subject: str,
+    text: str,
+    html: str | None = None,
+    attachments: list[Message] | None = None,
+) -> MIMEMultipart:
+    """Build an email to the specified recipient.
+
+    Args:
+        to_address: The email address of the recipient.
+        subject: The subject of the email.
+        text: The plain text content of the email.
+        html: The HTML content of the email (optional).
+        attachments: A list of files (optional).
+
+    Returns:
+        The email, ready to be sent.
+    """
+
+    message = MIMEMultipart("alternative")
+    message["Subject"] = subject
+    message["From"] = app_config.mailing.from_address
+    message["To"] = to_address
+    message["Reply-To"] = app_config.mailing.from_address
+    message["Return-Path"] = app_config.mailing.from_address
+    message["Message-ID"] = "<{message_hash}@{domain}>".format(  # pylint: disable=C0209
+        message_hash=hashlib.sha256(
+            f"{to_address}{subject}{text}".encode()
+        ).hexdigest(),
+        domain=app_config.mailing.from_address.split("@")[1],
+    )
+    message["Date"] = datetime.datetime.now().strftime("%a, %d %b %Y %H:%M:%S %z")
+    message["X-Mailer"] = info.Program.name
+
+    plain_content = MIMEText(text, "plain", "utf-8")
+    html_content = MIMEText(html, "html", "utf-8") if html else None
+
+    message.attach(plain_content)
+    if html_content:
+        message.attach(html_content)
+
+    if attachments:
+        for attachment in attachments:
+            message.attach(attachment)
+
+    return message
+
+
+def _entry_attachments(entry: MailOutboxEntry) -> list[Message]:
+    """Get the attachments of a queued email."""
+
+    if not entry.attachments:
+        return []
+
+    return [email.message_from_string(part) for part in json.loads(entry.attachments)]
+
+
+def _build_digest(entries: list[MailOutboxEntry]) -> MIMEMultipart:
+    """Combine the queued emails of one recipient into a single digest email."""
+
+    if len(entries) == 1:
+        entry = entries[0]
+        return _build_message(
+            entry.toAddress,
+            entry.subject,
+            entry.text,
+            entry.html,
+            _entry_attachments(entry),
+        )
+
+    text = "\n\n---\n\n".join(f"{e.subject}\n\n{e.text}" for e in entries)
+    html = "<hr>".join(
+        f"<h3>{escape(e.subject)}</h3>{e.html or f'<p>{escape(e.text)}</p>'}"
+        for e in entries
+    )
+    return _build_message(
+        entries[0].toAddress,
+        f"{info.Program.name} | {len(entries)} new notifications",
+        text,
+        html if any(e.html for e in entries) else None,
+        [attachment for e in entries for attachment in _entry_attachments(e)],
+    )
+
+
+class DomainRateLimiter:
+    """A token bucket rate limiter for each recipient domain.
+
+    Every domain may be sent a burst of up to `per_minute` emails, after
+    which its emails are spread out to at most `per_minute` per minute. The
+    buckets are kept in memory, so the limit applies to each worker process
+    separately.
+    """
+
+    def __init__(self, per_minute: int) -> None:
+        """Create a new rate limiter.
+
+        Args:
+            per_minute: The maximum number of emails sent to a domain per minute.
+        """
+
+        self.per_minute = per_minute
+        self._buckets: dict[str, tuple[float, float]] = {}
+
+    def acquire(self, domain: str) -> bool:
+        """Take a token from a domain's bucket.
+
+        Args:
+            domain: The recipient domain to send an email to.
+
+        Returns:
+            True if the email may be sent now, False if it must wait.
+        """
+
+        now = time.monotonic()
+        tokens, updated = self._buckets.get(domain, (float(self.per_minute), now))
+        tokens = min(self.per_minute, tokens + (now - updated) * self.per_minute / 60)
+        if tokens < 1:
+            self._buckets[domain] = (tokens, now)
+            return False
+
+        self._buckets[domain] = (tokens - 1, now)
+        return True
+
+
+# The running mail outbox sender, if any
+_outbox_task: asyncio.Task[None] | None = None
+_outbox_wakeup: asyncio.Event | None = None
+# Identifies this worker process in its claims on the outbox entries
+_worker_id = uuid.uuid4().hex
+
+
 async def send_mail(
     to_address: str | EmailStr,
     subject: str,
     text: str,
     html: str | None = None,
     attachments: list[MIMEBase] | None = None,
+    digest: bool = False,
 ):
-    """Send an email to the specified recipient.
+    """Queue an email to the specified recipient.
 
-    If mailing is disabled in the configuration, the email content will be logged instead of sent.
+    The email is stored in the mail outbox and sent by the outbox sender, which
+    retries it if sending fails. If mailing is disabled in the configuration,
+    the email content will be logged instead of sent.
 
     Args:
         to_address: The email address of the recipient.
@@ -53,6 +359,8 @@ async def send_mail(
         text: The plain text content of the email.
         html: The HTML content of the email (optional).
         attachments: A list of files (optional).
+        digest: Whether the email may be combined with the recipient's other
+            notification emails into one digest. (Optional)
     """
 
     if not app_config.mailing.enabled:
@@ -62,50 +370,259 @@ async def send_mail(
         logger.info("Text: %s", text)
         return
 
+    # Imported here to avoid a circular import with the database handler.
+    from centralserver.internals.db_handler import get_db_session
+
     try:
-        message = MIMEMultipart("alternative")
-        message["Subject"] = subject
-        message["From"] = app_config.mailing.from_address
-        message["To"] = to_address
-        message["Reply-To"] = app_config.mailing.from_address
-        message["Return-Path"] = app_config.mailing.from_address
-        message["Message-ID"] = (
-            "<{message_hash}@{domain}>".format(  # pylint: disable=C0209
-                message_hash=hashlib.sha256(
-                    f"{to_address}{subject}{text}".encode()
-                ).hexdigest(),
-                domain=app_config.mailing.from_address.split("@")[1],
+        with next(get_db_session()) as session:
+            session.add(
+                MailOutboxEntry(
+                    toAddress=to_address,
+                    domain=to_address.rsplit("@", 1)[-1].lower(),
+                    subject=subject,
+                    text=text,
+                    html=html,
+                    attachments=(
+                        json.dumps([a.as_string() for a in attachments])
+                        if attachments
+                        else None
+                    ),
+                    digest=digest,
+                    nextAttemptAt=datetime.datetime.now(datetime.timezone.utc)
+                    + datetime.timedelta(
+                        seconds=app_config.mailing.digest_window if digest else 0
+                    ),
+                )
             )
+            session.commit()
+
+    except Exception as e:  # pylint: disable=W0718
+        logger.error("An unexpected error occurred while queueing email: %s", e)
+        return
+
+    if _outbox_wakeup is not None:
+        _outbox_wakeup.set()
+
+
+async def process_mail_outbox(
+    session: Session,
+    pool: SMTPConnectionPool,
+    limiter: DomainRateLimiter,
+    max_attempts: int,
+    retry_backoff: float,
+    claim_timeout: float | None = None,
+    worker_id: str | None = None,
+) -> MailOutboxReport:
+    """Send the emails in the mail outbox that are due.
+
+    The due emails are first claimed with a conditional UPDATE, so that when
+    several workers process the outbox, each email is sent by only one of
+    them. A claim expires after `claim_timeout` seconds, in case its worker
+    stops before releasing it.
+
+    Digest emails of a recipient are sent together in one email once the
+    oldest of them is due. Emails to a domain that reached its rate limit are
+    left in the outbox for the next run. Emails that could not be sent are
+    retried later with an exponential backoff, until they run out of attempts.
+
+    Args:
+        session: The database session to use.
+        pool: The SMTP connection pool to send the emails through.
+        limiter: The rate limiter of the recipient domains.
+        max_attempts: The number of attempts to send an email before giving up.
+        retry_backoff: The number of seconds before the first retry.
+        claim_timeout: The number of seconds to claim the emails for.
+            (Default: the configured value)
+        worker_id: The ID to claim the emails with. (Default: this process)
+
+    Returns:
+        The number of emails sent, retried, failed, and deferred.
+    """
+
+    now = datetime.datetime.now(datetime.timezone.utc)
+    worker_id = worker_id or _worker_id
+    pending = (
+        MailOutboxEntry.failed == False,  # pylint: disable=C0121
+        or_(
+            col(MailOutboxEntry.claimedBy).is_(None),
+            col(MailOutboxEntry.lockedUntil) < now,
+        ),
+    )
+    due = session.exec(
+        select(MailOutboxEntry.id, MailOutboxEntry.toAddress, MailOutboxEntry.digest)
+        .where(*pending, MailOutboxEntry.nextAttemptAt <= now)
+        .order_by(col(MailOutboxEntry.id))
+    ).all()
+
+    entry_ids = [entry_id for entry_id, _, digest in due if not digest]
+    digest_addresses = {address for _, address, digest in due if digest}
+    if digest_addresses:
+        # The recipients' digest emails that are not yet due are sent along.
+        entry_ids.extend(
+            session.exec(
+                select(MailOutboxEntry.id).where(
+                    *pending,
+                    MailOutboxEntry.digest == True,  # pylint: disable=C0121
+                    col(MailOutboxEntry.toAddress).in_(digest_addresses),
+                )
+            ).all()
+        )
+
+    # Only the entries that no other worker claimed in the meantime are
+    # updated, so each entry ends up claimed by a single worker.
+    session.execute(
+        update(MailOutboxEntry)
+        .where(col(MailOutboxEntry.id).in_(entry_ids), *pending)
+        .values(
+            claimedBy=worker_id,
+            lockedUntil=now
+            + datetime.timedelta(
+                seconds=claim_timeout or app_config.mailing.claim_timeout
+            ),
         )
-        message["Date"] = datetime.datetime.now().strftime("%a, %d %b %Y %H:%M:%S %z")
-        message["X-Mailer"] = info.Program.name
-
-        plain_content = MIMEText(text, "plain", "utf-8")
-        html_content = MIMEText(html, "html", "utf-8") if html else None
-
-        message.attach(plain_content)
-        if html_content:
-            message.attach(html_content)
-
-        if attachments:
-            for attachment in attachments:
-                message.attach(attachment)
-
-        # Send the email
-        with smtplib.SMTP(app_config.mailing.server, app_config.mailing.port) as server:
-            server.starttls()  # Upgrade the connection to a secure encrypted SSL/TLS connection
-            server.login(app_config.mailing.username, app_config.mailing.password)
-            server.sendmail(
-                from_addr=app_config.mailing.from_address,
-                to_addrs=[to_address],
-                msg=message.as_string(),
+    )
+    session.commit()
+    claimed = session.exec(
+        select(MailOutboxEntry)
+        .where(
+            col(MailOutboxEntry.id).in_(entry_ids),
+            MailOutboxEntry.claimedBy == worker_id,
+        )
+        .order_by(col(MailOutboxEntry.id))
+    ).all()
+
+    groups: list[list[MailOutboxEntry]] = []
+    digests: dict[str, list[MailOutboxEntry]] = {}
+    for entry in claimed:
+        if entry.digest:
+            digests.setdefault(entry.toAddress, []).append(entry)
+
+        else:
+            groups.append([entry])
+
+    groups.extend(digests.values())
+
+    report = MailOutboxReport()
+    sendable: list[list[MailOutboxEntry]] = []
+    for group in groups:
+        if limiter.acquire(group[0].domain):
+            sendable.append(group)
+            continue
+
+        report.deferred += len(group)
+        for entry in group:
+            entry.claimedBy = None
+            entry.lockedUntil = None
+            session.add(entry)
+
+    results = await asyncio.gather(
+        *(
+            pool.send(
+                _build_digest(group),
+                sender=app_config.mailing.from_address,
+                recipients=[group[0].toAddress],
             )
+            for group in sendable
+        ),
+        return_exceptions=True,
+    )
 
-    except smtplib.SMTPException as e:
-        logger.error("Failed to send email: %s", e)
+    for group, result in zip(sendable, results):
+        for entry in group:
+            if not isinstance(result, BaseException):
+                session.delete(entry)
+                report.sent += 1
+                continue
 
-    except Exception as e:  # pylint: disable=W0718
-        logger.error("An unexpected error occurred while sending email: %s", e)
+            entry.attempts += 1
+            entry.lastError = str(result) or type(result).__name__
+            entry.claimedBy = None
+            entry.lockedUntil = None
+            if entry.attempts >= max_attempts:
+                entry.failed = True
+                report.failed += 1
+                logger.error(
+                    "Giving up on email %s to %s: %s",
+                    entry.id,
+                    entry.toAddress,
+                    entry.lastError,
+                )
+
+            else:
+                entry.nextAttemptAt = now + datetime.timedelta(
+                    seconds=retry_backoff * 2 ** (entry.attempts - 1)
+                )
+                report.retried += 1
+                logger.warning(
+                    "Failed to send email %s to %s, retrying later: %s",
+                    entry.id,
+                    entry.toAddress,
+                    entry.lastError,
+                )
+
+            session.add(entry)
+
+    session.commit()
+    return report
+
+
+async def run_mail_outbox() -> None:
+    """Send the emails in the mail outbox as they become due."""
+
+    # Imported here to avoid a circular import with the database handler.
+    from centralserver.internals.db_handler import get_db_session
+
+    config = app_config.mailing
+    limiter = DomainRateLimiter(config.domain_rate_limit)
+    while True:
+        try:
+            with next(get_db_session()) as session:
+                await process_mail_outbox(
+                    session,
+                    get_smtp_pool(),
+                    limiter,
+                    config.max_attempts,
+                    config.retry_backoff,
+                )
+
+        except Exception as e:  # pylint: disable=W0718
+            logger.error("Failed to process the mail outbox: %s", e)
+
+        # Sleep until the next poll, or until a new email is queued.
+        if _outbox_wakeup is not None:
+            try:
+                async with asyncio.timeout(config.outbox_poll_interval):
+                    await _outbox_wakeup.wait()
+
+            except TimeoutError:
+                pass
+
+            _outbox_wakeup.clear()
+
+
+def start_mail_outbox() -> None:
+    """Start the mail outbox sender if mailing is enabled."""
+
+    global _outbox_task, _outbox_wakeup  # pylint: disable=W0603
+    if _outbox_task is None and app_config.mailing.enabled:
+        _outbox_wakeup = asyncio.Event()
+        _outbox_task = asyncio.create_task(run_mail_outbox())
+
+
+async def stop_mail_outbox() -> None:
+    """Stop the mail outbox sender."""
+
+    global _outbox_task, _outbox_wakeup  # pylint: disable=W0603
+    if _outbox_task is not None:
+        _outbox_task.cancel()
+        try:
+            await _outbox_task
+
+        except asyncio.CancelledError:
+            pass
+
+        _outbox_task = None
+        _outbox_wakeup = None
 
 
 def get_template(template_name: str, **kwargs: ...) -> str:
@@ -1,5 +1,7 @@
 from centralserver.internals.models import (
     ai,
+    change_log,
+    mail,
     object_store,
     reports,
     role,
@@ -10,6 +12,8 @@ from centralserver.internals.models import (
 
 __all__ = [
     "ai",
+    "change_log",
+    "mail",
     "object_store",
     "reports",
     "role",
@@ -0,0 +1,82 @@
+import datetime
+from enum import StrEnum
+
+from sqlmodel import Field, SQLModel
+
+
+class ChangeEntity(StrEnum):
+    """The kind of record that was mutated."""
+
+    REPORT = "report"
+    ENTRY = "entry"
+    STATUS = "status"
+    NOTIFICATION = "notification"
+    USER = "user"
+
+
+class ChangeAction(StrEnum):
+    """The kind of mutation that was recorded."""
+
+    CREATED = "created"
+    UPDATED = "updated"
+    DELETED = "deleted"
+
+
+class ChangeLogEntry(SQLModel, table=True):
+    """A single mutation recorded in the change log.
+
+    The auto-incrementing ID doubles as the sync cursor of the change feed.
+    """
+
+    __tablename__: str = "changeLog"  # type: ignore
+
+    id: int | None = Field(
+        default=None,
+        primary_key=True,
+        index=True,
+        description="The monotonic cursor of the change.",
+    )
+    created: datetime.datetime = Field(
+        default_factory=lambda: datetime.datetime.now(datetime.timezone.utc),
+        description="The timestamp for when the change was recorded.",
+    )
+    entity: ChangeEntity = Field(description="The kind of record that was mutated.")
+    action: ChangeAction = Field(description="The kind of mutation.")
+    resource: str = Field(description="The table name of the mutated record.")
+    key: str = Field(description="The JSON-encoded primary key of the record.")
+    schoolId: int | None = Field(
+        default=None,
+        index=True,
+        description="The school the record belongs to, if any.",
+    )
+    ownerId: str | None = Field(
+        default=None,
+        index=True,
+        description="The user the record belongs to, if any.",
+    )
+    reportMonth: datetime.date | None = Field(
+        default=None,
+        description="The month of the report the record belongs to, if any.",
+    )
+    changedFields: str | None = Field(
+        default=None,
+        description="JSON-encoded list of the attributes changed by an update.",
+    )
+
+
+class ChangeFeedPage(SQLModel):
+    """A page of changes returned by the change feed."""
+
+    cursor: int
+    more: bool
+    changes: list[ChangeLogEntry]
+    resync: bool = Field(
+        default=False,
+        description="The cursor is older than the retained changes, so the client must fetch a full snapshot.",
+    )
+
+
+class ChangeRetentionReport(SQLModel):
+    """The result of a run of the change log retention job."""
+
+    deleted: int = 0
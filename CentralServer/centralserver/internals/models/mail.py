@@ -0,0 +1,82 @@
+import datetime
+
+from sqlmodel import Field, SQLModel
+
+
+class MailOutboxEntry(SQLModel, table=True):
+    """An email waiting in the outbox to be sent.
+
+    The entry is deleted once the email is sent, and kept with `failed` set
+    once it runs out of attempts. While a worker sends the email, the entry is
+    claimed by the worker until `lockedUntil`.
+    """
+
+    __tablename__: str = "mailOutbox"  # type: ignore
+
+    id: int | None = Field(
+        default=None,
+        primary_key=True,
+        index=True,
+        description="The unique identifier of the email.",
+    )
+    created: datetime.datetime = Field(
+        default_factory=lambda: datetime.datetime.now(datetime.timezone.utc),
+        description="The timestamp for when the email was queued.",
+    )
+    toAddress: str = Field(
+        index=True,
+        description="The email address of the recipient.",
+    )
+    domain: str = Field(
+        index=True,
+        description="The domain of the recipient's email address.",
+    )
+    subject: str = Field(description="The subject of the email.")
+    text: str = Field(description="The plain text content of the email.")
+    html: str | None = Field(
+        default=None,
+        description="The HTML content of the email.",
+    )
+    attachments: str | None = Field(
+        default=None,
+        description="JSON-encoded list of the serialized attachment MIME parts.",
+    )
+    digest: bool = Field(
+        default=False,
+        description="Whether the email may be combined with others into a digest.",
+    )
+    attempts: int = Field(
+        default=0,
+        description="The number of failed attempts to send the email.",
+    )
+    nextAttemptAt: datetime.datetime = Field(
+        default_factory=lambda: datetime.datetime.now(datetime.timezone.utc),
+        index=True,
+        description="The timestamp for when the email is next due to be sent.",
+    )
+    lastError: str | None = Field(
+        default=None,
+        description="The error of the last failed attempt.",
+    )
+    failed: bool = Field(
+        default=False,
+        index=True,
+        description="Whether the email was given up on after too many attempts.",
+    )
+    claimedBy: str | None = Field(
+        default=None,
+        description="The ID of the worker sending the email.",
+    )
+    lockedUntil: datetime.datetime | None = Field(
+        default=None,
+        description="The timestamp for when the worker's claim on the email expires.",
+    )
+
+
+class MailOutboxReport(SQLModel):
+    """A model representing the result of processing the mail outbox."""
+
+    sent: int = 0
+    retried: int = 0
+    failed: int = 0
+    deferred: int = 0
@@ -29,6 +29,14 @@ class NotificationArchiveRequest(SQLModel):
     notification_id: str
 
 
+class NotificationRetentionReport(SQLModel):
+    """A model representing the result of a notification retention run."""
+
+    archived: int = 0
+    deleted: int = 0
+    announcements_deleted: int = 0
+
+
 class Notification(SQLModel, table=True):
     """A model representing a notification in the system."""
 
@@ -68,7 +76,108 @@ class Notification(SQLModel, table=True):
         default=False,
         description="Indicates whether the notification has been archived.",
     )
+    archivedAt: datetime | None = Field(
+        default=None,
+        index=True,
+        description="The timestamp for when the notification was archived.",
+    )
 
     owner: "User" = Relationship(
         back_populates="notifications",
     )
+
+
+class Announcement(SQLModel, table=True):
+    """A model representing an announcement sent to many users.
+
+    The announcement is stored once, and each recipient gets an
+    `AnnouncementReceipt` holding their own state of it.
+    """
+
+    __tablename__ = "announcements"  # type: ignore
+
+    id: str = Field(
+        default_factory=lambda: str(uuid.uuid4()),
+        primary_key=True,
+        index=True,
+        description="The unique identifier for the announcement.",
+    )
+    created: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        index=True,
+        description="The timestamp for when the announcement was created.",
+    )
+    authorId: str | None = Field(
+        default=None,
+        foreign_key="users.id",
+        description="The ID of the user who created the announcement.",
+    )
+    title: str = Field(
+        description="The title of the announcement.",
+    )
+    content: str = Field(
+        description="The content of the announcement.",
+    )
+    important: bool = Field(
+        default=False,
+        description="Indicates whether the announcement is important.",
+    )
+    type: NotificationType = Field(
+        default="info",
+        description="The type of the announcement. (To be used by the frontend for styling purposes.)",
+    )
+
+
+class AnnouncementReceipt(SQLModel, table=True):
+    """A model representing a user's copy of an announcement."""
+
+    __tablename__ = "announcementReceipts"  # type: ignore
+
+    ownerId: str = Field(
+        foreign_key="users.id",
+        primary_key=True,
+        description="The ID of the user who received the announcement.",
+    )
+    announcementId: str = Field(
+        foreign_key="announcements.id",
+        primary_key=True,
+        index=True,
+        description="The ID of the received announcement.",
+    )
+    archived: bool = Field(
+        default=False,
+        description="Indicates whether the user has archived the announcement.",
+    )
+    archivedAt: datetime | None = Field(
+        default=None,
+        index=True,
+        description="The timestamp for when the user archived the announcement.",
+    )
+
+
+class NotificationCounter(SQLModel, table=True):
+    """A model representing the maintained notification counts of a user.
+
+    The counts cover both the user's own notifications and the announcements
+    they received, and are updated in the same transaction as them.
+    """
+
+    __tablename__ = "notificationCounters"  # type: ignore
+
+    ownerId: str = Field(
+        foreign_key="users.id",
+        primary_key=True,
+        description="The ID of the user who owns the notifications.",
+    )
+    unread: int = Field(
+        default=0,
+        description="The number of unarchived notifications.",
+    )
+    important: int = Field(
+        default=0,
+        description="The number of unarchived important notifications.",
+    )
+    archived: int = Field(
+        default=0,
+        description="The number of archived notifications.",
+    )
@@ -7,3 +7,17 @@ class BucketObject(SQLModel):
     bucket: str
     fn: str
     obj: bytes
+
+
+class ObjectCacheStats(SQLModel):
+    """The statistics of the in-memory object cache of a worker process."""
+
+    enabled: bool
+    hits: int
+    misses: int
+    hit_rate: float
+    evictions: int
+    invalidations: int
+    entries: int
+    size: int
+    capacity: int
@@ -1,17 +1,55 @@
 import datetime
+import uuid
 
 from pydantic import BaseModel
 from sqlmodel import Field, SQLModel
 
 
+class AttachmentBlob(SQLModel, table=True):
+    """A model representing a file in object storage shared by attachments.
+
+    Identical uploads are stored once, under their SHA-256 digest, and the
+    file is deleted when the last attachment referring to it is deleted.
+    """
+
+    __tablename__: str = "attachmentBlobs"  # type: ignore
+
+    sha256: str = Field(
+        primary_key=True,
+        description="SHA-256 digest of the file, and its name in object storage",
+    )
+    file_size: int = Field(description="Size of the file in bytes")
+    reference_count: int = Field(
+        default=1, description="Number of attachments sharing the stored file"
+    )
+
+
 class ReportAttachment(SQLModel, table=True):
-    """A model representing an attachment for report entries."""
+    """A model representing an attachment for report entries.
+
+    Every upload has its own attachment, while its content is stored in an
+    `AttachmentBlob` that may be shared with other attachments. Attachments
+    uploaded before files were shared have no blob, and their file is stored
+    under their URN instead.
+    """
 
     __tablename__: str = "reportAttachments"  # type: ignore
 
     id: int | None = Field(default=None, primary_key=True, index=True)
     filename: str = Field(description="Original filename of the attachment")
-    file_urn: str = Field(description="URN of the file in object storage")
+    file_urn: str = Field(
+        default_factory=lambda: uuid.uuid4().hex,
+        unique=True,
+        index=True,
+        description="URN of the attachment",
+    )
+    sha256: str | None = Field(
+        default=None,
+        foreign_key="attachmentBlobs.sha256",
+        index=True,
+        description="SHA-256 digest of the stored file, or None if the file is "
+        "stored under the attachment's URN",
+    )
     file_type: str = Field(description="MIME type of the file")
     file_size: int = Field(description="Size of the file in bytes")
     upload_date: datetime.datetime = Field(
@@ -30,6 +68,7 @@ class AttachmentUploadResponse(BaseModel):
     filename: str
     file_size: int
     file_type: str
+    sha256: str | None = None
 
 
 class AttachmentMetadataResponse(BaseModel):
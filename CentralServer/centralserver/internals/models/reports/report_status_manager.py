@@ -17,6 +17,7 @@ from centralserver.internals.models.reports.status_change_request import (
 )
 from centralserver.internals.models.user import User
 from centralserver.internals.notification_handler import push_notification
+from centralserver.internals.websocket_manager import publish_report_event
 
 logger = LoggerFactory().get_logger(__name__)
 
@@ -122,6 +123,19 @@ class ReportStatusManager:
         session.commit()
         session.refresh(report)
 
+        await publish_report_event(
+            "status_changed",
+            school_id,
+            year,
+            month,
+            {
+                "report_type": report_type,
+                "category": category,
+                "old_status": old_status.value,
+                "new_status": status_change.new_status.value,
+            },
+        )
+
         # Send notifications based on status change
         await ReportStatusManager._notify_report_status_change(
             session=session,
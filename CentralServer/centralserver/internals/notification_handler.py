@@ -1,12 +1,231 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from sqlalchemy import (
+    ColumnElement,
+    delete,
+    exists,
+    func,
+    insert,
+    literal,
+    tuple_,
+    union_all,
+    update,
+)
+from sqlalchemy.engine import Row
+from sqlalchemy.exc import IntegrityError
 from sqlmodel import Session, select
 
+from centralserver.internals.change_handler import record_notification_changes
+from centralserver.internals.config_handler import app_config
 from centralserver.internals.exceptions import NotificationNotFoundError
 from centralserver.internals.logger import LoggerFactory
-from centralserver.internals.models.notification import Notification, NotificationType
+from centralserver.internals.models.change_log import ChangeAction
+from centralserver.internals.models.notification import (
+    Announcement,
+    AnnouncementReceipt,
+    Notification,
+    NotificationCounter,
+    NotificationRetentionReport,
+    NotificationType,
+)
+from centralserver.internals.models.user import User
 from centralserver.internals.websocket_manager import websocket_manager
 
 logger = LoggerFactory().get_logger(__name__)
 
+# The running notification retention job, if any
+_retention_task: asyncio.Task[None] | None = None
+
+
+def _announcement_as_notification(
+    announcement: Announcement, receipt: AnnouncementReceipt
+) -> Notification:
+    """Get a user's copy of an announcement as a notification."""
+
+    return Notification(
+        id=announcement.id,
+        created=announcement.created,
+        ownerId=receipt.ownerId,
+        title=announcement.title,
+        content=announcement.content,
+        important=announcement.important,
+        type=announcement.type,
+        archived=receipt.archived,
+        archivedAt=receipt.archivedAt,
+    )
+
+
+def _counted(owner_id: Any) -> dict[str, Any]:
+    """Get the expressions counting the notifications of a correlated user.
+
+    Args:
+        owner_id: The column holding the ID of the user to count for.
+
+    Returns:
+        The expression computing each counter.
+    """
+
+    def own(*conditions: ColumnElement[bool]):  # type: ignore
+        return (
+            select(func.count())  # pylint: disable=not-callable
+            .select_from(Notification)
+            .where(Notification.ownerId == owner_id, *conditions)
+            .scalar_subquery()
+        )
+
+    def received(*conditions: ColumnElement[bool]):  # type: ignore
+        return (
+            select(func.count())  # pylint: disable=not-callable
+            .select_from(AnnouncementReceipt)
+            .join(
+                Announcement,
+                AnnouncementReceipt.announcementId == Announcement.id,  # type: ignore
+            )
+            .where(AnnouncementReceipt.ownerId == owner_id, *conditions)
+            .scalar_subquery()
+        )
+
+    # pylint: disable=C0121
+    return {
+        "unread": own(Notification.archived == False)
+        + received(AnnouncementReceipt.archived == False),
+        "important": own(Notification.archived == False, Notification.important)
+        + received(AnnouncementReceipt.archived == False, Announcement.important),
+        "archived": own(Notification.archived == True)
+        + received(AnnouncementReceipt.archived == True),
+    }
+
+
+def _insert_missing_counters(owners: ColumnElement[bool]) -> Any:
+    """Get the statement inserting the missing counters of the matching users."""
+
+    counted = _counted(User.id)
+    return insert(NotificationCounter).from_select(
+        ["ownerId", *counted],
+        select(User.id, *counted.values()).where(
+            owners,
+            ~exists().where(NotificationCounter.ownerId == User.id),
+        ),
+    )
+
+
+def _ensure_counters(session: Session, owners: ColumnElement[bool]) -> None:
+    """Create the missing notification counters of the matching users.
+
+    Missing counters are initialized by counting the users' existing
+    notifications and received announcements. This must run before any
+    pending change to them is flushed, or that change would be counted twice.
+    A counter created by a concurrent transaction in the meantime is kept.
+
+    Args:
+        session: The SQLAlchemy session to use for the operation.
+        owners: The condition on the users table that selects the users.
+    """
+
+    try:
+        # Only the insert is rolled back if another transaction wins the race.
+        with session.begin_nested():
+            session.execute(_insert_missing_counters(owners))
+
+    except IntegrityError:
+        logger.debug("Notification counters were created concurrently")
+        session.execute(_insert_missing_counters(owners))
+
+
+def _recount_counters(session: Session, owner_ids: list[str]) -> None:
+    """Count the notifications of the users again, creating missing counters.
+
+    Args:
+        session: The SQLAlchemy session to use for the operation.
+        owner_ids: The IDs of the users whose counters to recount.
+    """
+
+    _ensure_counters(session, User.id.in_(owner_ids))  # type: ignore
+    session.execute(
+        update(NotificationCounter)
+        .where(NotificationCounter.ownerId.in_(owner_ids))  # type: ignore
+        .values(_counted(NotificationCounter.ownerId))
+    )
+
+
+def _update_counters(
+    session: Session, owners: ColumnElement[bool], delta: dict[str, int]
+) -> None:
+    """Apply a change to the notification counters of the matching users.
+
+    Args:
+        session: The SQLAlchemy session to use for the operation.
+        owners: The condition on the counters table that selects the users.
+        delta: The change to each counter.
+    """
+
+    session.execute(
+        update(NotificationCounter)
+        .where(owners)
+        .values(
+            {
+                getattr(NotificationCounter, counter): getattr(
+                    NotificationCounter, counter
+                )
+                + change
+                for counter, change in delta.items()
+            }
+        )
+    )
+
+
+def _archive_delta(important: bool, unarchive: bool) -> dict[str, int]:
+    """Get the change to the counters when a notification is (un)archived."""
+
+    sign = 1 if unarchive else -1
+    return {
+        "unread": sign,
+        "important": sign if important else 0,
+        "archived": -sign,
+    }
+
+
+async def _send_counter_delta(owner_ids: list[str], delta: dict[str, int]) -> None:
+    """Send a change of the notification counters to the users' connections.
+
+    Args:
+        owner_ids: The IDs of the users whose counters changed.
+        delta: The change to each counter.
+    """
+
+    try:
+        await websocket_manager.broadcast_to_users(
+            owner_ids, {"type": "notification_counters", "data": delta}
+        )
+
+    except Exception as e:
+        # Clients can always fetch the counters again
+        logger.warning("Failed to send notification counters via WebSocket: %s", e)
+
+
+async def get_notification_counters(
+    user_id: str, session: Session
+) -> NotificationCounter:
+    """Get the notification counters of a user.
+
+    Args:
+        user_id: The ID of the user.
+        session: The SQLAlchemy session to use for the query.
+
+    Returns:
+        The user's notification counters.
+    """
+
+    counters = session.get(NotificationCounter, user_id)
+    if counters is None:
+        _ensure_counters(session, User.id == user_id)  # type: ignore
+        session.commit()
+        counters = session.get(NotificationCounter, user_id)
+
+    return counters or NotificationCounter(ownerId=user_id)
+
 
 async def get_user_notifications(
     user_id: str,
@@ -18,6 +237,9 @@ async def get_user_notifications(
 ) -> list[Notification]:
     """Retrieve all notifications for a specific user.
 
+    The user's own notifications and their received announcements are
+    fetched with a single UNION ALL query, newest first.
+
     Args:
         user_id: The ID of the user whose notifications are to be retrieved.
         session: The SQLAlchemy session to use for the query.
@@ -33,67 +255,89 @@ async def get_user_notifications(
         unarchived_only,
         important_only,
     )
-    if important_only:
-        if unarchived_only:
-            return list(
-                session.exec(
-                    select(Notification)
-                    .where(Notification.ownerId == user_id)
-                    .where(Notification.archived == False)  # pylint: disable=C0121
-                    .where(Notification.important)
-                    .offset(offset)
-                    .limit(limit)
-                ).all()
-            )
-
-        return list(
-            session.exec(
-                select(Notification)
-                .where(Notification.ownerId == user_id)
-                .where(Notification.important)
-                .offset(offset)
-                .limit(limit)
-            ).all()
+    own = select(
+        Notification.id,
+        Notification.created,
+        Notification.ownerId,
+        Notification.title,
+        Notification.content,
+        Notification.important,
+        Notification.type,
+        Notification.archived,
+        Notification.archivedAt,
+    ).where(Notification.ownerId == user_id)
+    received = (
+        select(
+            Announcement.id,
+            Announcement.created,
+            AnnouncementReceipt.ownerId,
+            Announcement.title,
+            Announcement.content,
+            Announcement.important,
+            Announcement.type,
+            AnnouncementReceipt.archived,
+            AnnouncementReceipt.archivedAt,
+        )
+        .join(
+            AnnouncementReceipt,
+            AnnouncementReceipt.announcementId == Announcement.id,  # type: ignore
         )
+        .where(AnnouncementReceipt.ownerId == user_id)
+    )
 
     if unarchived_only:
-        return list(
-            session.exec(
-                select(Notification)
-                .where(Notification.ownerId == user_id)
-                .where(Notification.archived == False)  # pylint: disable=C0121
-                .offset(offset)
-                .limit(limit)
-            ).all()
+        own = own.where(Notification.archived == False)  # pylint: disable=C0121
+        received = received.where(
+            AnnouncementReceipt.archived == False  # pylint: disable=C0121
         )
-    return list(
-        session.exec(
-            select(Notification)
-            .where(Notification.ownerId == user_id)
+
+    if important_only:
+        own = own.where(Notification.important)
+        received = received.where(Announcement.important)
+
+    notifications = union_all(own, received).subquery()
+    return [
+        Notification(**row._mapping)
+        for row in session.execute(
+            select(notifications)
+            .order_by(notifications.c.created.desc())
             .offset(offset)
             .limit(limit)
-        ).all()
-    )
+        )
+    ]
 
 
-async def get_notification(notification_id: str, session: Session) -> Notification:
+async def get_notification(
+    notification_id: str, session: Session, owner_id: str | None = None
+) -> Notification:
     """Retrieve a specific notification by its ID.
 
+    Announcements share one ID between all of their recipients, so they are
+    only found when the ID of the recipient is given.
+
     Args:
         notification_id: The ID of the notification to retrieve.
         session: The SQLAlchemy session to use for the query.
+        owner_id: The ID of the user whose copy of an announcement to retrieve.
 
     Returns:
         The notification object if found, otherwise None.
     """
 
     notification = session.get(Notification, notification_id)
-    if notification is None:
-        raise NotificationNotFoundError(
-            f"Notification with ID {notification_id} not found."
-        )
+    if notification is not None:
+        return notification
 
-    return notification
+    if owner_id is not None:
+        receipt = session.get(AnnouncementReceipt, (owner_id, notification_id))
+        if receipt is not None:
+            announcement = session.get(Announcement, notification_id)
+            if announcement is not None:
+                return _announcement_as_notification(announcement, receipt)
+
+    raise NotificationNotFoundError(
+        f"Notification with ID {notification_id} not found."
+    )
 
 
 async def push_notification(
@@ -125,7 +369,10 @@ async def push_notification(
         important=important,
         type=notification_type,
     )
+    delta = {"unread": 1, "important": 1 if important else 0, "archived": 0}
+    _ensure_counters(session, User.id == owner_id)  # type: ignore
     session.add(notification)
+    _update_counters(session, NotificationCounter.ownerId == owner_id, delta)  # type: ignore
     session.commit()
     session.refresh(notification)
 
@@ -148,28 +395,447 @@ async def push_notification(
             "Failed to send WebSocket notification for user %s: %s", owner_id, e
         )
 
+    await _send_counter_delta([str(owner_id)], delta)
     return notification
 
 
+async def push_announcement(
+    recipients: ColumnElement[bool],
+    title: str,
+    content: str,
+    session: Session,
+    important: bool = False,
+    notification_type: NotificationType = NotificationType.INFO,
+    author_id: str | None = None,
+) -> int:
+    """Store an announcement once and deliver it to every matching user.
+
+    The announcement is stored in a single row, and the recipients' receipts
+    and their change log entries are inserted with one INSERT ... SELECT
+    each. Everything is committed once, then sent to the recipients with a
+    single WebSocket broadcast.
+
+    Args:
+        recipients: The condition on the users table that selects the recipients.
+        title: The title of the announcement.
+        content: The content of the announcement.
+        session: The SQLAlchemy session to use for the operation.
+        important: Whether the announcement is important (default is False).
+        notification_type: The type of the announcement.
+        author_id: The ID of the user who created the announcement.
+
+    Returns:
+        The number of users the announcement was sent to.
+    """
+
+    announcement = Announcement(
+        authorId=author_id,
+        title=title,
+        content=content,
+        important=important,
+        type=notification_type,
+    )
+    session.add(announcement)
+    session.flush()
+    _ensure_counters(session, recipients)
+    session.execute(
+        insert(AnnouncementReceipt).from_select(
+            ["ownerId", "announcementId"],
+            select(User.id, literal(announcement.id)).where(recipients),
+        )
+    )
+    record_notification_changes(
+        session,
+        ChangeAction.CREATED,
+        AnnouncementReceipt,
+        AnnouncementReceipt.announcementId == announcement.id,  # type: ignore
+    )
+    # The receipts are read back instead of using RETURNING, which MySQL does
+    # not support.
+    owner_ids = list(
+        session.exec(
+            select(AnnouncementReceipt.ownerId).where(
+                AnnouncementReceipt.announcementId == announcement.id
+            )
+        ).all()
+    )
+    delta = {"unread": 1, "important": 1 if important else 0, "archived": 0}
+    _update_counters(
+        session,
+        NotificationCounter.ownerId.in_(  # type: ignore
+            select(AnnouncementReceipt.ownerId).where(
+                AnnouncementReceipt.announcementId == announcement.id
+            )
+        ),
+        delta,
+    )
+    session.commit()
+    session.refresh(announcement)
+    logger.debug("Announcement %s stored for %d users", announcement.id, len(owner_ids))
+
+    try:
+        await websocket_manager.broadcast_to_users(
+            owner_ids,
+            {
+                "type": "new_notification",
+                "data": {
+                    "notification": announcement.model_dump(exclude={"authorId"})
+                    | {"archived": False},
+                },
+            },
+        )
+
+    except Exception as e:
+        # Don't fail the announcement if WebSocket fails
+        logger.warning(
+            "Failed to send WebSocket notification for announcement %s: %s",
+            announcement.id,
+            e,
+        )
+
+    await _send_counter_delta(owner_ids, delta)
+    return len(owner_ids)
+
+
 async def archive_notification(
     notification_id: str,
     session: Session,
     unarchive: bool = False,
+    owner_id: str | None = None,
 ) -> Notification:
     """Set a notification as archived (or unarchived).
 
+    The owner's notification counters are updated in the same transaction
+    when the archived state changes.
+
     Args:
         notification_id: The ID of the notification to delete.
         session: The SQLAlchemy session to use for the operation.
         unarchive: If True, the notification will be unarchived instead of archived.
+        owner_id: The ID of the user whose copy of an announcement to archive.
 
     Returns:
         The deleted notification object if found, otherwise None.
     """
 
+    if owner_id is not None and session.get(Notification, notification_id) is None:
+        receipt = session.get(AnnouncementReceipt, (owner_id, notification_id))
+        announcement = session.get(Announcement, notification_id)
+        if receipt is not None and announcement is not None:
+            if receipt.archived == unarchive:
+                delta = _archive_delta(announcement.important, unarchive)
+                _ensure_counters(session, User.id == owner_id)  # type: ignore
+                receipt.archived = False if unarchive else True
+                receipt.archivedAt = None if unarchive else datetime.now(timezone.utc)
+                session.add(receipt)
+                _update_counters(session, NotificationCounter.ownerId == owner_id, delta)  # type: ignore
+                session.commit()
+                await _send_counter_delta([owner_id], delta)
+
+            return await get_notification(notification_id, session, owner_id)
+
     notification = await get_notification(notification_id, session)
+    if notification.archived != unarchive:
+        return notification
+
+    delta = _archive_delta(notification.important, unarchive)
+    _ensure_counters(session, User.id == notification.ownerId)  # type: ignore
     notification.archived = False if unarchive else True
+    notification.archivedAt = None if unarchive else datetime.now(timezone.utc)
     session.add(notification)
+    _update_counters(
+        session, NotificationCounter.ownerId == notification.ownerId, delta  # type: ignore
+    )
     session.commit()
     session.refresh(notification)
+    await _send_counter_delta([notification.ownerId], delta)
     return notification
+
+
+def _deletion_delta(_important: bool) -> dict[str, int]:
+    """Get the change to the counters when an archived notification is deleted."""
+
+    return {"unread": 0, "important": 0, "archived": -1}
+
+
+def _old_notifications(
+    session: Session, cutoff: datetime, archived: bool, limit: int
+) -> list[Row[tuple[str, str, bool]]]:
+    """Get the ID, owner, and importance of notifications older than the cutoff.
+
+    Unarchived notifications are aged from their creation, and archived ones
+    from their archival. Notifications archived before the archival time was
+    recorded are aged from their creation.
+    """
+
+    age = (
+        func.coalesce(Notification.archivedAt, Notification.created)
+        if archived
+        else Notification.created
+    )
+    return list(
+        session.execute(
+            select(Notification.id, Notification.ownerId, Notification.important)
+            .where(Notification.archived == archived, age < cutoff)
+            .limit(limit)
+        ).all()
+    )
+
+
+def _old_receipts(
+    session: Session, cutoff: datetime, archived: bool, limit: int
+) -> list[Row[tuple[str, str, bool]]]:
+    """Get the announcement, owner, and importance of receipts older than the cutoff.
+
+    The receipts are aged like notifications, see `_old_notifications`.
+    """
+
+    age = (
+        func.coalesce(AnnouncementReceipt.archivedAt, Announcement.created)
+        if archived
+        else Announcement.created
+    )
+    return list(
+        session.execute(
+            select(
+                AnnouncementReceipt.announcementId,
+                AnnouncementReceipt.ownerId,
+                Announcement.important,
+            )
+            .join(
+                Announcement,
+                AnnouncementReceipt.announcementId == Announcement.id,  # type: ignore
+            )
+            .where(
+                AnnouncementReceipt.archived == archived,
+                age < cutoff,
+            )
+            .limit(limit)
+        ).all()
+    )
+
+
+def _notification_keys(
+    rows: list[Row[tuple[str, str, bool]]], archived: bool
+) -> ColumnElement[bool]:
+    """Get the condition that selects the notifications of the rows.
+
+    Notifications (un)archived since they were read are left out.
+    """
+
+    return Notification.id.in_(  # type: ignore
+        [notification_id for notification_id, _, _ in rows]
+    ) & (Notification.archived == archived)
+
+
+def _receipt_keys(
+    rows: list[Row[tuple[str, str, bool]]], archived: bool
+) -> ColumnElement[bool]:
+    """Get the condition that selects the receipts of the rows.
+
+    Receipts (un)archived since they were read are left out.
+    """
+
+    return tuple_(AnnouncementReceipt.ownerId, AnnouncementReceipt.announcementId).in_(
+        [(owner_id, announcement_id) for announcement_id, owner_id, _ in rows]
+    ) & (AnnouncementReceipt.archived == archived)
+
+
+async def _retention_batch(
+    session: Session,
+    table: type[Notification] | type[AnnouncementReceipt],
+    condition: ColumnElement[bool],
+    rows: list[Row[tuple[str, str, bool]]],
+    archived_at: datetime | None,
+) -> int:
+    """Archive or delete a batch of notifications or receipts in one transaction.
+
+    The changes are recorded in the change log, and the owners' counters are
+    counted again in the same transaction, since bulk statements skip the
+    ORM flush that keeps both up to date.
+
+    Args:
+        session: The SQLAlchemy session to use for the operation.
+        table: The notifications or the announcement receipts table.
+        condition: The condition that selects the rows to change.
+        rows: The key, owner ID, and importance of each changed row.
+        archived_at: The archival time to set, or None to delete the rows.
+
+    Returns:
+        The number of rows changed.
+    """
+
+    deltas: dict[str, dict[str, int]] = {}
+    for _, owner_id, important in rows:
+        owner_delta = deltas.setdefault(
+            owner_id, {"unread": 0, "important": 0, "archived": 0}
+        )
+        row_delta = (
+            _deletion_delta(important)
+            if archived_at is None
+            else _archive_delta(important, unarchive=False)
+        )
+        for counter, value in row_delta.items():
+            owner_delta[counter] += value
+
+    if archived_at is None:
+        record_notification_changes(session, ChangeAction.DELETED, table, condition)
+        session.execute(delete(table).where(condition))
+
+    else:
+        record_notification_changes(
+            session,
+            ChangeAction.UPDATED,
+            table,
+            condition,
+            ["archived", "archivedAt"],
+        )
+        session.execute(
+            update(table).where(condition).values(archived=True, archivedAt=archived_at)
+        )
+
+    _recount_counters(session, list(deltas))
+    session.commit()
+
+    by_delta: dict[tuple[tuple[str, int], ...], list[str]] = {}
+    for owner_id, owner_delta in deltas.items():
+        by_delta.setdefault(tuple(owner_delta.items()), []).append(owner_id)
+
+    for owner_delta, owner_ids in by_delta.items():
+        await _send_counter_delta(owner_ids, dict(owner_delta))
+
+    # Let other tasks run between batches.
+    await asyncio.sleep(0)
+    return len(rows)
+
+
+async def apply_notification_retention(
+    session: Session,
+    archive_after_days: int | None,
+    delete_after_days: int | None,
+    batch_size: int,
+) -> NotificationRetentionReport:
+    """Archive and delete old notifications and announcement receipts.
+
+    Rows are changed in batches of at most `batch_size`, each in its own
+    transaction, so that no lock is held for long. The changes are recorded
+    in the change log, and the owners' notification counters are counted
+    again, in the same transactions. Announcements are deleted
+    once they are old enough and no receipt refers to them anymore.
+
+    Args:
+        session: The SQLAlchemy session to use for the operation.
+        archive_after_days: Archive notifications older than this many days,
+            or None to never archive them.
+        delete_after_days: Delete notifications archived more than this many
+            days ago, or None to never delete them.
+        batch_size: The maximum number of rows changed per transaction.
+
+    Returns:
+        The number of rows archived and deleted.
+    """
+
+    report = NotificationRetentionReport()
+    now = datetime.now(timezone.utc)
+
+    if archive_after_days is not None:
+        cutoff = now - timedelta(days=archive_after_days)
+        while rows := _old_notifications(session, cutoff, False, batch_size):
+            report.archived += await _retention_batch(
+                session, Notification, _notification_keys(rows, False), rows, now
+            )
+
+        while rows := _old_receipts(session, cutoff, False, batch_size):
+            report.archived += await _retention_batch(
+                session, AnnouncementReceipt, _receipt_keys(rows, False), rows, now
+            )
+
+    if delete_after_days is not None:
+        cutoff = now - timedelta(days=delete_after_days)
+        while rows := _old_notifications(session, cutoff, True, batch_size):
+            report.deleted += await _retention_batch(
+                session, Notification, _notification_keys(rows, True), rows, None
+            )
+
+        while rows := _old_receipts(session, cutoff, True, batch_size):
+            report.deleted += await _retention_batch(
+                session, AnnouncementReceipt, _receipt_keys(rows, True), rows, None
+            )
+
+        while announcement_ids := list(
+            session.execute(
+                select(Announcement.id)
+                .where(
+                    Announcement.created < cutoff,
+                    ~exists().where(
+                        AnnouncementReceipt.announcementId == Announcement.id
+                    ),
+                )
+                .limit(batch_size)
+            ).scalars()
+        ):
+            session.execute(
+                delete(Announcement).where(
+                    Announcement.id.in_(announcement_ids)  # type: ignore
+                )
+            )
+            session.commit()
+            report.announcements_deleted += len(announcement_ids)
+            await asyncio.sleep(0)
+
+    logger.info(
+        "Notification retention archived %d rows, deleted %d rows, and deleted %d announcements",
+        report.archived,
+        report.deleted,
+        report.announcements_deleted,
+    )
+    return report
+
+
+async def run_notification_retention() -> None:
+    """Apply the configured notification retention policy periodically."""
+
+    # Imported here to avoid a circular import with the database handler.
+    from centralserver.internals.db_handler import get_db_session
+
+    config = app_config.notifications
+    while True:
+        try:
+            with next(get_db_session()) as session:
+                await apply_notification_retention(
+                    session,
+                    config.archive_after_days,
+                    config.delete_after_days,
+                    config.retention_batch_size,
+                )
+
+        except Exception as e:
+            logger.error("Notification retention failed: %s", e)
+
+        await asyncio.sleep(config.retention_interval)
+
+
+def start_notification_retention() -> None:
+    """Start the notification retention job if a retention policy is set."""
+
+    global _retention_task  # pylint: disable=W0603
+    config = app_config.notifications
+    if _retention_task is None and (
+        config.archive_after_days is not None or config.delete_after_days is not None
+    ):
+        _retention_task = asyncio.create_task(run_notification_retention())
+
+
+async def stop_notification_retention() -> None:
+    """Stop the notification retention job."""
+
+    global _retention_task  # pylint: disable=W0603
+    if _retention_task is not None:
+        _retention_task.cancel()
+        try:
+            await _retention_task
+
+        except asyncio.CancelledError:
+            pass
+
+        _retention_task = None
@@ -0,0 +1,86 @@
+"""The ID and statistics of the HTTP request being handled.
+
+The request ID is added to every log line written while handling the
+request, so its database, object store, and AI log lines can be linked
+together. This module must not log, as the logger depends on it.
+"""
+
+import logging
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy import Connection, Engine, event
+from sqlalchemy.engine import ExceptionContext
+
+
+@dataclass
+class RequestStats:
+    """The statistics collected while handling a request."""
+
+    request_id: str
+    started: float = field(default_factory=time.perf_counter)
+    db_queries: int = 0
+    db_time: float = 0.0
+    response_bytes: int = 0
+
+    @property
+    def latency(self) -> float:
+        """The number of seconds since the request started."""
+
+        return time.perf_counter() - self.started
+
+
+# The statistics of the request being handled, if any
+current_request: ContextVar[RequestStats | None] = ContextVar(
+    "current_request", default=None
+)
+
+
+class RequestContextFilter(logging.Filter):
+    """Add the ID and statistics of the current request to log records."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        stats = current_request.get()
+        if stats is not None and not hasattr(record, "request_id"):
+            record.request_id = stats.request_id
+            record.db_queries = stats.db_queries
+            record.db_time_ms = round(stats.db_time * 1000, 3)
+
+        return True
+
+
+def _before_cursor_execute(conn: Connection, *_: Any) -> None:
+    """Record the start time of a query."""
+
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn: Connection, *_: Any) -> None:
+    """Add a finished query to the statistics of the current request."""
+
+    started = conn.info["query_started"].pop()
+    stats = current_request.get()
+    if stats is not None:
+        stats.db_queries += 1
+        stats.db_time += time.perf_counter() - started
+
+
+def _handle_error(context: ExceptionContext) -> None:
+    """Add a failed query to the statistics of the current request."""
+
+    if context.connection is not None and context.connection.info.get("query_started"):
+        _after_cursor_execute(context.connection)
+
+
+def track_queries(engine: Engine) -> None:
+    """Count the queries made through an engine and the time spent on them.
+
+    Args:
+        engine: The engine to track.
+    """
+
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
@@ -0,0 +1,98 @@
+"""Request IDs and per-request timing.
+
+Every HTTP request gets an ID, taken from its `X-Request-ID` header if the
+client sent a valid one. The ID is returned in the `X-Request-ID` response
+header. When the request is done, one line is logged with its latency, the
+number of database queries it made and the time spent on them, and the size
+of the response body.
+"""
+
+import logging
+import re
+import uuid
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from centralserver.internals.config_handler import app_config
+from centralserver.internals.logger import LoggerFactory
+from centralserver.internals.request_context import RequestStats, current_request
+
+# The request lines are logged at their own level, so that they are kept
+# when debug mode is off.
+logger = LoggerFactory(app_config.logging.request_log_level).get_logger(__name__)
+
+REQUEST_ID_HEADER = "X-Request-ID"
+_valid_request_id = re.compile(r"^[A-Za-z0-9._-]{1,64}$")
+
+
+class RequestContextMiddleware:
+    """Assign request IDs and log the timing of every HTTP request."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = next(
+            (
+                value.decode("latin-1")
+                for name, value in scope["headers"]
+                if name == REQUEST_ID_HEADER.lower().encode()
+            ),
+            "",
+        )
+        if not _valid_request_id.match(request_id):
+            request_id = uuid.uuid4().hex
+
+        stats = RequestStats(request_id)
+        status_code = 500
+
+        async def send_with_stats(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                MutableHeaders(scope=message)[REQUEST_ID_HEADER] = request_id
+
+            elif message["type"] == "http.response.body":
+                stats.response_bytes += len(message.get("body", b""))
+
+            await send(message)
+
+        token = current_request.set(stats)
+        try:
+            await self.app(scope, receive, send_with_stats)
+
+        finally:
+            latency = stats.latency
+            logger.log(
+                (
+                    logging.WARNING
+                    if latency >= app_config.logging.slow_request_threshold
+                    else logging.getLevelNamesMapping()[
+                        app_config.logging.request_log_level
+                    ]
+                ),
+                "%s %s %d in %.1f ms, %d queries (%.1f ms), %d bytes",
+                scope["method"],
+                scope["path"],
+                status_code,
+                latency * 1000,
+                stats.db_queries,
+                stats.db_time * 1000,
+                stats.response_bytes,
+                extra={
+                    "request_id": request_id,
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "status": status_code,
+                    "latency_ms": round(latency * 1000, 3),
+                    "db_queries": stats.db_queries,
+                    "db_time_ms": round(stats.db_time * 1000, 3),
+                    "response_bytes": stats.response_bytes,
+                },
+            )
+            current_request.reset(token)
@@ -2,15 +2,19 @@ import datetime
 import uuid
 
 from fastapi import HTTPException, UploadFile, status
+from fastapi.responses import Response
 from sqlmodel import Session, select
 
 from centralserver.internals.adapters.object_store import (
     BucketNames,
-    get_object_store_handler,
+    get_object_store,
+)
+from centralserver.internals.image_handler import (
+    delete_image_derivatives,
+    put_image_derivatives,
+    stream_image,
 )
-from centralserver.internals.config_handler import app_config
 from centralserver.internals.logger import LoggerFactory
-from centralserver.internals.models.object_store import BucketObject
 from centralserver.internals.models.school import School, SchoolCreate
 from centralserver.internals.websocket_manager import websocket_manager
 
@@ -82,11 +86,24 @@ async def clear_assigned_noted_by_for_user(user_id: str, session: Session) -> No
         )
 
 
-async def get_school_logo(fn: str) -> BucketObject | None:
-    """Fetch the school logo file from the object store."""
-
-    handler = await get_object_store_handler(app_config.object_store)
-    return await handler.get(BucketNames.SCHOOL_LOGOS, fn)
+async def get_school_logo(
+    fn: str,
+    range_header: str | None = None,
+    size: int | None = None,
+    accept: str | None = None,
+    if_none_match: str | None = None,
+) -> Response:
+    """Stream the school logo file, or a derivative of it, from the object store."""
+
+    return await stream_image(
+        BucketNames.SCHOOL_LOGOS,
+        fn,
+        range_header,
+        "School logo not found.",
+        size,
+        accept,
+        if_none_match,
+    )
 
 
 async def update_school_logo(
@@ -104,7 +121,7 @@ async def update_school_logo(
             detail="School not found.",
         )
 
-    handler = await get_object_store_handler(app_config.object_store)
+    handler = await get_object_store()
     if img is None:
         logger.debug("Deleting logo for school_id: %s", school_id)
         if school.logoUrn is None:
@@ -113,6 +130,7 @@ async def update_school_logo(
 
         try:
             await handler.delete(BucketNames.SCHOOL_LOGOS, school.logoUrn)
+            await delete_image_derivatives(BucketNames.SCHOOL_LOGOS, school.logoUrn)
 
         except Exception as e:
             logger.error(
@@ -128,6 +146,7 @@ async def update_school_logo(
             logger.debug("Deleting old logo for school_id: %s", school_id)
             try:
                 await handler.delete(BucketNames.SCHOOL_LOGOS, school.logoUrn)
+                await delete_image_derivatives(BucketNames.SCHOOL_LOGOS, school.logoUrn)
 
             except Exception as e:
                 logger.error(
@@ -138,7 +157,9 @@ async def update_school_logo(
 
         logger.debug("Updating logo for school_id: %s", school_id)
         new_fn = uuid.uuid4().hex
-        await handler.put(BucketNames.SCHOOL_LOGOS, new_fn, await img.read())
+        contents = await img.read()
+        await handler.put(BucketNames.SCHOOL_LOGOS, new_fn, contents)
+        await put_image_derivatives(BucketNames.SCHOOL_LOGOS, new_fn, contents)
         school.logoUrn = new_fn
 
     school.lastModified = datetime.datetime.now(datetime.timezone.utc)
@@ -1,21 +1,26 @@
 import datetime
 
 from fastapi import BackgroundTasks, HTTPException, UploadFile, status
+from fastapi.responses import Response
 from sqlalchemy.exc import NoResultFound
 from sqlmodel import Session, select
 
 from centralserver.info import Program
 from centralserver.internals.adapters.object_store import (
     BucketNames,
-    get_object_store_handler,
+    content_object_name,
+    get_object_store,
     validate_and_process_image,
     validate_and_process_signature,
 )
 from centralserver.internals.auth_handler import crypt_ctx, verify_user_permission
-from centralserver.internals.config_handler import app_config
+from centralserver.internals.image_handler import (
+    delete_image_derivatives,
+    put_image_derivatives,
+    stream_image,
+)
 from centralserver.internals.logger import LoggerFactory
 from centralserver.internals.models.notification import NotificationType
-from centralserver.internals.models.object_store import BucketObject
 from centralserver.internals.models.role import Role
 from centralserver.internals.models.school import School
 from centralserver.internals.models.token import DecodedJWTToken
@@ -262,7 +267,7 @@ async def update_user_avatar(
             detail="User not found",
         )
 
-    object_store_manager = await get_object_store_handler(app_config.object_store)
+    object_store_manager = await get_object_store()
     if img is None:
         logger.debug("Deleting avatar for user: %s", target_user)
         if selected_user.avatarUrn is None:
@@ -270,6 +275,7 @@ async def update_user_avatar(
             raise ValueError("No avatar to delete.")
 
         await object_store_manager.delete(BucketNames.AVATARS, selected_user.avatarUrn)
+        await delete_image_derivatives(BucketNames.AVATARS, selected_user.avatarUrn)
         selected_user.avatarUrn = None
 
     else:
@@ -279,10 +285,16 @@ async def update_user_avatar(
             await object_store_manager.delete(
                 BucketNames.AVATARS, selected_user.avatarUrn
             )
+            await delete_image_derivatives(BucketNames.AVATARS, selected_user.avatarUrn)
 
         logger.debug("Updating avatar for user: %s", target_user)
         bucket_object = await object_store_manager.put(
-            BucketNames.AVATARS, selected_user.id, processed_img
+            BucketNames.AVATARS,
+            content_object_name(selected_user.id, processed_img),
+            processed_img,
+        )
+        await put_image_derivatives(
+            BucketNames.AVATARS, bucket_object.fn, processed_img
         )
 
         selected_user.avatarUrn = bucket_object.fn
@@ -341,7 +353,7 @@ async def update_user_signature(
             detail="User not found",
         )
 
-    object_store_manager = await get_object_store_handler(app_config.object_store)
+    object_store_manager = await get_object_store()
     if img is None:
         logger.debug("Deleting e-signature for user: %s", target_user)
         if selected_user.signatureUrn is None:
@@ -352,6 +364,9 @@ async def update_user_signature(
             await object_store_manager.delete(
                 BucketNames.ESIGNATURES, selected_user.signatureUrn
             )
+            await delete_image_derivatives(
+                BucketNames.ESIGNATURES, selected_user.signatureUrn
+            )
 
         except Exception as e:
             logger.error(
@@ -370,6 +385,9 @@ async def update_user_signature(
                 await object_store_manager.delete(
                     BucketNames.ESIGNATURES, selected_user.signatureUrn
                 )
+                await delete_image_derivatives(
+                    BucketNames.ESIGNATURES, selected_user.signatureUrn
+                )
 
             except Exception as e:
                 logger.error(
@@ -380,7 +398,12 @@ async def update_user_signature(
 
         logger.debug("Updating e-signature for user: %s", target_user)
         bucket_object = await object_store_manager.put(
-            BucketNames.ESIGNATURES, selected_user.id, processed_img
+            BucketNames.ESIGNATURES,
+            content_object_name(selected_user.id, processed_img),
+            processed_img,
+        )
+        await put_image_derivatives(
+            BucketNames.ESIGNATURES, bucket_object.fn, processed_img
         )
 
         selected_user.signatureUrn = bucket_object.fn
@@ -994,11 +1017,37 @@ async def remove_user_info(
     logger.info("Selected fields for user `%s` removed.", selected_user.username)
 
 
-async def get_user_avatar(fn: str) -> BucketObject | None:
-    handler = await get_object_store_handler(app_config.object_store)
-    return await handler.get(BucketNames.AVATARS, fn)
+async def get_user_avatar(
+    fn: str,
+    range_header: str | None = None,
+    size: int | None = None,
+    accept: str | None = None,
+    if_none_match: str | None = None,
+) -> Response:
+    return await stream_image(
+        BucketNames.AVATARS,
+        fn,
+        range_header,
+        "Avatar not found.",
+        size,
+        accept,
+        if_none_match,
+    )
 
 
-async def get_user_signature(fn: str) -> BucketObject | None:
-    handler = await get_object_store_handler(app_config.object_store)
-    return await handler.get(BucketNames.ESIGNATURES, fn)
+async def get_user_signature(
+    fn: str,
+    range_header: str | None = None,
+    size: int | None = None,
+    accept: str | None = None,
+    if_none_match: str | None = None,
+) -> Response:
+    return await stream_image(
+        BucketNames.ESIGNATURES,
+        fn,
+        range_header,
+        "Signature not found.",
+        size,
+        accept,
+        if_none_match,
+    )
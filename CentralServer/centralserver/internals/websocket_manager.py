@@ -1,18 +1,48 @@
-"""WebSocket connection manager for real-time communication."""
+"""WebSocket connection manager for real-time communication.
+
+Messages queued for a connection within the coalescing window are sent
+together as a single batch frame:
+
+    {"type": "batch", "messages": [<message>, <message>, ...]}
+
+The messages keep the order in which they were queued. A message that is
+alone in its window is sent as is, without the envelope.
+"""
 
 import asyncio
 import json
+import uuid
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, Dict, Iterable, List, Optional, Set
 
 from fastapi import WebSocket, WebSocketDisconnect
 
+from centralserver.internals.adapters.backplane import BackplaneAdapter
 from centralserver.internals.auth_handler import verify_access_token
+from centralserver.internals.config_handler import app_config
 from centralserver.internals.logger import LoggerFactory
 from centralserver.internals.models.token import DecodedJWTToken
 
 logger = LoggerFactory().get_logger(__name__)
 
+# Topic that receives report events from every school in the division.
+DIVISION_REPORTS_TOPIC = "division:reports"
+# Number of slots in the heartbeat timing wheel. Each heartbeat interval is
+# split into this many ticks, and each tick pings the connections of one slot.
+HEARTBEAT_WHEEL_SLOTS = 10
+
+
+def school_topic(school_id: int) -> str:
+    """Get the topic name for events of a school."""
+
+    return f"school:{school_id}"
+
+
+def report_topic(school_id: int, year: int, month: int) -> str:
+    """Get the topic name for events of a school's monthly report."""
+
+    return f"report:{school_id}:{year:04d}-{month:02d}"
+
 
 class WebSocketJSONEncoder(json.JSONEncoder):
     """Custom JSON encoder for WebSocket messages that handles datetime objects."""
@@ -23,14 +53,168 @@ class WebSocketJSONEncoder(json.JSONEncoder):
         return super().default(o)
 
 
+class ConnectionOutbox:
+    """A bounded queue of serialized messages waiting to be sent to a connection."""
+
+    def __init__(self, max_size: int, overflow_policy: str):
+        """
+        Create a new outbox.
+
+        Args:
+            max_size: The maximum number of messages waiting to be sent
+            overflow_policy: What to do when the outbox is full ('drop_oldest',
+                'drop_newest', or 'close')
+        """
+        self.queue: asyncio.Queue[str] = asyncio.Queue(maxsize=max_size)
+        self.overflow_policy = overflow_policy
+        self.overflowed = False
+        self.writer: Optional[asyncio.Task[None]] = None
+        self.sent = 0
+        self.dropped = 0
+        self.peak_depth = 0
+        self.coalesced = 0
+
+    @property
+    def depth(self) -> int:
+        """The number of messages waiting to be sent."""
+
+        return self.queue.qsize()
+
+    def put(self, payload: str) -> bool:
+        """
+        Queue a message, applying the overflow policy if the outbox is full.
+
+        Args:
+            payload: The serialized message
+
+        Returns:
+            True if the message was queued, False otherwise
+        """
+        if self.overflowed:
+            return False
+
+        if self.queue.full():
+            if self.overflow_policy == "close":
+                self.overflowed = True
+                return False
+
+            self.dropped += 1
+            if self.overflow_policy == "drop_newest":
+                return False
+
+            # drop_oldest: make room for the new message.
+            self.queue.get_nowait()
+            self.queue.task_done()
+
+        self.queue.put_nowait(payload)
+        self.peak_depth = max(self.peak_depth, self.queue.qsize())
+        return True
+
+    def clear(self) -> None:
+        """Discard the messages that are still waiting to be sent."""
+
+        while not self.queue.empty():
+            self.queue.get_nowait()
+            self.queue.task_done()
+
+
 class WebSocketConnectionManager:
-    """Manages WebSocket connections for real-time updates."""
+    """Manages WebSocket connections for real-time updates.
+
+    Every connection has its own outbox and writer task, so sending a message
+    only queues it; a slow client can only fill its own outbox and never
+    delays delivery to the others. The writer coalesces bursts of messages
+    into batch frames.
+
+    When the server runs several worker processes, messages are also relayed
+    through a backplane so that they reach connections held by other workers.
+    Relayed messages are queued and published by a background task, so a slow
+    backplane never delays the sender. The counts returned by the sending
+    methods only cover this worker.
+
+    Connections are pinged by the server on a timing wheel, spreading the
+    pings evenly over the heartbeat interval. Any message received from a
+    client counts as a pong, and connections that miss too many pongs in a
+    row are reaped.
+    """
+
+    def __init__(
+        self,
+        send_timeout: Optional[float] = None,
+        queue_size: Optional[int] = None,
+        overflow_policy: Optional[str] = None,
+        heartbeat_interval: Optional[float] = None,
+        max_missed_pongs: Optional[int] = None,
+        coalesce_window: Optional[float] = None,
+        relay_queue_size: Optional[int] = None,
+    ):
+        """
+        Create a new connection manager.
 
-    def __init__(self):
+        Args:
+            send_timeout: The number of seconds before a send to a connection
+                is abandoned (Default: the configured value)
+            queue_size: The maximum number of messages waiting to be sent to
+                a connection (Default: the configured value)
+            overflow_policy: What to do when a connection's outbox is full
+                (Default: the configured value)
+            heartbeat_interval: The number of seconds between pings to a
+                connection (Default: the configured value)
+            max_missed_pongs: The number of pings in a row a connection may
+                leave unanswered before it is reaped (Default: the configured
+                value)
+            coalesce_window: The number of seconds to collect messages for a
+                connection before sending them as one frame, or 0 to send
+                each message on its own (Default: the configured value)
+            relay_queue_size: The maximum number of messages waiting to be
+                relayed to the other workers (Default: the configured value)
+        """
+        self.send_timeout: float = send_timeout or app_config.websocket.send_timeout
+        self.queue_size: int = queue_size or app_config.websocket.queue_size
+        self.overflow_policy: str = (
+            overflow_policy or app_config.websocket.overflow_policy
+        )
+        self.heartbeat_interval: float = (
+            heartbeat_interval or app_config.websocket.heartbeat_interval
+        )
+        self.max_missed_pongs: int = (
+            max_missed_pongs or app_config.websocket.max_missed_pongs
+        )
+        self.coalesce_window: float = (
+            app_config.websocket.coalesce_window
+            if coalesce_window is None
+            else coalesce_window
+        )
+        # Messages dropped by, and connections closed for, overflowing outboxes
+        self.dropped_messages = 0
+        self.overflow_disconnects = 0
+        # Messages sent as part of a batch frame by closed connections
+        self.coalesced_messages = 0
+        # Heartbeat pings sent and connections reaped for missing pongs
+        self.heartbeat_pings = 0
+        self.reaped_connections = 0
+        # Connections by heartbeat timing wheel slot
+        self._heartbeat_wheel: List[Set[WebSocket]] = [
+            set() for _ in range(HEARTBEAT_WHEEL_SLOTS)
+        ]
+        self._heartbeat_position = 0
+        self._heartbeat_task: Optional[asyncio.Task[None]] = None
+        # Relays messages to the connections of other worker processes
+        self.backplane: Optional[BackplaneAdapter] = None
+        self.origin = uuid.uuid4().hex
+        self.relay_queue_size: int = (
+            relay_queue_size or app_config.websocket.relay_queue_size
+        )
+        self._relay_queue: Optional[asyncio.Queue[str]] = None
+        self._relay_task: Optional[asyncio.Task[None]] = None
+        # Messages not relayed because the relay queue was full
+        self.dropped_relays = 0
         # Store active connections by user ID
         self.user_connections: Dict[str, Set[WebSocket]] = {}
         # Store connection metadata
         self.connection_metadata: Dict[WebSocket, Dict[str, Any]] = {}
+        # Store subscribed connections by topic
+        self.topic_connections: Dict[str, Set[WebSocket]] = {}
         self._lock = asyncio.Lock()
 
     async def connect(self, websocket: WebSocket, user_id: str) -> bool:
@@ -55,11 +239,23 @@ class WebSocketConnectionManager:
                 # Add connection to user's set
                 self.user_connections[user_id].add(websocket)
 
-                # Store connection metadata
+                # Store connection metadata. The connection goes into the slot
+                # the wheel reaches last, so it is first pinged after a full
+                # heartbeat interval.
+                outbox = ConnectionOutbox(self.queue_size, self.overflow_policy)
+                slot = self._heartbeat_position
                 self.connection_metadata[websocket] = {
                     "user_id": user_id,
                     "connected_at": asyncio.get_event_loop().time(),
+                    "topics": set(),
+                    "outbox": outbox,
+                    "heartbeat_slot": slot,
+                    "missed_pongs": 0,
                 }
+                self._heartbeat_wheel[slot].add(websocket)
+                outbox.writer = asyncio.create_task(
+                    self._write_outbox(websocket, outbox)
+                )
 
             logger.info(
                 "WebSocket connected for user %s. Total connections: %d",
@@ -95,11 +291,26 @@ class WebSocketConnectionManager:
                 if not self.user_connections[user_id]:
                     del self.user_connections[user_id]
 
+            # Remove from subscribed topics
+            for topic in metadata["topics"]:
+                self._remove_from_topic(topic, websocket)
+
+            self._heartbeat_wheel[metadata["heartbeat_slot"]].discard(websocket)
+
             # Remove connection metadata
             if websocket in self.connection_metadata:
                 del self.connection_metadata[websocket]
 
-            logger.info("WebSocket disconnected for user %s", user_id)
+        # Stop the writer outside the lock. The writer itself disconnects the
+        # connection when a send fails, in which case it is left to return.
+        outbox: ConnectionOutbox = metadata["outbox"]
+        self.dropped_messages += outbox.dropped
+        self.coalesced_messages += outbox.coalesced
+        outbox.clear()
+        if outbox.writer is not None and outbox.writer is not asyncio.current_task():
+            outbox.writer.cancel()
+
+        logger.info("WebSocket disconnected for user %s", user_id)
 
     async def send_to_user(self, user_id: str, message: Dict[str, Any]) -> int:
         """
@@ -112,31 +323,304 @@ class WebSocketConnectionManager:
         Returns:
             Number of connections the message was sent to
         """
+        self._relay("users", [user_id], message)
         if user_id not in self.user_connections:
             logger.debug("No active connections for user %s", user_id)
             return 0
 
-        connections = list(self.user_connections[user_id])
-        sent_count = 0
-        failed_connections: list[WebSocket] = []
+        return await self._deliver("users", [user_id], message)
+
+    async def send_to_connection(
+        self, websocket: WebSocket, message: Dict[str, Any]
+    ) -> bool:
+        """
+        Send a message to a single connection.
+
+        Args:
+            websocket: The WebSocket connection
+            message: The message to send
+
+        Returns:
+            True if the message was queued for sending, False otherwise
+        """
+        return await self._send_to_connections([websocket], message) == 1
+
+    async def _send_to_connections(
+        self, connections: List[WebSocket], message: Dict[str, Any]
+    ) -> int:
+        """
+        Queue a message for sending to a list of connections.
+
+        The message is serialized once and placed in the outbox of each
+        connection. Connections whose outbox overflows under the 'close'
+        policy are disconnected.
+
+        Args:
+            connections: The WebSocket connections to send the message to
+            message: The message to send
+
+        Returns:
+            Number of connections the message was queued for
+        """
+        if not connections:
+            return 0
+
+        payload = json.dumps(message, cls=WebSocketJSONEncoder)
+        queued = 0
+        overflowed: list[WebSocket] = []
 
         for websocket in connections:
+            metadata = self.connection_metadata.get(websocket)
+            if not metadata:
+                continue
+
+            outbox: ConnectionOutbox = metadata["outbox"]
+            if outbox.put(payload):
+                queued += 1
+
+            elif outbox.overflowed:
+                overflowed.append(websocket)
+
+        for websocket in overflowed:
+            await self._close_overflowed(websocket)
+
+        return queued
+
+    async def _write_outbox(
+        self, websocket: WebSocket, outbox: ConnectionOutbox
+    ) -> None:
+        """
+        Send the queued messages of a connection until it fails or is closed.
+
+        After taking a message, the writer waits for the coalescing window and
+        sends it together with every message queued in the meantime.
+
+        Args:
+            websocket: The WebSocket connection
+            outbox: The connection's outbox
+        """
+        while True:
+            payloads = [await outbox.queue.get()]
             try:
-                await websocket.send_text(json.dumps(message, cls=WebSocketJSONEncoder))
-                sent_count += 1
+                if self.coalesce_window > 0:
+                    await asyncio.sleep(self.coalesce_window)
+                    while not outbox.queue.empty():
+                        payloads.append(outbox.queue.get_nowait())
+
+                if len(payloads) == 1:
+                    frame = payloads[0]
+
+                else:
+                    # The payloads are already serialized, so the envelope is
+                    # built around them instead of serializing them again.
+                    frame = '{"type": "batch", "messages": [%s]}' % ", ".join(payloads)
+                    outbox.coalesced += len(payloads)
+
+                await asyncio.wait_for(
+                    websocket.send_text(frame), timeout=self.send_timeout
+                )
+                outbox.sent += len(payloads)
+
+            except asyncio.TimeoutError:
+                logger.warning(
+                    "Timed out sending message to WebSocket for user %s",
+                    self.connection_metadata.get(websocket, {}).get("user_id"),
+                )
+                break
+
             except Exception as e:
                 logger.warning(
-                    "Failed to send message to WebSocket for user %s: %s", user_id, e
+                    "Failed to send message to WebSocket for user %s: %s",
+                    self.connection_metadata.get(websocket, {}).get("user_id"),
+                    e,
                 )
-                failed_connections.append(websocket)
+                break
 
-        # Clean up failed connections
-        if failed_connections:
-            async with self._lock:
-                for websocket in failed_connections:
-                    await self.disconnect(websocket)
+            finally:
+                for _ in payloads:
+                    outbox.queue.task_done()
+
+        await self.disconnect(websocket)
+
+    async def _close_overflowed(self, websocket: WebSocket) -> None:
+        """
+        Disconnect and close a connection whose outbox overflowed.
+
+        Args:
+            websocket: The WebSocket connection
+        """
+        logger.warning(
+            "Closing WebSocket for user %s: outbox is full",
+            self.connection_metadata.get(websocket, {}).get("user_id"),
+        )
+        self.overflow_disconnects += 1
+        await self.disconnect(websocket)
+        try:
+            await asyncio.wait_for(
+                websocket.close(code=4002, reason="Outbox overflow"),
+                timeout=self.send_timeout,
+            )
+
+        except Exception as e:
+            logger.debug("Failed to close overflowed WebSocket: %s", e)
+
+    def mark_alive(self, websocket: WebSocket) -> None:
+        """
+        Record that a message was received from a connection.
+
+        Args:
+            websocket: The WebSocket connection
+        """
+        metadata = self.connection_metadata.get(websocket)
+        if metadata:
+            metadata["missed_pongs"] = 0
+
+    async def heartbeat_tick(self) -> int:
+        """
+        Advance the heartbeat timing wheel by one slot.
+
+        Connections in the slot that have missed too many pongs are reaped,
+        and the others are pinged.
+
+        Returns:
+            Number of connections reaped
+        """
+        async with self._lock:
+            self._heartbeat_position = (
+                self._heartbeat_position + 1
+            ) % HEARTBEAT_WHEEL_SLOTS
+            to_ping: list[WebSocket] = []
+            to_reap: list[WebSocket] = []
+            for websocket in self._heartbeat_wheel[self._heartbeat_position]:
+                metadata = self.connection_metadata[websocket]
+                if metadata["missed_pongs"] >= self.max_missed_pongs:
+                    to_reap.append(websocket)
+
+                else:
+                    metadata["missed_pongs"] += 1
+                    to_ping.append(websocket)
+
+        self.heartbeat_pings += await self._send_to_connections(
+            to_ping,
+            {"type": "ping", "timestamp": asyncio.get_event_loop().time()},
+        )
+        for websocket in to_reap:
+            logger.info(
+                "Reaping WebSocket for user %s: missed %d pongs",
+                self.connection_metadata.get(websocket, {}).get("user_id"),
+                self.max_missed_pongs,
+            )
+            self.reaped_connections += 1
+            await self.disconnect(websocket)
+            try:
+                await asyncio.wait_for(
+                    websocket.close(code=4003, reason="Heartbeat timeout"),
+                    timeout=self.send_timeout,
+                )
 
-        return sent_count
+            except Exception as e:
+                logger.debug("Failed to close reaped WebSocket: %s", e)
+
+        return len(to_reap)
+
+    async def _run_heartbeat(self) -> None:
+        """Turn the heartbeat timing wheel until cancelled."""
+
+        tick = self.heartbeat_interval / HEARTBEAT_WHEEL_SLOTS
+        while True:
+            await asyncio.sleep(tick)
+            try:
+                await self.heartbeat_tick()
+
+            except Exception as e:
+                logger.error("WebSocket heartbeat failed: %s", e)
+
+    def start_heartbeat(self) -> None:
+        """Start pinging the connections and reaping dead ones."""
+
+        if self._heartbeat_task is None:
+            self._heartbeat_task = asyncio.create_task(self._run_heartbeat())
+
+    async def stop_heartbeat(self) -> None:
+        """Stop pinging the connections."""
+
+        if self._heartbeat_task is not None:
+            self._heartbeat_task.cancel()
+            try:
+                await self._heartbeat_task
+
+            except asyncio.CancelledError:
+                pass
+
+            self._heartbeat_task = None
+
+    def get_heartbeat_metrics(self) -> Dict[str, Any]:
+        """
+        Get the heartbeat metrics of the connections.
+
+        Returns:
+            The heartbeat settings, the pings sent, the connections reaped,
+            and the connections that have not answered their last ping
+        """
+        return {
+            "heartbeat_interval": self.heartbeat_interval,
+            "max_missed_pongs": self.max_missed_pongs,
+            "heartbeat_pings": self.heartbeat_pings,
+            "reaped_connections": self.reaped_connections,
+            "unresponsive_connections": sum(
+                1
+                for metadata in self.connection_metadata.values()
+                if metadata["missed_pongs"] > 0
+            ),
+        }
+
+    async def drain(self) -> None:
+        """Wait until every queued message has been sent, relayed, or discarded."""
+
+        if self._relay_queue is not None:
+            await self._relay_queue.join()
+
+        await asyncio.gather(
+            *(
+                metadata["outbox"].queue.join()
+                for metadata in list(self.connection_metadata.values())
+            )
+        )
+
+    def get_queue_metrics(self) -> Dict[str, Any]:
+        """
+        Get the outbox metrics of the connections.
+
+        Returns:
+            The number of connections, queued messages, current and peak
+            outbox depth, the messages dropped and connections closed
+            because their outbox was full, the messages sent in batches, and
+            the messages waiting to be relayed or dropped by the relay queue
+        """
+        outboxes: list[ConnectionOutbox] = [
+            metadata["outbox"] for metadata in self.connection_metadata.values()
+        ]
+        return {
+            "connections": len(outboxes),
+            "queue_size": self.queue_size,
+            "overflow_policy": self.overflow_policy,
+            "queued_messages": sum(outbox.depth for outbox in outboxes),
+            "max_queue_depth": max((outbox.depth for outbox in outboxes), default=0),
+            "peak_queue_depth": max(
+                (outbox.peak_depth for outbox in outboxes), default=0
+            ),
+            "dropped_messages": self.dropped_messages
+            + sum(outbox.dropped for outbox in outboxes),
+            "overflow_disconnects": self.overflow_disconnects,
+            "coalesce_window": self.coalesce_window,
+            "coalesced_messages": self.coalesced_messages
+            + sum(outbox.coalesced for outbox in outboxes),
+            "relay_queue_size": self.relay_queue_size,
+            "queued_relays": (
+                self._relay_queue.qsize() if self._relay_queue is not None else 0
+            ),
+            "dropped_relays": self.dropped_relays,
+        }
 
     async def broadcast_to_users(
         self, user_ids: List[str], message: Dict[str, Any]
@@ -151,12 +635,8 @@ class WebSocketConnectionManager:
         Returns:
             Total number of connections the message was sent to
         """
-        total_sent = 0
-        for user_id in user_ids:
-            sent_count = await self.send_to_user(user_id, message)
-            total_sent += sent_count
-
-        return total_sent
+        self._relay("users", user_ids, message)
+        return await self._deliver("users", user_ids, message)
 
     async def broadcast_to_all(self, message: Dict[str, Any]) -> int:
         """
@@ -168,8 +648,258 @@ class WebSocketConnectionManager:
         Returns:
             Total number of connections the message was sent to
         """
-        user_ids = list(self.user_connections.keys())
-        return await self.broadcast_to_users(user_ids, message)
+        self._relay("all", [], message)
+        return await self._deliver("all", [], message)
+
+    async def _deliver(
+        self, kind: str, targets: List[str], message: Dict[str, Any]
+    ) -> int:
+        """
+        Send a message to the matching connections of this worker.
+
+        Args:
+            kind: Who to send the message to ('users', 'topics', or 'all')
+            targets: The user IDs or topics to send the message to
+            message: The message to send
+
+        Returns:
+            Number of connections the message was sent to
+        """
+        connections: Set[WebSocket] = set()
+        if kind == "all":
+            for user_connections in self.user_connections.values():
+                connections.update(user_connections)
+
+        else:
+            index = self.user_connections if kind == "users" else self.topic_connections
+            for target in targets:
+                connections.update(index.get(target, ()))
+
+        return await self._send_to_connections(list(connections), message)
+
+    def _relay(self, kind: str, targets: List[str], message: Dict[str, Any]) -> None:
+        """
+        Queue a message to be relayed to the other workers through the backplane.
+
+        If the relay queue is full, the message is not relayed.
+
+        Args:
+            kind: Who to send the message to ('users', 'topics', or 'all')
+            targets: The user IDs or topics to send the message to
+            message: The message to send
+        """
+        if self.backplane is None or self._relay_queue is None:
+            return
+
+        for payload in self._relay_payloads(kind, targets, message):
+            try:
+                self._relay_queue.put_nowait(payload)
+
+            except asyncio.QueueFull:
+                self.dropped_relays += 1
+                logger.warning(
+                    "WebSocket relay queue is full; message not relayed to other workers"
+                )
+
+    async def _publish_relays(
+        self, backplane: BackplaneAdapter, queue: asyncio.Queue[str]
+    ) -> None:
+        """
+        Publish the queued relayed messages until the backplane is stopped.
+
+        Args:
+            backplane: The backplane adapter to publish to
+            queue: The queue of serialized envelopes to publish
+        """
+        while True:
+            payload = await queue.get()
+            try:
+                await backplane.publish(payload)
+
+            except Exception as e:
+                logger.warning(
+                    "Failed to relay WebSocket message to other workers: %s", e
+                )
+
+            finally:
+                queue.task_done()
+
+    def _relay_payloads(
+        self, kind: str, targets: List[str], message: Dict[str, Any]
+    ) -> List[str]:
+        """
+        Serialize the envelopes relaying a message to the other workers.
+
+        The targets are split across as many envelopes as needed to keep each
+        one within the backplane's payload size limit. A connection subscribed
+        to topics in different envelopes receives the message more than once.
+
+        Args:
+            kind: Who to send the message to ('users', 'topics', or 'all')
+            targets: The user IDs or topics to send the message to
+            message: The message to send
+
+        Returns:
+            The serialized envelopes
+        """
+        envelope = {"origin": self.origin, "kind": kind, "message": message}
+        payload = json.dumps({**envelope, "targets": targets}, cls=WebSocketJSONEncoder)
+        limit = self.backplane.max_payload_size if self.backplane else None
+        if limit is None or len(payload.encode("utf-8")) <= limit or not targets:
+            return [payload]
+
+        # The size of the envelope without any targets, and of each target
+        # with the separator before it.
+        base_size = len(
+            json.dumps({**envelope, "targets": []}, cls=WebSocketJSONEncoder).encode(
+                "utf-8"
+            )
+        )
+        payloads: List[str] = []
+        chunk: List[str] = []
+        chunk_size = base_size
+        for target in targets:
+            target_size = len(json.dumps(target).encode("utf-8")) + 2
+            if chunk and chunk_size + target_size > limit:
+                payloads.append(
+                    json.dumps({**envelope, "targets": chunk}, cls=WebSocketJSONEncoder)
+                )
+                chunk, chunk_size = [], base_size
+
+            chunk.append(target)
+            chunk_size += target_size
+
+        payloads.append(
+            json.dumps({**envelope, "targets": chunk}, cls=WebSocketJSONEncoder)
+        )
+        return payloads
+
+    async def _receive_relayed(self, payload: str) -> None:
+        """
+        Deliver a message relayed by another worker to this worker's connections.
+
+        Args:
+            payload: The serialized message envelope
+        """
+        try:
+            envelope: Dict[str, Any] = json.loads(payload)
+            if envelope["origin"] == self.origin:
+                return
+
+            await self._deliver(
+                envelope["kind"], envelope["targets"], envelope["message"]
+            )
+
+        except (json.JSONDecodeError, KeyError, TypeError) as e:
+            logger.warning("Received invalid WebSocket backplane message: %s", e)
+
+    async def start_backplane(self, backplane: BackplaneAdapter) -> None:
+        """
+        Start relaying messages to and from other workers.
+
+        Args:
+            backplane: The backplane adapter to use
+        """
+        self.backplane = backplane
+        await backplane.start(self._receive_relayed)
+        self._relay_queue = asyncio.Queue(self.relay_queue_size)
+        self._relay_task = asyncio.create_task(
+            self._publish_relays(backplane, self._relay_queue)
+        )
+
+    async def stop_backplane(self) -> None:
+        """Stop relaying messages to and from other workers."""
+
+        if self._relay_task is not None:
+            self._relay_task.cancel()
+            try:
+                await self._relay_task
+
+            except asyncio.CancelledError:
+                pass
+
+            self._relay_task = None
+
+        self._relay_queue = None
+
+        if self.backplane is not None:
+            await self.backplane.stop()
+            self.backplane = None
+
+    def _remove_from_topic(self, topic: str, websocket: WebSocket) -> None:
+        """Remove a connection from a topic's index. The lock must be held."""
+
+        if topic in self.topic_connections:
+            self.topic_connections[topic].discard(websocket)
+            if not self.topic_connections[topic]:
+                del self.topic_connections[topic]
+
+    async def subscribe(self, websocket: WebSocket, topic: str) -> bool:
+        """
+        Subscribe a connection to a topic.
+
+        Args:
+            websocket: The WebSocket connection
+            topic: The topic to subscribe to
+
+        Returns:
+            True if the connection was subscribed, False if it is not connected
+        """
+        async with self._lock:
+            metadata = self.connection_metadata.get(websocket)
+            if not metadata:
+                return False
+
+            metadata["topics"].add(topic)
+            self.topic_connections.setdefault(topic, set()).add(websocket)
+
+        logger.debug("User %s subscribed to topic %s", metadata["user_id"], topic)
+        return True
+
+    async def unsubscribe(self, websocket: WebSocket, topic: str) -> None:
+        """
+        Unsubscribe a connection from a topic.
+
+        Args:
+            websocket: The WebSocket connection
+            topic: The topic to unsubscribe from
+        """
+        async with self._lock:
+            metadata = self.connection_metadata.get(websocket)
+            if metadata:
+                metadata["topics"].discard(topic)
+
+            self._remove_from_topic(topic, websocket)
+
+    async def publish(self, topics: Iterable[str], message: Dict[str, Any]) -> int:
+        """
+        Publish a message to every connection subscribed to any of the topics.
+
+        A connection subscribed to several of the topics receives the message
+        only once.
+
+        Args:
+            topics: The topics to publish the message to
+            message: The message to send
+
+        Returns:
+            Number of connections the message was sent to
+        """
+        topic_list = list(topics)
+        self._relay("topics", topic_list, message)
+        return await self._deliver("topics", topic_list, message)
+
+    def get_topic_subscriber_count(self, topic: str) -> int:
+        """
+        Get the number of connections subscribed to a topic.
+
+        Args:
+            topic: The topic name
+
+        Returns:
+            Number of connections subscribed to the topic
+        """
+        return len(self.topic_connections.get(topic, set()))
 
     def get_user_connection_count(self, user_id: str) -> int:
         """
@@ -221,6 +951,99 @@ class WebSocketConnectionManager:
 websocket_manager = WebSocketConnectionManager()
 
 
+async def publish_report_event(
+    event_type: str,
+    school_id: int,
+    year: int,
+    month: int,
+    data: Optional[Dict[str, Any]] = None,
+) -> int:
+    """
+    Publish a report event to the school, report, and division topics.
+
+    Failures are logged instead of raised so that a publishing error never
+    fails the request that already committed the change.
+
+    Args:
+        event_type: The type of event ('report_updated', 'entry_changed', or
+            'status_changed')
+        school_id: The ID of the school the report belongs to
+        year: The year of the report
+        month: The month of the report
+        data: Optional additional data to include
+
+    Returns:
+        Number of connections the event was sent to
+    """
+    message: dict[str, Any] = {
+        "type": event_type,
+        "school_id": school_id,
+        "year": year,
+        "month": month,
+        "data": data or {},
+        "timestamp": asyncio.get_event_loop().time(),
+    }
+
+    try:
+        return await websocket_manager.publish(
+            (
+                school_topic(school_id),
+                report_topic(school_id, year, month),
+                DIVISION_REPORTS_TOPIC,
+            ),
+            message,
+        )
+
+    except Exception as e:
+        logger.warning(
+            "Failed to publish %s event for school %s (%s-%s): %s",
+            event_type,
+            school_id,
+            year,
+            month,
+            e,
+        )
+        return 0
+
+
+async def authorize_topic(token: DecodedJWTToken, topic: str) -> bool:
+    """
+    Check if a user may subscribe to a topic.
+
+    Users with global report access may subscribe to any topic. Other users
+    may only subscribe to the topics of their assigned school.
+
+    Args:
+        token: The user's decoded access token
+        topic: The topic to subscribe to
+
+    Returns:
+        True if the user may subscribe to the topic, False otherwise
+    """
+    # Imported here to avoid a circular import with the database handler.
+    from centralserver.internals.auth_handler import get_user, verify_user_permission
+    from centralserver.internals.db_handler import get_db_session
+
+    kind, _, rest = topic.partition(":")
+    if kind not in ("school", "report", "division") or not rest:
+        return False
+
+    with next(get_db_session()) as session:
+        if await verify_user_permission("reports:global:read", session, token):
+            return topic == DIVISION_REPORTS_TOPIC or kind != "division"
+
+        if kind == "division" or not await verify_user_permission(
+            "reports:local:read", session, token
+        ):
+            return False
+
+        user = await get_user(token.id, session=session, by_id=True)
+        if user is None or user.schoolId is None:
+            return False
+
+        return rest.split(":", 1)[0] == str(user.schoolId)
+
+
 async def authenticate_websocket(websocket: WebSocket) -> Optional[DecodedJWTToken]:
     """
     Authenticate a WebSocket connection using query parameters or headers.
@@ -254,6 +1077,43 @@ async def authenticate_websocket(websocket: WebSocket) -> Optional[DecodedJWTTok
         return None
 
 
+async def _handle_subscription(
+    websocket: WebSocket, token: DecodedJWTToken, action: str, topic: Any
+) -> None:
+    """
+    Handle a subscribe or unsubscribe request from a client.
+
+    Args:
+        websocket: The WebSocket connection
+        token: The user's decoded access token
+        action: Either 'subscribe' or 'unsubscribe'
+        topic: The requested topic
+    """
+    if not isinstance(topic, str):
+        reply: dict[str, Any] = {
+            "type": "subscription_error",
+            "topic": topic,
+            "detail": "Invalid topic.",
+        }
+
+    elif action == "unsubscribe":
+        await websocket_manager.unsubscribe(websocket, topic)
+        reply = {"type": "unsubscribed", "topic": topic}
+
+    elif await authorize_topic(token, topic):
+        await websocket_manager.subscribe(websocket, topic)
+        reply = {"type": "subscribed", "topic": topic}
+
+    else:
+        reply = {
+            "type": "subscription_error",
+            "topic": topic,
+            "detail": "You do not have permission to subscribe to this topic.",
+        }
+
+    await websocket_manager.send_to_connection(websocket, reply)
+
+
 async def handle_websocket_connection(websocket: WebSocket) -> None:
     """
     Handle a WebSocket connection lifecycle.
@@ -275,15 +1135,13 @@ async def handle_websocket_connection(websocket: WebSocket) -> None:
 
     try:
         # Send initial connection confirmation
-        await websocket.send_text(
-            json.dumps(
-                {
-                    "type": "connection_established",
-                    "user_id": token.id,
-                    "timestamp": asyncio.get_event_loop().time(),
-                },
-                cls=WebSocketJSONEncoder,
-            )
+        await websocket_manager.send_to_connection(
+            websocket,
+            {
+                "type": "connection_established",
+                "user_id": token.id,
+                "timestamp": asyncio.get_event_loop().time(),
+            },
         )
 
         # Keep connection alive and handle incoming messages
@@ -291,6 +1149,7 @@ async def handle_websocket_connection(websocket: WebSocket) -> None:
             try:
                 # Receive message from client
                 message = await websocket.receive_text()
+                websocket_manager.mark_alive(websocket)
 
                 # Parse the message
                 try:
@@ -299,14 +1158,19 @@ async def handle_websocket_connection(websocket: WebSocket) -> None:
 
                     if message_type == "ping":
                         # Respond to ping with pong
-                        await websocket.send_text(
-                            json.dumps(
-                                {
-                                    "type": "pong",
-                                    "timestamp": asyncio.get_event_loop().time(),
-                                },
-                                cls=WebSocketJSONEncoder,
-                            )
+                        await websocket_manager.send_to_connection(
+                            websocket,
+                            {
+                                "type": "pong",
+                                "timestamp": asyncio.get_event_loop().time(),
+                            },
+                        )
+                    elif message_type == "pong":
+                        # Liveness is already recorded above.
+                        pass
+                    elif message_type in ("subscribe", "unsubscribe"):
+                        await _handle_subscription(
+                            websocket, token, message_type, data.get("topic")
                         )
                     else:
                         logger.debug(
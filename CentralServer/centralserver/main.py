@@ -3,13 +3,33 @@ from fastapi.exception_handlers import http_exception_handler
 from fastapi.middleware.cors import CORSMiddleware
 
 from centralserver import info
-from centralserver.internals.adapters.object_store import get_object_store_handler
+from centralserver.internals.adapters.backplane import get_backplane_handler
+from centralserver.internals.adapters.object_store import (
+    close_object_store,
+    init_object_store,
+)
+from centralserver.internals.change_handler import (
+    start_change_retention,
+    stop_change_retention,
+)
 from centralserver.internals.config_handler import app_config
 from centralserver.internals.db_handler import populate_db
 from centralserver.internals.logger import LoggerFactory, log_app_info
+from centralserver.internals.mail_handler import (
+    close_smtp_pool,
+    start_mail_outbox,
+    stop_mail_outbox,
+)
+from centralserver.internals.notification_handler import (
+    start_notification_retention,
+    stop_notification_retention,
+)
+from centralserver.internals.request_middleware import RequestContextMiddleware
+from centralserver.internals.websocket_manager import websocket_manager
 from centralserver.routers import (
     ai_routes,
     auth_routes,
+    changes_routes,
     misc_routes,
     notification_routes,
     reports_routes,
@@ -26,13 +46,31 @@ logger = LoggerFactory(
 async def startup():
     log_app_info(logger)
     _ = await populate_db()  # Create the database if it doesn't exist
-    # Set up object store if not yet ready
-    handler = await get_object_store_handler(app_config.object_store)
-    await handler.check()
+    # Set up the object store shared by every request, if not yet ready
+    await init_object_store()
+    # Relay WebSocket messages between worker processes
+    await websocket_manager.start_backplane(
+        await get_backplane_handler(app_config.backplane)
+    )
+    # Ping WebSocket connections and reap the dead ones
+    websocket_manager.start_heartbeat()
+    # Archive and delete old notifications
+    start_notification_retention()
+    # Send the queued emails
+    start_mail_outbox()
+    # Delete old changes from the change feed
+    start_change_retention()
 
 
 async def shutdown():
     logger.info("Shutting down the application...")
+    await stop_notification_retention()
+    await stop_change_retention()
+    await stop_mail_outbox()
+    await close_smtp_pool()
+    await websocket_manager.stop_heartbeat()
+    await websocket_manager.stop_backplane()
+    await close_object_store()
 
 
 app = FastAPI(
@@ -52,7 +90,9 @@ app.include_router(notification_routes.router)
 app.include_router(reports_routes.router)
 app.include_router(misc_routes.router)
 app.include_router(websocket_routes.router)
+app.include_router(changes_routes.router)
 
+app.add_middleware(RequestContextMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=app_config.security.allow_origins,
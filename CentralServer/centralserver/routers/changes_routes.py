@@ -0,0 +1,74 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlmodel import Session
+
+from centralserver.internals.auth_handler import (
+    get_user,
+    verify_access_token,
+    verify_user_permission,
+)
+from centralserver.internals.change_handler import (
+    get_changes,
+    get_settled_change_cursor,
+)
+from centralserver.internals.db_handler import get_db_session
+from centralserver.internals.logger import LoggerFactory
+from centralserver.internals.models.change_log import ChangeFeedPage
+from centralserver.internals.models.token import DecodedJWTToken
+
+logger = LoggerFactory().get_logger(__name__)
+
+router = APIRouter(
+    prefix="/v1/changes",
+    tags=["changes"],
+)
+logged_in_dep = Annotated[DecodedJWTToken, Depends(verify_access_token)]
+
+
+@router.get("", response_model=ChangeFeedPage)
+async def get_changes_endpoint(
+    token: logged_in_dep,
+    session: Annotated[Session, Depends(get_db_session)],
+    since: Annotated[int | None, Query(ge=0)] = None,
+    limit: Annotated[int, Query(ge=1, le=1000)] = 100,
+) -> ChangeFeedPage:
+    """Get the changes the user can see that were recorded after a cursor.
+
+    Clients without a cursor should call this endpoint without `since` to get
+    the current head cursor, fetch a full snapshot, and then poll with the
+    returned cursor to receive only what changed since. A page with `resync`
+    set means the changes after the cursor were deleted: the client must
+    fetch a full snapshot again and poll with the returned cursor.
+
+    Args:
+        since: The cursor returned by the previous call.
+        limit: The maximum number of changes to return.
+    """
+
+    user = await get_user(token.id, session=session, by_id=True)
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found."
+        )
+
+    if since is None:
+        return ChangeFeedPage(
+            cursor=await get_settled_change_cursor(session), more=False, changes=[]
+        )
+
+    logger.debug("user %s fetching changes since %s", token.id, since)
+    return await get_changes(
+        session,
+        since,
+        user_id=user.id,
+        school_id=user.schoolId,
+        limit=limit,
+        local_reports=await verify_user_permission(
+            "reports:local:read", session, token
+        ),
+        global_reports=await verify_user_permission(
+            "reports:global:read", session, token
+        ),
+        global_users=await verify_user_permission("users:global:read", session, token),
+    )
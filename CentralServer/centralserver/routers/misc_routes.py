@@ -5,12 +5,14 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlmodel import Session
 
 from centralserver.info import FORBIDDEN_CONFIG_KEYS
+from centralserver.internals.adapters.object_store import get_object_cache_stats
 from centralserver.internals.auth_handler import (
     verify_access_token,
     verify_user_permission,
 )
 from centralserver.internals.config_handler import app_config
 from centralserver.internals.db_handler import get_db_session
+from centralserver.internals.models.object_store import ObjectCacheStats
 from centralserver.internals.models.settings import ConfigUpdateRequest
 from centralserver.internals.models.token import DecodedJWTToken
 
@@ -91,6 +93,22 @@ async def get_server_config(
     return config_data
 
 
+@router.get("/admin/object-store/cache")
+async def get_object_store_cache_stats(
+    token: logged_in_dep,
+    session: Annotated[Session, Depends(get_db_session)],
+) -> ObjectCacheStats:
+    """Get the hit rate and size of the object cache of this worker process."""
+
+    if not await verify_user_permission("site:manage", session, token):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You do not have permission to access server statistics.",
+        )
+
+    return await get_object_cache_stats()
+
+
 @router.put("/admin/config")
 async def update_server_config(
     new_config: ConfigUpdateRequest,
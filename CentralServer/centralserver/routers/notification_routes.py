@@ -1,64 +1,47 @@
 from typing import Annotated
 
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
-from sqlmodel import Session, func, select
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import ColumnElement, true
+from sqlmodel import Session
 
 from centralserver.info import AnnouncementRecipients
 from centralserver.internals.auth_handler import (
     verify_access_token,
     verify_user_permission,
 )
+from centralserver.internals.config_handler import app_config
 from centralserver.internals.db_handler import get_db_session
 from centralserver.internals.exceptions import NotificationNotFoundError
 from centralserver.internals.logger import LoggerFactory
 from centralserver.internals.models.notification import (
     Notification,
     NotificationArchiveRequest,
+    NotificationCounter,
+    NotificationRetentionReport,
     NotificationType,
 )
 from centralserver.internals.models.token import DecodedJWTToken
 from centralserver.internals.models.user import User
+from centralserver.internals.notification_handler import (
+    apply_notification_retention,
+)
 from centralserver.internals.notification_handler import (
     archive_notification as internals_archive_notification,
 )
 from centralserver.internals.notification_handler import (
     get_notification as internals_get_notification,
 )
+from centralserver.internals.notification_handler import (
+    get_notification_counters as internals_get_notification_counters,
+)
 from centralserver.internals.notification_handler import (
     get_user_notifications as internals_get_user_notifications,
 )
 from centralserver.internals.notification_handler import (
-    push_notification,
+    push_announcement,
 )
 from centralserver.internals.websocket_manager import websocket_manager
 
-
-# Helper function for background announcement notifications
-async def send_announcement_notification(
-    user_id: str,
-    title: str,
-    content: str,
-    important: bool,
-    notification_type: NotificationType,
-):
-    """Send announcement notification with a new database session."""
-    try:
-        # Create a new session for this background task
-        with next(get_db_session()) as session:
-            await push_notification(
-                owner_id=user_id,
-                title=title,
-                content=content,
-                important=important,
-                notification_type=notification_type,
-                session=session,
-            )
-    except Exception as e:
-        logger.error(
-            "Failed to send announcement notification to user %s: %s", user_id, e
-        )
-
-
 logger = LoggerFactory().get_logger(__name__)
 
 router = APIRouter(
@@ -95,20 +78,34 @@ async def get_notification_quantity(
         )
 
     logger.debug("user %s fetching notifications quantity", token.id)
-    return (
-        session.exec(
-            select(func.count()).where(  # pylint: disable=not-callable
-                Notification.ownerId == token.id
-            )
-        ).one()
-        if show_archived
-        else session.exec(
-            select(func.count()).where(  # pylint: disable=not-callable
-                (Notification.ownerId == token.id)
-                & (Notification.archived == False)  # pylint: disable=C0121
-            )
-        ).one()
-    )
+    counters = await internals_get_notification_counters(token.id, session)
+    return counters.unread + counters.archived if show_archived else counters.unread
+
+
+@router.get("/counters", response_model=NotificationCounter)
+async def get_notification_counters(
+    token: logged_in_dep,
+    session: Annotated[Session, Depends(get_db_session)],
+) -> NotificationCounter:
+    """Get the unread, important, and archived notification counts of the logged-in user.
+
+    Args:
+        token: The decoded JWT token of the logged-in user.
+        session: The database session.
+
+    Returns:
+        The notification counters of the user.
+    """
+
+    logger.info("User %s is fetching notification counters.", token.id)
+
+    if not await verify_user_permission("notifications:self:view", session, token):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You do not have permission to view your own notifications.",
+        )
+
+    return await internals_get_notification_counters(token.id, session)
 
 
 @router.get("/", response_model=Notification)
@@ -131,7 +128,7 @@ async def get_notification(
 
     try:
         notification = await internals_get_notification(
-            notification_id=notification_id, session=session
+            notification_id=notification_id, session=session, owner_id=token.id
         )
     except NotificationNotFoundError as e:
         logger.warning(
@@ -196,7 +193,7 @@ async def archive_notification(
     )
     try:
         selected_notification = await internals_get_notification(
-            notification_id=n.notification_id, session=session
+            notification_id=n.notification_id, session=session, owner_id=token.id
         )
 
     except NotificationNotFoundError as e:
@@ -234,7 +231,10 @@ async def archive_notification(
 
     try:
         archived_notification = await internals_archive_notification(
-            notification_id=n.notification_id, session=session, unarchive=unarchive
+            notification_id=n.notification_id,
+            session=session,
+            unarchive=unarchive,
+            owner_id=token.id,
         )
         logger.info(
             (
@@ -330,7 +330,6 @@ async def get_user_notifications(
 async def announce_notification(
     token: logged_in_dep,
     session: Annotated[Session, Depends(get_db_session)],
-    background_tasks: BackgroundTasks,
     title: str,
     content: str,
     recipient_types: AnnouncementRecipients,
@@ -346,7 +345,6 @@ async def announce_notification(
     Args:
         token: The decoded JWT token of the logged-in user.
         session: The database session.
-        background_tasks: Background tasks to handle notification processing.
         title: The title of the notification.
         content: The content of the notification.
         recipient_types: The types of recipients for the notification.
@@ -368,9 +366,8 @@ async def announce_notification(
             detail="You do not have permission to create announcements.",
         )
 
-    target: list[User] = []
     if recipient_types == AnnouncementRecipients.ALL:
-        target.extend(session.exec(select(User)).all())
+        recipients: ColumnElement[bool] = true()
 
     elif recipient_types == AnnouncementRecipients.ROLE:
         if recipient_role_id is None:
@@ -378,9 +375,7 @@ async def announce_notification(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Role ID is required when sending to a specific role.",
             )
-        target.extend(
-            session.exec(select(User).where(User.roleId == recipient_role_id)).all()
-        )
+        recipients = User.roleId == recipient_role_id
 
     elif recipient_types == AnnouncementRecipients.SCHOOL:
         if recipient_school_id is None:
@@ -388,9 +383,7 @@ async def announce_notification(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="School ID is required when sending to a specific school.",
             )
-        target.extend(
-            session.exec(select(User).where(User.schoolId == recipient_school_id)).all()
-        )
+        recipients = User.schoolId == recipient_school_id
 
     elif recipient_types == AnnouncementRecipients.USERS:
         if recipient_ids is None or len(recipient_ids) == 0:
@@ -398,10 +391,7 @@ async def announce_notification(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="User IDs are required when sending to specific users.",
             )
-        for user_id in recipient_ids:
-            user = session.exec(select(User).where(User.id == user_id)).first()
-            if user:
-                target.append(user)
+        recipients = User.id.in_(recipient_ids)  # type: ignore
 
     else:
         raise HTTPException(
@@ -409,16 +399,47 @@ async def announce_notification(
             detail="Invalid recipient type specified.",
         )
 
-    logger.debug("Targeting %d users for notification announcement.", len(target))
-    for user in target:
-        background_tasks.add_task(
-            send_announcement_notification,
-            user_id=user.id,
-            title=title,
-            content=content,
-            important=important,
-            notification_type=notification_type,
-        )
+    announced = await push_announcement(
+        recipients=recipients,
+        title=title,
+        content=content,
+        session=session,
+        important=important,
+        notification_type=notification_type,
+        author_id=token.id,
+    )
 
     logger.info("Notification announced successfully by user %s.", token.id)
-    return {"message": f"Notification announced to {len(target)} users successfully."}
+    return {"message": f"Notification announced to {announced} users successfully."}
+
+
+@router.post("/retention", response_model=NotificationRetentionReport)
+async def run_notification_retention(
+    token: logged_in_dep,
+    session: Annotated[Session, Depends(get_db_session)],
+) -> NotificationRetentionReport:
+    """Apply the configured notification retention policy now.
+
+    Args:
+        token: The decoded JWT token of the logged-in user.
+        session: The database session.
+
+    Returns:
+        The number of rows archived and deleted.
+    """
+
+    logger.info("User %s is running the notification retention job.", token.id)
+
+    if not await verify_user_permission("site:manage", session, token):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You do not have permission to run the notification retention job.",
+        )
+
+    config = app_config.notifications
+    return await apply_notification_retention(
+        session,
+        config.archive_after_days,
+        config.delete_after_days,
+        config.retention_batch_size,
+    )
@@ -1,7 +1,7 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, Depends, File, Header, UploadFile
+from fastapi.responses import Response, StreamingResponse
 from sqlmodel import Session
 
 from centralserver.internals.attachment_handler import (
@@ -60,13 +60,15 @@ async def get_attachment_endpoint(
     file_urn: str,
     token: logged_in_dep,
     session: Annotated[Session, Depends(get_db_session)],
-) -> StreamingResponse:
+    range_header: Annotated[str | None, Header(alias="Range")] = None,
+) -> Response:
     """Get a receipt attachment.
 
     Args:
         file_urn: The URN of the attachment to retrieve.
         token: The access token of the logged-in user.
         session: The session to the database.
+        range_header: The byte range of the attachment to retrieve. (Optional)
 
     Returns:
         StreamingResponse with the attachment file.
@@ -76,28 +78,7 @@ async def get_attachment_endpoint(
     # TODO: Add permission checking based on user role and report access
     # For now, we'll allow any authenticated user to retrieve attachments
 
-    try:
-        file_content, filename, content_type = await get_report_attachment(
-            file_urn, session
-        )
-
-        # Return as streaming response
-        from io import BytesIO
-
-        file_stream = BytesIO(file_content)
-
-        return StreamingResponse(
-            file_stream,
-            media_type=content_type,
-            headers={"Content-Disposition": f"attachment; filename={filename}"},
-        )
-
-    except Exception as e:
-        logger.error("Failed to retrieve attachment %s: %s", file_urn, str(e))
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to retrieve attachment: {str(e)}",
-        ) from e
+    return await get_report_attachment(file_urn, session, range_header)
 
 
 @router.delete("/{file_urn}")
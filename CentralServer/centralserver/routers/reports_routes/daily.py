@@ -30,6 +30,7 @@ from centralserver.internals.models.reports.status_change_request import (
 )
 from centralserver.internals.models.school import School
 from centralserver.internals.models.token import DecodedJWTToken
+from centralserver.internals.websocket_manager import publish_report_event
 
 logger = LoggerFactory().get_logger(__name__)
 
@@ -279,6 +280,13 @@ async def create_school_daily_report(
         existing_daily_report.notedBy = noted_by
         session.add(existing_daily_report)
         session.commit()
+        await publish_report_event(
+            "report_updated",
+            school_id,
+            year,
+            month,
+            {"report_type": "daily", "action": "updated"},
+        )
         session.refresh(existing_daily_report)
         return existing_daily_report
     else:
@@ -292,6 +300,13 @@ async def create_school_daily_report(
         )
         session.add(new_daily_report)
         session.commit()
+        await publish_report_event(
+            "report_updated",
+            school_id,
+            year,
+            month,
+            {"report_type": "daily", "action": "created"},
+        )
         session.refresh(new_daily_report)
         return new_daily_report
 
@@ -396,6 +411,13 @@ async def update_school_daily_report_entry_legacy(
         entry.purchases = purchases
 
     session.commit()
+    await publish_report_event(
+        "entry_changed",
+        school_id,
+        year,
+        month,
+        {"report_type": "daily", "action": "updated"},
+    )
     session.refresh(entry)
     session.refresh(daily_report)
     session.refresh(selected_monthly_report)
@@ -461,6 +483,13 @@ async def delete_school_daily_report(
 
     session.delete(daily_report)
     session.commit()
+    await publish_report_event(
+        "report_updated",
+        school_id,
+        year,
+        month,
+        {"report_type": "daily", "action": "deleted"},
+    )
 
     return None
 
@@ -667,6 +696,13 @@ async def create_school_daily_financial_report(
 
     session.add(report)
     session.commit()
+    await publish_report_event(
+        "report_updated",
+        school_id,
+        year,
+        month,
+        {"report_type": "daily", "action": "updated"},
+    )
     session.refresh(report)
 
     return report
@@ -810,6 +846,13 @@ async def create_daily_sales_and_purchases_entry(
 
     session.add(new_entry)
     session.commit()
+    await publish_report_event(
+        "entry_changed",
+        school_id,
+        year,
+        month,
+        {"report_type": "daily", "action": "created"},
+    )
     session.refresh(new_entry)
 
     return new_entry
@@ -939,6 +982,13 @@ async def update_daily_sales_and_purchases_entry(
     entry.purchases = purchases
 
     session.commit()
+    await publish_report_event(
+        "entry_changed",
+        school_id,
+        year,
+        month,
+        {"report_type": "daily", "action": "updated"},
+    )
     session.refresh(entry)
 
     return entry
@@ -1053,6 +1103,13 @@ async def delete_daily_sales_and_purchases_entry(
     # Delete the entry
     session.delete(entry)
     session.commit()
+    await publish_report_event(
+        "entry_changed",
+        school_id,
+        year,
+        month,
+        {"report_type": "daily", "action": "deleted"},
+    )
 
     return {"message": f"Entry for day {day} deleted successfully."}
 
@@ -1186,6 +1243,13 @@ async def create_bulk_daily_sales_and_purchases_entries(
         created_entries.append(new_entry)
 
     session.commit()
+    await publish_report_event(
+        "entry_changed",
+        school_id,
+        year,
+        month,
+        {"report_type": "daily", "action": "created"},
+    )
 
     # Refresh all created entries
     for entry in created_entries:
@@ -67,6 +67,7 @@ from centralserver.internals.models.reports.status_change_request import (
 )
 from centralserver.internals.models.school import School
 from centralserver.internals.models.token import DecodedJWTToken
+from centralserver.internals.websocket_manager import publish_report_event
 
 logger = LoggerFactory().get_logger(__name__)
 
@@ -681,6 +682,13 @@ async def create_or_update_liquidation_report(
         session.add(certified_entry)
 
     session.commit()
+    await publish_report_event(
+        "report_updated",
+        school_id,
+        year,
+        month,
+        {"report_type": "liquidation", "category": category, "action": "updated"},
+    )
     session.refresh(new_report)
     session.refresh(selected_monthly_report)
 
@@ -835,6 +843,13 @@ async def update_liquidation_report_entries(
         session.add(entry)
 
     session.commit()
+    await publish_report_event(
+        "entry_changed",
+        school_id,
+        year,
+        month,
+        {"report_type": "liquidation", "category": category, "action": "updated"},
+    )
 
     # Return updated entries
     return entries
@@ -907,6 +922,13 @@ async def delete_liquidation_report(
     if report:
         session.delete(report)
         session.commit()
+        await publish_report_event(
+            "report_updated",
+            school_id,
+            year,
+            month,
+            {"report_type": "liquidation", "category": category, "action": "deleted"},
+        )
 
 
 @router.get("/categories")
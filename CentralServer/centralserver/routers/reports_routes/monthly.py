@@ -25,6 +25,7 @@ from centralserver.internals.models.reports.status_change_request import (
 )
 from centralserver.internals.models.school import School
 from centralserver.internals.models.token import DecodedJWTToken
+from centralserver.internals.websocket_manager import publish_report_event
 
 logger = LoggerFactory().get_logger(__name__)
 
@@ -344,6 +345,13 @@ async def create_school_monthly_report(
 
     session.add(selected_monthly_report)
     session.commit()
+    await publish_report_event(
+        "report_updated",
+        school_id,
+        year,
+        month,
+        {"report_type": "monthly", "action": "updated"},
+    )
     session.refresh(selected_monthly_report)
     return selected_monthly_report
 
@@ -395,6 +403,13 @@ async def delete_school_monthly_report(
 
     session.delete(selected_monthly_report)
     session.commit()
+    await publish_report_event(
+        "report_updated",
+        school_id,
+        year,
+        month,
+        {"report_type": "monthly", "action": "deleted"},
+    )
 
 
 @router.patch("/{school_id}/{year}/{month}/status")
@@ -32,6 +32,7 @@ from centralserver.internals.models.reports.status_change_request import (
 )
 from centralserver.internals.models.school import School
 from centralserver.internals.models.token import DecodedJWTToken
+from centralserver.internals.websocket_manager import publish_report_event
 
 logger = LoggerFactory().get_logger(__name__)
 
@@ -282,6 +283,13 @@ async def create_school_payroll_report(
         )
         session.add(new_payroll_report)
         session.commit()
+        await publish_report_event(
+            "report_updated",
+            school_id,
+            year,
+            month,
+            {"report_type": "payroll", "action": "created"},
+        )
         session.refresh(selected_monthly_report)
         session.refresh(new_payroll_report)
         return new_payroll_report
@@ -398,6 +406,13 @@ async def create_payroll_report_entry(
 
     session.add(new_entry)
     session.commit()
+    await publish_report_event(
+        "entry_changed",
+        school_id,
+        year,
+        month,
+        {"report_type": "payroll", "action": "created"},
+    )
     session.refresh(new_entry)
     return new_entry
 
@@ -534,6 +549,13 @@ async def create_bulk_payroll_report_entries(
         session.add(new_entry)
 
     session.commit()
+    await publish_report_event(
+        "entry_changed",
+        school_id,
+        year,
+        month,
+        {"report_type": "payroll", "action": "created"},
+    )
 
     # Refresh all new entries
     for entry in new_entries:
@@ -661,6 +683,13 @@ async def update_payroll_report_entry(
 
     session.add(existing_entry)
     session.commit()
+    await publish_report_event(
+        "entry_changed",
+        school_id,
+        year,
+        month,
+        {"report_type": "payroll", "action": "updated"},
+    )
     session.refresh(existing_entry)
     return existing_entry
 
@@ -757,6 +786,13 @@ async def delete_payroll_report_entry(
 
     session.delete(existing_entry)
     session.commit()
+    await publish_report_event(
+        "entry_changed",
+        school_id,
+        year,
+        month,
+        {"report_type": "payroll", "action": "deleted"},
+    )
     return {
         "message": f"Payroll entry for week {week_number} and employee {employee_name} deleted successfully."
     }
@@ -848,6 +884,13 @@ async def update_payroll_report(
 
     session.add(payroll_report)
     session.commit()
+    await publish_report_event(
+        "report_updated",
+        school_id,
+        year,
+        month,
+        {"report_type": "payroll", "action": "updated"},
+    )
     session.refresh(payroll_report)
     return payroll_report
 
@@ -924,6 +967,13 @@ async def delete_school_payroll_report(
     # Reason: Deleting the payroll report will cascade delete all entries due to foreign key constraints
     session.delete(payroll_report)
     session.commit()
+    await publish_report_event(
+        "report_updated",
+        school_id,
+        year,
+        month,
+        {"report_type": "payroll", "action": "deleted"},
+    )
     return {"message": "Payroll report deleted successfully."}
 
 
@@ -1,9 +1,15 @@
 import datetime
-from io import BytesIO
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, Response, UploadFile, status
-from fastapi.responses import StreamingResponse
+from fastapi import (
+    APIRouter,
+    Depends,
+    Header,
+    HTTPException,
+    UploadFile,
+    status,
+)
+from fastapi.responses import Response, StreamingResponse
 from minio.error import S3Error
 from sqlmodel import Session, func, select
 
@@ -177,7 +183,11 @@ async def get_school_logo_endpoint(
     fn: str,
     token: Annotated[DecodedJWTToken, Depends(verify_access_token)],
     session: Annotated[Session, Depends(get_db_session)],
-) -> StreamingResponse:
+    range_header: Annotated[str | None, Header(alias="Range")] = None,
+    size: int | None = None,
+    accept: Annotated[str | None, Header()] = None,
+    if_none_match: Annotated[str | None, Header()] = None,
+) -> Response:
     """Get the school's logo image by filename."""
 
     logged_in_user = await get_user(token.id, session=session, by_id=True)
@@ -202,12 +212,7 @@ async def get_school_logo_endpoint(
         )
 
     try:
-        bucket_object = await get_school_logo(fn)
-        if bucket_object is None:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="School logo not found.",
-            )
+        return await get_school_logo(fn, range_header, size, accept, if_none_match)
 
     except S3Error as e:
         logger.error("Error fetching school logo: %s", e)
@@ -216,8 +221,6 @@ async def get_school_logo_endpoint(
             detail="School logo not found.",
         ) from e
 
-    return StreamingResponse(BytesIO(bucket_object.obj), media_type="image/*")
-
 
 @router.patch("/", response_model=School)
 async def update_school_endpoint(
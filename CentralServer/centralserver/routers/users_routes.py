@@ -1,9 +1,8 @@
 import datetime
-from io import BytesIO
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, status
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, Depends, Header, HTTPException, UploadFile, status
+from fastapi.responses import Response, StreamingResponse
 from minio.error import S3Error
 from sqlmodel import Session, func, select
 
@@ -190,13 +189,21 @@ async def get_user_avatar_endpoint(
     fn: str,
     token: logged_in_dep,
     session: Annotated[Session, Depends(get_db_session)],
-) -> StreamingResponse:
+    range_header: Annotated[str | None, Header(alias="Range")] = None,
+    size: int | None = None,
+    accept: Annotated[str | None, Header()] = None,
+    if_none_match: Annotated[str | None, Header()] = None,
+) -> Response:
     """Get the user's profile picture.
 
     Args:
         fn: The name of the user's avatar.
         token: The access token of the logged-in user.
         session: The session to the database.
+        range_header: The byte range of the avatar to get. (Optional)
+        size: The size in pixels of the avatar derivative to get. (Optional)
+        accept: The image formats accepted by the client. (Optional)
+        if_none_match: The ETags of the copies cached by the client. (Optional)
 
     Returns:
         The user's avatar image.
@@ -223,12 +230,7 @@ async def get_user_avatar_endpoint(
         )
 
     try:
-        bucket_object = await get_user_avatar(fn)
-        if bucket_object is None:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Avatar not found.",
-            )
+        return await get_user_avatar(fn, range_header, size, accept, if_none_match)
 
     except S3Error as e:
         logger.error("Error fetching user avatar: %s", e)
@@ -237,8 +239,6 @@ async def get_user_avatar_endpoint(
             detail="Avatar not found.",
         ) from e
 
-    return StreamingResponse(BytesIO(bucket_object.obj), media_type="image/*")
-
 
 @router.patch("/", response_model=UserPublic)
 async def update_user_endpoint(
@@ -281,13 +281,21 @@ async def get_user_signature_endpoint(
     fn: str,
     token: logged_in_dep,
     session: Annotated[Session, Depends(get_db_session)],
-) -> StreamingResponse:
+    range_header: Annotated[str | None, Header(alias="Range")] = None,
+    size: int | None = None,
+    accept: Annotated[str | None, Header()] = None,
+    if_none_match: Annotated[str | None, Header()] = None,
+) -> Response:
     """Get the user's e-signature.
 
     Args:
         fn: The name of the user's e-signature.
         token: The access token of the logged-in user.
         session: The session to the database.
+        range_header: The byte range of the e-signature to get. (Optional)
+        size: The size in pixels of the e-signature derivative to get. (Optional)
+        accept: The image formats accepted by the client. (Optional)
+        if_none_match: The ETags of the copies cached by the client. (Optional)
 
     Returns:
         The user's e-signature.
@@ -318,12 +326,7 @@ async def get_user_signature_endpoint(
         )
 
     try:
-        bucket_object = await get_user_signature(fn)
-        if bucket_object is None:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Signature not found.",
-            )
+        return await get_user_signature(fn, range_header, size, accept, if_none_match)
 
     except S3Error as e:
         logger.error("Error fetching user signature: %s", e)
@@ -332,8 +335,6 @@ async def get_user_signature_endpoint(
             detail="Signature not found.",
         ) from e
 
-    return StreamingResponse(BytesIO(bucket_object.obj), media_type="image/*")
-
 
 @router.delete("/")
 async def delete_user_info_endpoint(
@@ -1,9 +1,21 @@
 """WebSocket routes for real-time communication."""
 
-from fastapi import APIRouter, WebSocket
+from typing import Annotated, Any
 
+from fastapi import APIRouter, Depends, HTTPException, WebSocket, status
+from sqlmodel import Session
+
+from centralserver.internals.auth_handler import (
+    verify_access_token,
+    verify_user_permission,
+)
+from centralserver.internals.db_handler import get_db_session
 from centralserver.internals.logger import LoggerFactory
-from centralserver.internals.websocket_manager import handle_websocket_connection
+from centralserver.internals.models.token import DecodedJWTToken
+from centralserver.internals.websocket_manager import (
+    handle_websocket_connection,
+    websocket_manager,
+)
 
 logger = LoggerFactory().get_logger(__name__)
 
@@ -11,6 +23,7 @@ router = APIRouter(
     prefix="/v1/ws",
     tags=["websockets"],
 )
+logged_in_dep = Annotated[DecodedJWTToken, Depends(verify_access_token)]
 
 
 @router.websocket("/user-updates")
@@ -28,3 +41,22 @@ async def websocket_user_updates_endpoint(websocket: WebSocket):
     """
     logger.debug("New WebSocket connection attempt for user updates")
     await handle_websocket_connection(websocket)
+
+
+@router.get("/metrics")
+async def websocket_metrics_endpoint(
+    token: logged_in_dep,
+    session: Annotated[Session, Depends(get_db_session)],
+) -> dict[str, Any]:
+    """Get the outbox queue and heartbeat metrics of the active WebSocket connections."""
+
+    if not await verify_user_permission("site:manage", session, token):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You do not have permission to view WebSocket metrics.",
+        )
+
+    return (
+        websocket_manager.get_queue_metrics()
+        | websocket_manager.get_heartbeat_metrics()
+    )
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+
+"""bench_logging.py
+
+Measure the logging overhead on a hot endpoint (`GET /v1/users/me`).
+
+The endpoint is called in-process, first with every logger writing to its
+own stream and file handlers directly, then with every logger putting its
+records on the shared queue. Set `CENTRAL_SERVER_CONFIG_FILE` to the config
+of the database to use, and enable debug mode so the endpoint logs:
+
+    PYTHONPATH=. python scripts/bench_logging.py <username> <password>
+"""
+
+import argparse
+import logging
+import statistics
+import sys
+import time
+
+from fastapi.testclient import TestClient
+
+from centralserver import app
+from centralserver.internals.logger import (
+    get_output_handlers,
+    get_queue_handler,
+    stop_queue_listener,
+)
+
+
+def use_handlers(direct: bool) -> None:
+    """Replace the handlers of the application's loggers.
+
+    Args:
+        direct: Whether to write directly instead of through the queue.
+    """
+
+    for name, logger in logging.Logger.manager.loggerDict.items():
+        if not name.startswith("centralserver") or not isinstance(
+            logger, logging.Logger
+        ):
+            continue
+
+        logger.handlers.clear()
+        if direct:
+            # Every logger used to get its own set of handlers.
+            for handler in get_output_handlers():
+                logger.addHandler(handler)
+
+        else:
+            logger.addHandler(get_queue_handler())
+
+
+def measure(client: TestClient, token: str, requests: int) -> list[float]:
+    """Call the endpoint repeatedly and record the latency of each call.
+
+    Returns:
+        The latency of each call in milliseconds.
+    """
+
+    headers = {"Authorization": f"Bearer {token}"}
+    latencies: list[float] = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        response = client.get("/api/v1/users/me", headers=headers)
+        latencies.append((time.perf_counter() - start) * 1000)
+        response.raise_for_status()
+
+    return latencies
+
+
+def report(label: str, latencies: list[float]) -> None:
+    """Print the latency percentiles of a run."""
+
+    quantiles = statistics.quantiles(latencies, n=100)
+    print(
+        f"{label:>8}: mean {statistics.mean(latencies):.3f} ms,"
+        f" p50 {quantiles[49]:.3f} ms, p99 {quantiles[98]:.3f} ms"
+    )
+
+
+def main() -> int:
+    """The main function of the script."""
+
+    parser = argparse.ArgumentParser(
+        description="Measure the logging overhead on a hot endpoint."
+    )
+    parser.add_argument("username", help="The user to log in as.")
+    parser.add_argument("password", help="The password of the user.")
+    parser.add_argument(
+        "-n",
+        "--requests",
+        type=int,
+        default=1000,
+        help="Number of requests per run (default: 1000)",
+    )
+    args = parser.parse_args()
+
+    client = TestClient(app)
+    login = client.post(
+        "/api/v1/auth/login",
+        data={"username": args.username, "password": args.password},
+    )
+    if login.status_code != 200:
+        print(f"Error: {login.status_code} - {login.text}")
+        return 1
+
+    token = login.json()["access_token"]
+    measure(client, token, min(args.requests, 100))  # Warm up
+
+    use_handlers(direct=True)
+    report("direct", measure(client, token, args.requests))
+    use_handlers(direct=False)
+    report("queued", measure(client, token, args.requests))
+    stop_queue_listener()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
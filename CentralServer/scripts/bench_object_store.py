@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+
+"""bench_object_store.py
+
+Measure concurrent avatar and attachment reads from the configured object
+store, with the blocking I/O run inline on the event loop (as it was before)
+and in the object store I/O thread pool.
+
+Besides the total time of the reads, the script measures the event loop lag:
+how late a task that wakes up every millisecond is woken up, which is what
+every other request handled by the worker waits for. Set
+`CENTRAL_SERVER_CONFIG_FILE` to the config of the object store to use:
+
+    PYTHONPATH=. python scripts/bench_object_store.py
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from typing import Any, Callable
+
+from centralserver.internals.adapters import object_store
+from centralserver.internals.adapters.object_store import (
+    BucketNames,
+    ObjectStoreAdapter,
+    init_object_store,
+)
+
+# The sizes of the test objects
+AVATAR_SIZE = 256 * 1024
+ATTACHMENT_SIZE = 4 * 1024 * 1024
+
+
+async def inline_io(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Run a blocking I/O function directly on the event loop."""
+
+    return func(*args, **kwargs)
+
+
+async def measure_lag(stop: asyncio.Event, lags: list[float]) -> None:
+    """Record how late the event loop wakes up a task sleeping for 1 ms."""
+
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(0.001)
+        lags.append(time.perf_counter() - start - 0.001)
+
+
+async def run(
+    adapter: ObjectStoreAdapter, objects: list[tuple[BucketNames, str]], reads: int
+) -> None:
+    """Read the test objects concurrently and print the timings."""
+
+    stop = asyncio.Event()
+    lags: list[float] = []
+    lag_task = asyncio.create_task(measure_lag(stop, lags))
+    await asyncio.sleep(0.01)
+
+    start = time.perf_counter()
+    await asyncio.gather(
+        *(adapter.get(*objects[i % len(objects)]) for i in range(reads))
+    )
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    await lag_task
+    label = "inline" if object_store.run_io is inline_io else "executor"
+    print(
+        f"{label:>8}: {reads} reads in {elapsed * 1000:.1f} ms,"
+        f" max event loop lag {max(lags) * 1000:.1f} ms"
+    )
+
+
+async def main() -> int:
+    """The main function of the script."""
+
+    parser = argparse.ArgumentParser(
+        description="Measure concurrent reads from the object store."
+    )
+    parser.add_argument(
+        "-n",
+        "--reads",
+        type=int,
+        default=200,
+        help="Number of concurrent reads per run (default: 200)",
+    )
+    args = parser.parse_args()
+
+    adapter = await init_object_store()
+    objects: list[tuple[BucketNames, str]] = []
+    for i in range(8):
+        avatar = (BucketNames.AVATARS, f"bench-avatar-{i}")
+        attachment = (BucketNames.ATTACHMENTS, f"bench-attachment-{i}")
+        await adapter.put(*avatar, os.urandom(AVATAR_SIZE))
+        await adapter.put(*attachment, os.urandom(ATTACHMENT_SIZE))
+        objects.extend((avatar, attachment))
+
+    try:
+        run_io = object_store.run_io
+        object_store.run_io = inline_io
+        await run(adapter, objects, args.reads)
+        object_store.run_io = run_io
+        await run(adapter, objects, args.reads)
+
+    finally:
+        for bucket, fn in objects:
+            await adapter.delete(bucket, fn)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+
+"""bench_websocket_broadcast.py
+
+Measure how long a broadcast takes to reach every connected WebSocket.
+
+The connections are stand-ins that take a fixed time to accept each send, so
+a broadcast that sends to them one after another would take the number of
+connections times the send delay. Set `CENTRAL_SERVER_CONFIG_FILE` to the
+config to load:
+
+    PYTHONPATH=. python scripts/bench_websocket_broadcast.py
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+
+from centralserver.internals.websocket_manager import WebSocketConnectionManager
+
+
+class SlowWebSocket:
+    """A stand-in for a WebSocket connection that takes time to send."""
+
+    def __init__(self, delay: float) -> None:
+        self.delay = delay
+        self.sent = 0
+
+    async def accept(self) -> None:
+        pass
+
+    async def close(self, code: int = 1000, reason: str | None = None) -> None:
+        pass
+
+    async def send_text(self, data: str) -> None:
+        await asyncio.sleep(self.delay)
+        self.sent += 1
+
+
+async def main() -> int:
+    """The main function of the script."""
+
+    parser = argparse.ArgumentParser(
+        description="Measure the fan-out latency of a WebSocket broadcast."
+    )
+    parser.add_argument(
+        "-n",
+        "--sockets",
+        type=int,
+        default=5000,
+        help="Number of connected sockets (default: 5000)",
+    )
+    parser.add_argument(
+        "-d",
+        "--delay",
+        type=float,
+        default=0.005,
+        help="Time in seconds each socket takes to send (default: 0.005)",
+    )
+    args = parser.parse_args()
+
+    manager = WebSocketConnectionManager(send_timeout=5.0)
+    connections = [SlowWebSocket(args.delay) for _ in range(args.sockets)]
+    for i, ws in enumerate(connections):
+        await manager.connect(ws, f"user{i}")  # type: ignore
+
+    start = time.perf_counter()
+    sent = await manager.broadcast_to_all({"type": "announcement"})
+    await manager.drain()
+    elapsed = time.perf_counter() - start
+
+    delivered = sum(ws.sent for ws in connections)
+    print(f"Broadcast to {sent} sockets took {elapsed * 1000:.1f} ms")
+    print(f"Sequential sends would take {args.sockets * args.delay * 1000:.1f} ms")
+    if delivered != args.sockets:
+        print(f"Error: only {delivered} of {args.sockets} sockets received it")
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -1,10 +1,35 @@
+import hashlib
 import os
+import threading
+import time
+from io import BytesIO
 
+import pytest
+from fastapi import HTTPException
+from PIL import Image
+
+from centralserver.internals import download_handler
 from centralserver.internals.adapters.config import (
     GarageObjectStoreAdapterConfig,
     LocalObjectStoreAdapterConfig,
     MinIOObjectStoreAdapterConfig,
 )
+from centralserver.internals.adapters.object_store import (
+    MULTIPART_PART_SIZE,
+    STREAM_CHUNK_SIZE,
+    BucketNames,
+    CachedObjectStoreAdapter,
+    GarageObjectStoreAdapter,
+    LocalObjectStoreAdapter,
+    MinIOObjectStoreAdapter,
+    ObjectCache,
+    UploadStream,
+    get_object_store,
+    process_image,
+    run_image_job,
+)
+from centralserver.internals.config_handler import app_config
+from centralserver.internals.download_handler import parse_range, stream_object
 
 
 def test_valid_local_config():
@@ -114,3 +139,258 @@ def test_no_secret_key_garage_config():
 
     else:
         raise AssertionError("ValueError not raised")
+
+
+async def test_local_adapter_runs_io_off_the_event_loop(tmp_path, monkeypatch):  # type: ignore
+    """Test that the local adapter does its file I/O in the I/O thread pool."""
+
+    adapter = LocalObjectStoreAdapter(
+        LocalObjectStoreAdapterConfig(filepath=str(tmp_path))
+    )
+    threads: list[str] = []
+    read = LocalObjectStoreAdapter._read  # pylint: disable=W0212
+
+    def tracked_read(fp):  # type: ignore
+        threads.append(threading.current_thread().name)
+        return read(fp)  # type: ignore
+
+    monkeypatch.setattr(LocalObjectStoreAdapter, "_read", staticmethod(tracked_read))
+
+    await adapter.check()
+    await adapter.put(BucketNames.ATTACHMENTS, "pytest-object", b"content")
+    with pytest.raises(FileExistsError):
+        await adapter.put(BucketNames.ATTACHMENTS, "pytest-object", b"other")
+
+    obj = await adapter.get(BucketNames.ATTACHMENTS, "pytest-object")
+    assert obj is not None and obj.obj == b"content"
+    assert threads and threads[0].startswith("object-store-io")
+
+    await adapter.delete(BucketNames.ATTACHMENTS, "pytest-object")
+    assert await adapter.get(BucketNames.ATTACHMENTS, "pytest-object") is None
+    with pytest.raises(FileNotFoundError):
+        await adapter.delete(BucketNames.ATTACHMENTS, "pytest-object")
+
+
+async def test_local_adapter_streams_ranges(tmp_path):  # type: ignore
+    """Test reading an object from the local adapter in chunks and ranges."""
+
+    adapter = LocalObjectStoreAdapter(
+        LocalObjectStoreAdapterConfig(filepath=str(tmp_path))
+    )
+    content = bytes(range(256)) * 1024  # Larger than one chunk
+    await adapter.put(BucketNames.ATTACHMENTS, "pytest-object", content)
+
+    assert await adapter.stat(BucketNames.ATTACHMENTS, "pytest-object") == len(content)
+    assert await adapter.stat(BucketNames.ATTACHMENTS, "pytest-missing") is None
+
+    chunks = [c async for c in adapter.stream(BucketNames.ATTACHMENTS, "pytest-object")]
+    assert len(chunks) > 1
+    assert b"".join(chunks) == content
+
+    part = b"".join(
+        [
+            c
+            async for c in adapter.stream(
+                BucketNames.ATTACHMENTS, "pytest-object", offset=1000, length=70000
+            )
+        ]
+    )
+    assert part == content[1000:71000]
+
+
+def test_parse_range():
+    """Test parsing the HTTP Range header."""
+
+    assert parse_range(None, 100) is None
+    assert parse_range("bytes=0-9", 100) == (0, 10)
+    assert parse_range("bytes=90-", 100) == (90, 10)
+    assert parse_range("bytes=90-200", 100) == (90, 10)
+    assert parse_range("bytes=-30", 100) == (70, 30)
+    # Unsupported ranges are ignored.
+    assert parse_range("bytes=0-1,5-6", 100) is None
+    assert parse_range("items=0-1", 100) is None
+
+    with pytest.raises(HTTPException) as e:
+        parse_range("bytes=100-", 100)
+
+    assert e.value.status_code == 416
+    assert e.value.headers == {"Content-Range": "bytes */100"}
+
+
+class FakeUploadFile:
+    """A stand-in for an uploaded file."""
+
+    def __init__(self, content: bytes) -> None:
+        self.content = BytesIO(content)
+
+    async def read(self, size: int = -1) -> bytes:
+        return self.content.read(size)
+
+
+async def test_local_adapter_put_stream_enforces_size_limit(tmp_path):  # type: ignore
+    """Test that a streamed upload is rejected as soon as it is too large."""
+
+    adapter = LocalObjectStoreAdapter(
+        LocalObjectStoreAdapterConfig(filepath=str(tmp_path))
+    )
+    content = os.urandom(300_000)
+    upload = UploadStream(FakeUploadFile(content), 1_000_000, "ok.bin")
+    await adapter.put_stream(BucketNames.ATTACHMENTS, "pytest-ok", upload.chunks())
+    assert upload.size == len(content)
+    assert upload.digest == hashlib.sha256(content).hexdigest()
+    obj = await adapter.get(BucketNames.ATTACHMENTS, "pytest-ok")
+    assert obj is not None and obj.obj == content
+
+    upload = UploadStream(FakeUploadFile(content), 100_000, "big.bin")
+    with pytest.raises(ValueError):
+        await adapter.put_stream(BucketNames.ATTACHMENTS, "pytest-big", upload.chunks())
+
+    # Reading stopped at the first chunk over the limit, and nothing was kept.
+    assert upload.size < 100_000 + STREAM_CHUNK_SIZE
+    assert await adapter.stat(BucketNames.ATTACHMENTS, "pytest-big") is None
+
+
+async def test_minio_adapter_put_stream_uploads_parts():
+    """Test that a streamed upload reaches the MinIO client part by part."""
+
+    class FakeMinio:
+        def __init__(self) -> None:
+            self.parts: list[int] = []
+
+        def put_object(self, data, length, part_size, **_):  # type: ignore
+            assert length == -1
+            while part := data.read(part_size):
+                self.parts.append(len(part))
+
+    adapter = MinIOObjectStoreAdapter(
+        MinIOObjectStoreAdapterConfig(access_key="key", secret_key="secret")
+    )
+    adapter.client = FakeMinio()  # type: ignore
+    size = MULTIPART_PART_SIZE * 2 + 1000
+    upload = UploadStream(FakeUploadFile(bytes(size)), size, "file.bin")
+    await adapter.put_stream(BucketNames.ATTACHMENTS, "pytest-parts", upload.chunks())
+    assert adapter.client.parts == [MULTIPART_PART_SIZE, MULTIPART_PART_SIZE, 1000]  # type: ignore
+
+
+async def test_object_store_is_shared():
+    """Test that every request gets the same object store adapter."""
+
+    assert await get_object_store() is await get_object_store()
+
+
+def test_minio_adapter_pools_connections():
+    """Test that the MinIO client reuses a configured connection pool."""
+
+    adapter = MinIOObjectStoreAdapter(
+        MinIOObjectStoreAdapterConfig(
+            access_key="key", secret_key="secret", pool_size=4, max_retries=2
+        )
+    )
+    assert adapter.client._http is adapter.http_client  # type: ignore
+    assert adapter.http_client.connection_pool_kw["maxsize"] == 4
+    assert adapter.http_client.connection_pool_kw["retries"].total == 2
+
+
+def test_process_image_rejects_decompression_bombs():
+    """Test that images with too many pixels are rejected before decoding."""
+
+    buffer = BytesIO()
+    Image.new("RGB", (1000, 1000)).save(buffer, format="png")
+    with pytest.raises(ValueError, match="pixel limit"):
+        process_image(buffer.getvalue(), False, {"png"}, 256, 999_999)
+
+    assert process_image(buffer.getvalue(), False, {"png"}, 256, 1_000_000)
+
+
+async def test_image_job_timeout(monkeypatch):  # type: ignore
+    """Test that a request stops waiting for an image job that takes too long."""
+
+    monkeypatch.setattr(app_config.object_store, "image_timeout", 0.1)
+    with pytest.raises(ValueError, match="too long"):
+        await run_image_job(time.sleep, 5)
+
+
+async def test_garage_adapter_presigned_url():
+    """Test that presigned URLs are only created when they are enabled."""
+
+    config = GarageObjectStoreAdapterConfig(access_key="key", secret_key="secret")
+    adapter = GarageObjectStoreAdapter(config)
+    assert await adapter.presigned_url(BucketNames.ATTACHMENTS, "pytest-file") is None
+
+    config.presigned_downloads = "redirect"
+    url = await adapter.presigned_url(
+        BucketNames.ATTACHMENTS,
+        "pytest-file",
+        {"Content-Disposition": "attachment; filename=receipt.pdf"},
+    )
+    assert url is not None
+    assert "/centralserver-attachments/pytest-file?" in url
+    assert "X-Amz-Expires=300" in url
+    assert "response-content-disposition=" in url
+
+    # Presigned URLs are only handed out as redirects.
+    with pytest.raises(ValueError, match="presigned download mode"):
+        GarageObjectStoreAdapterConfig(
+            access_key="key", secret_key="secret", presigned_downloads="url"
+        )
+
+
+async def test_stream_object_redirects_to_presigned_url(monkeypatch):  # type: ignore
+    """Test that downloads are redirected to the object store when enabled."""
+
+    adapter = GarageObjectStoreAdapter(
+        GarageObjectStoreAdapterConfig(
+            access_key="key", secret_key="secret", presigned_downloads="redirect"
+        )
+    )
+
+    async def stat(*_):  # type: ignore
+        return 10
+
+    async def get_object_store():  # type: ignore
+        return adapter
+
+    monkeypatch.setattr(adapter, "stat", stat)
+    monkeypatch.setattr(download_handler, "get_object_store", get_object_store)
+    monkeypatch.setattr(app_config.object_store, "presigned_downloads", "redirect")
+    response = await stream_object(BucketNames.AVATARS, "pytest-file", "image/*")
+    assert response.status_code == 307
+    assert "X-Amz-Signature=" in response.headers["Location"]
+
+
+async def test_cached_adapter_serves_and_invalidates(tmp_path):  # type: ignore
+    """Test that small objects are cached until they are replaced."""
+
+    adapter = LocalObjectStoreAdapter(
+        LocalObjectStoreAdapterConfig(filepath=str(tmp_path))
+    )
+    cached = CachedObjectStoreAdapter(
+        adapter, ObjectCache(250, 100), {BucketNames.AVATARS}
+    )
+    await cached.put(BucketNames.AVATARS, "pytest-a", b"a" * 100)
+    await cached.put(BucketNames.AVATARS, "pytest-big", b"b" * 101)
+
+    for _ in range(3):
+        obj = await cached.get(BucketNames.AVATARS, "pytest-a")
+        assert obj is not None and obj.obj == b"a" * 100
+
+    stats = cached.cache.stats
+    assert (stats.hits, stats.misses, stats.entries) == (2, 1, 1)
+
+    # Objects over the size limit are not cached.
+    await cached.get(BucketNames.AVATARS, "pytest-big")
+    assert cached.cache.stats.entries == 1
+
+    # Replacing an object drops its cached copy.
+    await cached.delete(BucketNames.AVATARS, "pytest-a")
+    await cached.put(BucketNames.AVATARS, "pytest-a", b"c" * 50)
+    chunks = [c async for c in cached.stream(BucketNames.AVATARS, "pytest-a", 10, 5)]
+    assert chunks == [b"c" * 5]
+
+    # The least recently used objects are evicted to stay within the budget.
+    for name in ("pytest-x", "pytest-y", "pytest-z"):
+        await cached.put(BucketNames.AVATARS, name, b"x" * 100)
+        await cached.get(BucketNames.AVATARS, name)
+
+    assert cached.cache.size <= 250
+    assert cached.cache.stats.evictions == 2
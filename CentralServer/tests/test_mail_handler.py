@@ -0,0 +1,274 @@
+import asyncio
+import socket
+from datetime import datetime, timedelta, timezone
+from email import message_from_bytes
+from email.message import EmailMessage
+from typing import Any, Generator
+
+import pytest
+from aiosmtpd.controller import Controller
+from sqlmodel import Session, delete, select
+
+from centralserver.internals.config_handler import app_config
+from centralserver.internals.db_handler import get_db_session
+from centralserver.internals.mail_handler import (
+    DomainRateLimiter,
+    SMTPConnectionPool,
+    process_mail_outbox,
+    send_mail,
+)
+from centralserver.internals.models.mail import MailOutboxEntry
+
+
+class RecordingHandler:
+    """An SMTP handler that records the received emails and sessions."""
+
+    def __init__(self) -> None:
+        self.messages: list[Any] = []
+        self.sessions: set[int] = set()
+        self.delay = 0.0
+
+    async def handle_DATA(self, server: Any, session: Any, envelope: Any) -> str:
+        self.sessions.add(id(session))
+        if self.delay:
+            await asyncio.sleep(self.delay)
+
+        self.messages.append(envelope)
+        return "250 Message accepted for delivery"
+
+
+def _free_port() -> int:
+    """Get an unused TCP port on the loopback interface."""
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def smtp_server() -> Generator[tuple[Controller, RecordingHandler], None, None]:
+    """Run a local SMTP server for the duration of a test."""
+
+    handler = RecordingHandler()
+    controller = Controller(handler, hostname="127.0.0.1", port=_free_port())
+    controller.start()
+    yield controller, handler
+    controller.stop()
+
+
+def _message(i: int) -> EmailMessage:
+    """Create a test email."""
+
+    message = EmailMessage()
+    message["Subject"] = f"Test {i}"
+    message["From"] = "noreply@example.com"
+    message["To"] = f"user{i}@example.com"
+    message.set_content(f"Message {i}")
+    return message
+
+
+def _pool(controller: Controller, **kwargs: Any) -> SMTPConnectionPool:
+    """Create a connection pool to the local SMTP server."""
+
+    return SMTPConnectionPool(
+        hostname=controller.hostname,
+        port=controller.port,
+        starttls=False,
+        **kwargs,
+    )
+
+
+async def test_smtp_pool_reuses_connections(smtp_server):  # type: ignore
+    """Test that sequential emails share one connection."""
+
+    controller, handler = smtp_server
+    pool = _pool(controller)
+    for i in range(5):
+        await pool.send(_message(i), "noreply@example.com", [f"user{i}@example.com"])
+
+    await pool.close()
+    assert len(handler.messages) == 5
+    assert pool.connections_opened == 1
+    assert len(handler.sessions) == 1
+
+
+async def test_smtp_pool_limits_concurrency(smtp_server):  # type: ignore
+    """Test that concurrent emails never use more connections than allowed."""
+
+    controller, handler = smtp_server
+    handler.delay = 0.05
+    pool = _pool(controller, pool_size=2, max_concurrency=2)
+    await asyncio.gather(
+        *(
+            pool.send(_message(i), "noreply@example.com", [f"user{i}@example.com"])
+            for i in range(10)
+        )
+    )
+
+    await pool.close()
+    assert sorted(e.rcpt_tos[0] for e in handler.messages) == sorted(
+        f"user{i}@example.com" for i in range(10)
+    )
+    assert pool.connections_opened == 2
+
+
+async def test_smtp_pool_replaces_lost_connection(smtp_server):  # type: ignore
+    """Test that a closed connection is replaced instead of reused."""
+
+    controller, handler = smtp_server
+    pool = _pool(controller)
+    await pool.send(_message(0), "noreply@example.com", ["user0@example.com"])
+
+    # The connection is closed before it goes back to the pool.
+    async with pool.connection() as client:
+        await client.quit()
+
+    await pool.send(_message(1), "noreply@example.com", ["user1@example.com"])
+    await pool.close()
+    assert len(handler.messages) == 2
+    assert pool.connections_opened == 2
+
+
+@pytest.fixture
+def outbox(monkeypatch: pytest.MonkeyPatch) -> Generator[Session, None, None]:
+    """Queue emails into the outbox instead of logging them."""
+
+    monkeypatch.setattr(app_config.mailing, "enabled", True)
+    monkeypatch.setattr(app_config.mailing, "from_address", "noreply@example.com")
+    monkeypatch.setattr(app_config.mailing, "digest_window", 60.0)
+    with next(get_db_session()) as session:
+        session.exec(delete(MailOutboxEntry))  # type: ignore
+        session.commit()
+        yield session
+
+
+async def test_outbox_sends_and_retries(smtp_server, outbox):  # type: ignore
+    """Test that queued emails are sent, and retried with a backoff on failure."""
+
+    controller, handler = smtp_server
+    await send_mail("user0@example.com", "Hello", "Hello there")
+
+    # The SMTP server is not reachable, so the email is kept for a retry.
+    unreachable = SMTPConnectionPool("127.0.0.1", _free_port(), starttls=False)
+    report = await process_mail_outbox(
+        outbox, unreachable, DomainRateLimiter(30), max_attempts=2, retry_backoff=30
+    )
+    assert (report.sent, report.retried) == (0, 1)
+    entry = outbox.exec(select(MailOutboxEntry)).one()
+    assert entry.attempts == 1 and entry.lastError
+    assert entry.nextAttemptAt.replace(tzinfo=timezone.utc) > datetime.now(
+        timezone.utc
+    ) + timedelta(seconds=25)
+
+    # The email is not due yet, so nothing is sent.
+    pool = _pool(controller)
+    report = await process_mail_outbox(
+        outbox, pool, DomainRateLimiter(30), max_attempts=2, retry_backoff=30
+    )
+    assert report.sent == 0
+
+    entry.nextAttemptAt = datetime.now(timezone.utc)
+    outbox.add(entry)
+    outbox.commit()
+    report = await process_mail_outbox(
+        outbox, pool, DomainRateLimiter(30), max_attempts=2, retry_backoff=30
+    )
+    await pool.close()
+    assert report.sent == 1
+    assert handler.messages[0].rcpt_tos == ["user0@example.com"]
+    assert not outbox.exec(select(MailOutboxEntry)).all()
+
+
+async def test_outbox_gives_up_after_max_attempts(outbox):  # type: ignore
+    """Test that an email is marked as failed once it runs out of attempts."""
+
+    await send_mail("user0@example.com", "Hello", "Hello there")
+    unreachable = SMTPConnectionPool("127.0.0.1", _free_port(), starttls=False)
+    report = await process_mail_outbox(
+        outbox, unreachable, DomainRateLimiter(30), max_attempts=1, retry_backoff=30
+    )
+    assert report.failed == 1
+    assert outbox.exec(select(MailOutboxEntry)).one().failed
+
+
+async def test_outbox_rate_limits_domains(smtp_server, outbox):  # type: ignore
+    """Test that emails over a domain's rate limit are deferred."""
+
+    controller, handler = smtp_server
+    for i in range(3):
+        await send_mail(f"user{i}@example.com", f"Test {i}", "Hello")
+
+    await send_mail("user@example.org", "Test", "Hello")
+    pool = _pool(controller)
+    report = await process_mail_outbox(
+        outbox, pool, DomainRateLimiter(2), max_attempts=5, retry_backoff=30
+    )
+    await pool.close()
+    assert (report.sent, report.deferred) == (3, 1)
+    assert sorted(e.rcpt_tos[0] for e in handler.messages) == [
+        "user0@example.com",
+        "user1@example.com",
+        "user@example.org",
+    ]
+
+
+async def test_outbox_combines_digests(smtp_server, outbox):  # type: ignore
+    """Test that a recipient's notification emails are sent as one digest."""
+
+    controller, handler = smtp_server
+    for i in range(3):
+        await send_mail("user0@example.com", f"Report {i}", f"Status {i}", digest=True)
+
+    pool = _pool(controller)
+    limiter = DomainRateLimiter(30)
+    report = await process_mail_outbox(
+        outbox, pool, limiter, max_attempts=5, retry_backoff=30
+    )
+    assert report.sent == 0  # The digest window has not passed yet.
+
+    first = outbox.exec(select(MailOutboxEntry)).first()
+    assert first is not None
+    first.nextAttemptAt = datetime.now(timezone.utc)
+    outbox.add(first)
+    outbox.commit()
+    report = await process_mail_outbox(
+        outbox, pool, limiter, max_attempts=5, retry_backoff=30
+    )
+    await pool.close()
+    assert report.sent == 3
+    assert len(handler.messages) == 1
+    digest = message_from_bytes(handler.messages[0].content)
+    assert "3 new notifications" in digest["Subject"]
+    text = next(p for p in digest.walk() if p.get_content_type() == "text/plain")
+    content = text.get_payload(decode=True).decode()  # type: ignore
+    assert all(f"Report {i}\n\nStatus {i}" in content for i in range(3))
+
+
+async def test_outbox_skips_emails_claimed_by_other_workers(smtp_server, outbox):  # type: ignore
+    """Test that an email claimed by another worker waits for the claim to expire."""
+
+    controller, handler = smtp_server
+    await send_mail("user0@example.com", "Hello", "Hello there")
+    entry = outbox.exec(select(MailOutboxEntry)).one()
+    entry.claimedBy = "other-worker"
+    entry.lockedUntil = datetime.now(timezone.utc) + timedelta(minutes=5)
+    outbox.add(entry)
+    outbox.commit()
+
+    pool = _pool(controller)
+    report = await process_mail_outbox(
+        outbox, pool, DomainRateLimiter(30), max_attempts=2, retry_backoff=30
+    )
+    assert report.sent == 0
+    assert not handler.messages
+
+    # The other worker stopped without releasing its claim.
+    entry.lockedUntil = datetime.now(timezone.utc) - timedelta(seconds=1)
+    outbox.add(entry)
+    outbox.commit()
+    report = await process_mail_outbox(
+        outbox, pool, DomainRateLimiter(30), max_attempts=2, retry_backoff=30
+    )
+    await pool.close()
+    assert report.sent == 1
+    assert len(handler.messages) == 1
@@ -0,0 +1,125 @@
+import json
+import logging
+import queue
+import sys
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.exc import OperationalError
+from sqlmodel import text
+
+from centralserver import app
+from centralserver.internals import request_middleware
+from centralserver.internals.adapters.object_store import run_io
+from centralserver.internals.config_handler import Logging
+from centralserver.internals.db_handler import get_db_session
+from centralserver.internals.logger import JSONFormatter, LogQueueHandler
+from centralserver.internals.request_context import (
+    RequestContextFilter,
+    RequestStats,
+    current_request,
+)
+
+client = TestClient(app)
+
+
+def test_request_id_header():
+    """Test that every response carries a request ID."""
+
+    response = client.get("/api/v1/healthcheck")
+    assert len(response.headers["X-Request-ID"]) == 32
+
+    response = client.get("/api/v1/healthcheck", headers={"X-Request-ID": "abc-123"})
+    assert response.headers["X-Request-ID"] == "abc-123"
+
+    # Invalid IDs from the client are replaced.
+    response = client.get("/api/v1/healthcheck", headers={"X-Request-ID": "a b\n"})
+    assert response.headers["X-Request-ID"] != "a b\n"
+
+
+def test_request_stats_count_queries():
+    """Test that database queries are counted for the current request."""
+
+    stats = RequestStats("test")
+    token = current_request.set(stats)
+    try:
+        with next(get_db_session()) as session:
+            session.exec(text("SELECT 1"))  # type: ignore
+            session.exec(text("SELECT 2"))  # type: ignore
+            # Failed queries are counted too, and do not leave a timer behind.
+            with pytest.raises(OperationalError):
+                session.exec(text("SELECT * FROM missing_table"))  # type: ignore
+
+            assert not session.connection().info.get("query_started")
+
+    finally:
+        current_request.reset(token)
+
+    assert stats.db_queries == 3
+    assert stats.db_time > 0
+
+
+def test_request_lines_logged_without_debug():
+    """Test that the request lines are logged at the configured level."""
+
+    assert request_middleware.logger.level == logging.INFO
+    with pytest.raises(ValueError):
+        Logging(request_log_level="VERBOSE")
+
+
+def test_json_formatter_adds_request_fields():
+    """Test that JSON log lines carry the ID of the current request."""
+
+    record = logging.LogRecord(
+        "centralserver.test", logging.INFO, __file__, 1, "Hello %s", ("world",), None
+    )
+    token = current_request.set(RequestStats("abc-123", db_queries=3))
+    try:
+        RequestContextFilter().filter(record)
+
+    finally:
+        current_request.reset(token)
+
+    line = json.loads(JSONFormatter().format(record))
+    assert line["message"] == "Hello world"
+    assert line["level"] == "INFO"
+    assert line["request_id"] == "abc-123"
+    assert line["db_queries"] == 3
+
+
+def test_queued_record_keeps_exception():
+    """Test that records passed through the log queue keep their traceback."""
+
+    try:
+        raise ValueError("Broken")
+
+    except ValueError:
+        record = logging.LogRecord(
+            "centralserver.test",
+            logging.ERROR,
+            __file__,
+            1,
+            "Failed %s",
+            ("job",),
+            sys.exc_info(),
+        )
+
+    prepared = LogQueueHandler(queue.SimpleQueue()).prepare(record)
+    line = json.loads(JSONFormatter().format(prepared))
+    assert line["message"] == "Failed job"
+    assert "ValueError: Broken" in line["exception"]
+    assert "ValueError: Broken" in logging.Formatter().format(prepared)
+
+
+async def test_run_io_keeps_request_context():
+    """Test that blocking I/O runs with the ID of the current request."""
+
+    token = current_request.set(RequestStats("abc-123"))
+    try:
+        stats = await run_io(current_request.get)
+
+    finally:
+        current_request.reset(token)
+
+    assert stats is not None
+    assert stats.request_id == "abc-123"
@@ -1,7 +1,9 @@
+from io import BytesIO
 from typing import Any
 
 from fastapi.testclient import TestClient
 from httpx import Response
+from PIL import Image
 
 from centralserver import app, startup
 from centralserver.info import Database
@@ -991,6 +993,78 @@ def test_get_user_avatar():
         headers=headers,
     )
     assert response.status_code == 200
+    assert response.headers["Accept-Ranges"] == "bytes"
+    size = int(response.headers["Content-Length"])
+    assert size == len(response.content)
+
+    response = client.get(
+        f"/api/v1/users/avatar?fn={user_info["avatarUrn"]}",
+        headers={**headers, "Range": "bytes=10-19"},
+    )
+    assert response.status_code == 206
+    assert response.headers["Content-Range"] == f"bytes 10-19/{size}"
+    assert len(response.content) == 10
+
+
+def test_get_user_avatar_conditional():
+    login = _request_token(Database.default_user, Database.default_password)
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+    user_info = client.get(
+        "/api/v1/users/me",
+        headers=headers,
+    ).json()[0]
+
+    # The name of the avatar changes with its content.
+    assert user_info["avatarUrn"].startswith(f"{user_info['id']}-")
+
+    response = client.get(
+        f"/api/v1/users/avatar?fn={user_info["avatarUrn"]}",
+        headers=headers,
+    )
+    assert response.status_code == 200
+    assert "immutable" in response.headers["Cache-Control"]
+    etag = response.headers["ETag"]
+    assert etag == f'"{user_info["avatarUrn"]}"'
+
+    response = client.get(
+        f"/api/v1/users/avatar?fn={user_info["avatarUrn"]}",
+        headers={**headers, "If-None-Match": f'"other", W/{etag}'},
+    )
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    assert response.content == b""
+
+
+def test_get_user_avatar_derivative():
+    login = _request_token(Database.default_user, Database.default_password)
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+    user_info = client.get(
+        "/api/v1/users/me",
+        headers=headers,
+    ).json()[0]
+
+    response = client.get(
+        f"/api/v1/users/avatar?fn={user_info["avatarUrn"]}&size=64",
+        headers={**headers, "Accept": "image/webp,image/*"},
+    )
+    assert response.status_code == 200
+    assert response.headers["Content-Type"] == "image/webp"
+    image = Image.open(BytesIO(response.content))
+    assert image.format == "WEBP"
+    assert max(image.size) == 64
+
+    response = client.get(
+        f"/api/v1/users/avatar?fn={user_info["avatarUrn"]}&size=64",
+        headers=headers,
+    )
+    assert response.status_code == 200
+    assert Image.open(BytesIO(response.content)).format != "WEBP"
+
+    response = client.get(
+        f"/api/v1/users/avatar?fn={user_info["avatarUrn"]}&size=65",
+        headers=headers,
+    )
+    assert response.status_code == 400
 
 
 def test_get_user_avatar_no_current():
@@ -0,0 +1,194 @@
+import hashlib
+from io import BytesIO
+from typing import AsyncIterator
+
+import pytest
+from sqlmodel import select
+
+from centralserver.internals import attachment_handler
+from centralserver.internals.adapters.object_store import (
+    BucketNames,
+    get_object_store,
+)
+from centralserver.internals.attachment_handler import (
+    delete_report_attachment,
+    get_report_attachment,
+    get_report_attachment_metadata,
+    upload_report_attachment,
+)
+from centralserver.internals.db_handler import get_db_session
+from centralserver.internals.models.reports.attachments import (
+    AttachmentBlob,
+    ReportAttachment,
+)
+
+
+class FakeUploadFile:
+    """A stand-in for an uploaded file."""
+
+    def __init__(self, content: bytes, filename: str) -> None:
+        self.content = BytesIO(content)
+        self.filename = filename
+        self.content_type = "application/pdf"
+
+    async def read(self, size: int = -1) -> bytes:
+        return self.content.read(size)
+
+    async def seek(self, offset: int) -> None:
+        self.content.seek(offset)
+
+
+async def test_duplicate_attachments_share_storage():
+    """Test that identical attachments are stored once and reference counted."""
+
+    content = b"%PDF-1.4 pytest supplier invoice"
+    digest = hashlib.sha256(content).hexdigest()
+    store = await get_object_store()
+
+    with next(get_db_session()) as session:
+        first = await upload_report_attachment(
+            FakeUploadFile(content, "invoice.pdf"), session  # type: ignore
+        )
+        second = await upload_report_attachment(
+            FakeUploadFile(content, "invoice-again.pdf"), session  # type: ignore
+        )
+        assert first.file_urn != second.file_urn
+        assert first.sha256 == second.sha256 == digest
+        assert await store.stat(BucketNames.ATTACHMENTS, digest) == len(content)
+
+        # Every upload keeps its own metadata.
+        metadata = await get_report_attachment_metadata(second.file_urn, session)
+        assert metadata["filename"] == "invoice-again.pdf"
+        blob = session.exec(
+            select(AttachmentBlob).where(AttachmentBlob.sha256 == digest)
+        ).one()
+        assert blob.reference_count == 2
+
+        # The file is kept until its last reference is deleted.
+        await delete_report_attachment(first.file_urn, session)
+        assert await store.stat(BucketNames.ATTACHMENTS, digest) == len(content)
+
+        await delete_report_attachment(second.file_urn, session)
+        assert await store.stat(BucketNames.ATTACHMENTS, digest) is None
+        assert session.get(AttachmentBlob, digest) is None
+
+
+async def test_concurrent_duplicate_attachment_is_counted(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    """Test that an upload racing another upload of the same file is counted."""
+
+    content = b"%PDF-1.4 pytest concurrent receipt"
+    digest = hashlib.sha256(content).hexdigest()
+
+    with next(get_db_session()) as session:
+        first = await upload_report_attachment(
+            FakeUploadFile(content, "receipt.pdf"), session  # type: ignore
+        )
+
+        # The second upload does not see the file's record until it inserts it.
+        with monkeypatch.context() as m:
+            m.setattr(session, "get", lambda *_, **__: None)
+            second = await upload_report_attachment(
+                FakeUploadFile(content, "receipt-copy.pdf"), session  # type: ignore
+            )
+
+        assert second.sha256 == digest
+        blob = session.get(AttachmentBlob, digest)
+        assert blob is not None and blob.reference_count == 2
+
+        await delete_report_attachment(first.file_urn, session)
+        await delete_report_attachment(second.file_urn, session)
+        assert session.get(AttachmentBlob, digest) is None
+
+
+async def test_attachment_racing_file_deletion_is_stored_again(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    """Test that an upload racing the deletion of its file stores the file again."""
+
+    content = b"%PDF-1.4 pytest deleted receipt"
+    digest = hashlib.sha256(content).hexdigest()
+    store = await get_object_store()
+
+    # A leftover file without a record is not trusted, but overwritten.
+    async def leftover() -> AsyncIterator[bytes]:
+        yield b"partial"
+
+    await store.put_stream(BucketNames.ATTACHMENTS, digest, leftover())
+
+    with next(get_db_session()) as session:
+        first = await upload_report_attachment(
+            FakeUploadFile(content, "receipt.pdf"), session  # type: ignore
+        )
+        assert await store.stat(BucketNames.ATTACHMENTS, digest) == len(content)
+
+        # The last attachment sharing the file is deleted after the second
+        # upload has read the file's record, but before it counts itself.
+        add_blob_reference = attachment_handler._add_blob_reference
+
+        def racing_add_blob_reference(*args, **kwargs) -> bool:  # type: ignore
+            monkeypatch.setattr(
+                attachment_handler, "_add_blob_reference", add_blob_reference
+            )
+            with next(get_db_session()) as other:
+                other.delete(
+                    other.exec(
+                        select(ReportAttachment).where(
+                            ReportAttachment.file_urn == first.file_urn
+                        )
+                    ).one()
+                )
+                other.delete(other.get(AttachmentBlob, digest))
+                other.commit()
+
+            return add_blob_reference(*args, **kwargs)
+
+        monkeypatch.setattr(
+            attachment_handler, "_add_blob_reference", racing_add_blob_reference
+        )
+        second = await upload_report_attachment(
+            FakeUploadFile(content, "receipt-copy.pdf"), session  # type: ignore
+        )
+
+        blob = session.get(AttachmentBlob, digest)
+        assert blob is not None and blob.reference_count == 1
+        assert await store.stat(BucketNames.ATTACHMENTS, digest) == len(content)
+        await delete_report_attachment(second.file_urn, session)
+
+
+async def test_attachment_without_blob_uses_its_urn():
+    """Test that attachments uploaded before files were shared stay readable."""
+
+    content = b"%PDF-1.4 pytest legacy attachment"
+    file_urn = "pytest-legacy-attachment"
+    store = await get_object_store()
+
+    async def chunks() -> AsyncIterator[bytes]:
+        yield content
+
+    await store.put_stream(BucketNames.ATTACHMENTS, file_urn, chunks())
+    with next(get_db_session()) as session:
+        session.add(
+            ReportAttachment(
+                filename="legacy.pdf",
+                file_urn=file_urn,
+                file_type="application/pdf",
+                file_size=len(content),
+            )
+        )
+        session.commit()
+
+        response = await get_report_attachment(file_urn, session)
+        assert response.status_code == 200
+        body = b"".join([chunk async for chunk in response.body_iterator])  # type: ignore
+        assert body == content
+
+        await delete_report_attachment(file_urn, session)
+        assert await store.stat(BucketNames.ATTACHMENTS, file_urn) is None
+        assert (
+            session.exec(
+                select(ReportAttachment).where(ReportAttachment.file_urn == file_urn)
+            ).first()
+            is None
+        )
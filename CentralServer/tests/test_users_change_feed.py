@@ -0,0 +1,230 @@
+import json
+from typing import Any
+
+from fastapi.testclient import TestClient
+from httpx import Response
+from sqlmodel import select
+
+from centralserver import app
+from centralserver.internals.change_handler import (
+    apply_change_retention,
+    get_change_cursor,
+    get_changes,
+    get_settled_change_cursor,
+)
+from centralserver.internals.db_handler import get_db_session
+from centralserver.internals.models.change_log import (
+    ChangeAction,
+    ChangeEntity,
+    ChangeLogEntry,
+)
+
+client = TestClient(app)
+
+
+def _request_token(username: str, password: str) -> Response:
+    """Log in a user and return the access token."""
+
+    creds: dict[str, str] = {
+        "username": username,
+        "password": password,
+    }
+
+    return client.post("/api/v1/auth/login", data=creds)
+
+
+def test_change_feed_head_cursor():
+    """Test getting the head cursor without any changes."""
+
+    login = _request_token("testuser3", "Password123")
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+    response = client.get("/api/v1/changes", headers=headers)
+    assert response.status_code == 200
+    resp_data: dict[str, Any] = response.json()
+    assert resp_data["cursor"] > 0
+    assert resp_data["more"] is False
+    assert resp_data["changes"] == []
+
+
+def test_change_feed_profile_update():
+    """Test that a profile update shows up in the change feed."""
+
+    login = _request_token("testuser3", "Password123")
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+    myself = client.get("/api/v1/users/me", headers=headers).json()[0]
+    cursor = client.get("/api/v1/changes", headers=headers).json()["cursor"]
+
+    response = client.patch(
+        "/api/v1/users",
+        json={"id": myself["id"], "position": "Change Feed Tester"},
+        headers=headers,
+    )
+    assert response.status_code == 200
+
+    response = client.get("/api/v1/changes", params={"since": cursor}, headers=headers)
+    assert response.status_code == 200
+    resp_data: dict[str, Any] = response.json()
+    assert resp_data["cursor"] > cursor
+    assert [
+        (change["entity"], change["action"], change["ownerId"])
+        for change in resp_data["changes"]
+    ] == [("user", "updated", myself["id"])]
+    assert "position" in resp_data["changes"][0]["changedFields"]
+
+    # Polling again from the new cursor yields nothing.
+    response = client.get(
+        "/api/v1/changes", params={"since": resp_data["cursor"]}, headers=headers
+    )
+    assert response.status_code == 200
+    assert response.json()["changes"] == []
+
+
+def test_change_feed_hides_other_users():
+    """Test that users without global access do not see other users' changes."""
+
+    admin_login = _request_token("testuser3", "Password123")
+    admin_headers = {"Authorization": f"Bearer {admin_login.json()['access_token']}"}
+    login = _request_token("testuser4", "Password123")
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+    cursor = client.get("/api/v1/changes", headers=headers).json()["cursor"]
+
+    admin = client.get("/api/v1/users/me", headers=admin_headers).json()[0]
+    response = client.patch(
+        "/api/v1/users",
+        json={"id": admin["id"], "position": "Hidden Change"},
+        headers=admin_headers,
+    )
+    assert response.status_code == 200
+
+    response = client.get("/api/v1/changes", params={"since": cursor}, headers=headers)
+    assert response.status_code == 200
+    assert response.json()["changes"] == []
+
+
+def test_change_feed_announcement():
+    """Test that an announcement shows up in the recipient's change feed."""
+
+    admin_login = _request_token("testuser3", "Password123")
+    admin_headers = {"Authorization": f"Bearer {admin_login.json()['access_token']}"}
+    login = _request_token("testuser4", "Password123")
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+    recipient = client.get("/api/v1/users/me", headers=headers).json()[0]
+    cursor = client.get("/api/v1/changes", headers=headers).json()["cursor"]
+
+    response = client.post(
+        "/api/v1/notifications/announce",
+        params={
+            "title": "Change Feed Announcement",
+            "content": "Sync me.",
+            "recipient_types": "users",
+        },
+        json=[recipient["id"]],
+        headers=admin_headers,
+    )
+    assert response.status_code == 200
+    announcement = next(
+        n
+        for n in client.get("/api/v1/notifications/me", headers=headers).json()
+        if n["title"] == "Change Feed Announcement"
+    )
+
+    response = client.get("/api/v1/changes", params={"since": cursor}, headers=headers)
+    assert response.status_code == 200
+    assert [
+        (change["entity"], change["action"], change["resource"], change["key"])
+        for change in response.json()["changes"]
+    ] == [
+        (
+            "notification",
+            "created",
+            "announcementReceipts",
+            json.dumps([recipient["id"], announcement["id"]]),
+        )
+    ]
+
+    # Archiving the recipient's copy is synced to their other sessions.
+    cursor = response.json()["cursor"]
+    response = client.post(
+        "/api/v1/notifications/",
+        json={"notification_id": announcement["id"]},
+        headers=headers,
+    )
+    assert response.status_code == 200
+    response = client.get("/api/v1/changes", params={"since": cursor}, headers=headers)
+    assert [
+        (change["action"], change["ownerId"], json.loads(change["changedFields"]))
+        for change in response.json()["changes"]
+    ] == [("updated", recipient["id"], ["archived", "archivedAt"])]
+
+
+async def test_change_feed_holds_cursor_behind_gap():
+    """Test that the cursor is not moved past a change that may be uncommitted."""
+
+    with next(get_db_session()) as session:
+        head = await get_change_cursor(session)
+        # A recent change after a missing ID, as if the transaction that got
+        # the missing ID was still running.
+        late = ChangeLogEntry(
+            id=head + 2,
+            entity=ChangeEntity.USER,
+            action=ChangeAction.UPDATED,
+            resource="users",
+            key='"pytest"',
+        )
+        session.add(late)
+        session.commit()
+
+        page = await get_changes(session, head, "pytest", None)
+        assert page.cursor == head
+        assert page.changes == []
+        assert await get_settled_change_cursor(session) == head
+
+        session.add(
+            ChangeLogEntry(
+                id=head + 1,
+                entity=ChangeEntity.USER,
+                action=ChangeAction.UPDATED,
+                resource="users",
+                key='"pytest"',
+            )
+        )
+        session.commit()
+
+        page = await get_changes(session, head, "pytest", None)
+        assert page.cursor == head + 2
+        assert await get_settled_change_cursor(session) == head + 2
+
+
+async def test_change_feed_retention():
+    """Test that old changes are deleted and stale cursors must resync."""
+
+    with next(get_db_session()) as session:
+        head = await get_change_cursor(session)
+        recent = ChangeLogEntry(
+            id=head + 1,
+            entity=ChangeEntity.USER,
+            action=ChangeAction.UPDATED,
+            resource="users",
+            key='"pytest"',
+        )
+        session.add(recent)
+        session.commit()
+
+        # Changes within the retention period are kept.
+        report = await apply_change_retention(session, 1, 2)
+        assert report.deleted == 0
+
+        # The latest change is always kept so that its ID is never reused.
+        report = await apply_change_retention(session, 0, 2)
+        assert report.deleted > 0
+        assert await get_change_cursor(session) == head + 1
+        assert len(session.exec(select(ChangeLogEntry)).all()) == 1
+
+        page = await get_changes(session, 0, "pytest", None)
+        assert page.resync is True
+        assert page.cursor == head + 1
+        assert page.changes == []
+
+        page = await get_changes(session, head, "pytest", None)
+        assert page.resync is False
@@ -0,0 +1,334 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+import pytest
+from fastapi.testclient import TestClient
+from httpx import Response
+from sqlalchemy import false
+
+from centralserver import app
+from centralserver.internals import notification_handler
+from centralserver.internals.db_handler import get_db_session
+from centralserver.internals.models.notification import (
+    Notification,
+    NotificationCounter,
+)
+from centralserver.internals.notification_handler import (
+    apply_notification_retention,
+    push_notification,
+)
+
+client = TestClient(app)
+
+
+def _request_token(username: str, password: str) -> Response:
+    """Log in a user and return the access token."""
+
+    creds: dict[str, str] = {
+        "username": username,
+        "password": password,
+    }
+
+    return client.post("/api/v1/auth/login", data=creds)
+
+
+def _headers(username: str) -> dict[str, str]:
+    """Get the authorization headers of a test user."""
+
+    login = _request_token(username, "Password123")
+    return {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+
+def test_announce_to_role():
+    """Test that an announcement creates one notification per recipient."""
+
+    headers = _headers("testuser3")
+    recipient_headers = _headers("testuser4")
+    recipient = client.get("/api/v1/users/me", headers=recipient_headers).json()[0]
+    before = client.get(
+        "/api/v1/notifications/quantity", headers=recipient_headers
+    ).json()
+
+    response = client.post(
+        "/api/v1/notifications/announce",
+        params={
+            "title": "Role Announcement",
+            "content": "Hello, principals.",
+            "recipient_types": "role",
+            "recipient_role_id": recipient["roleId"],
+            "important": True,
+        },
+        headers=headers,
+    )
+    assert response.status_code == 200
+    assert response.json()["message"].startswith("Notification announced to ")
+
+    assert (
+        client.get("/api/v1/notifications/quantity", headers=recipient_headers).json()
+        == before + 1
+    )
+    notifications: list[dict[str, Any]] = client.get(
+        "/api/v1/notifications/me",
+        params={"important_only": True},
+        headers=recipient_headers,
+    ).json()
+    announcement = next(n for n in notifications if n["title"] == "Role Announcement")
+    assert announcement["ownerId"] == recipient["id"]
+    assert announcement["content"] == "Hello, principals."
+    assert announcement["archived"] is False
+
+
+def test_announce_to_users():
+    """Test announcing to specific users, ignoring unknown IDs."""
+
+    headers = _headers("testuser3")
+    recipient = client.get("/api/v1/users/me", headers=_headers("testuser1")).json()[0]
+
+    response = client.post(
+        "/api/v1/notifications/announce",
+        params={
+            "title": "Direct Announcement",
+            "content": "Hello.",
+            "recipient_types": "users",
+        },
+        json=[recipient["id"], "nonexistent-user"],
+        headers=headers,
+    )
+    assert response.status_code == 200
+    assert response.json() == {
+        "message": "Notification announced to 1 users successfully."
+    }
+
+    response = client.post(
+        "/api/v1/notifications/announce",
+        params={"title": "x", "content": "x", "recipient_types": "users"},
+        headers=headers,
+    )
+    assert response.status_code == 400
+
+
+def test_archive_announcement():
+    """Test that archiving an announcement only affects the recipient's copy."""
+
+    headers = _headers("testuser3")
+    first_headers, second_headers = _headers("testuser1"), _headers("testuser2")
+    recipient_ids = [
+        client.get("/api/v1/users/me", headers=h).json()[0]["id"]
+        for h in (first_headers, second_headers)
+    ]
+    response = client.post(
+        "/api/v1/notifications/announce",
+        params={
+            "title": "Shared Announcement",
+            "content": "Stored once.",
+            "recipient_types": "users",
+        },
+        json=recipient_ids,
+        headers=headers,
+    )
+    assert response.status_code == 200
+
+    notifications: list[dict[str, Any]] = client.get(
+        "/api/v1/notifications/me", headers=first_headers
+    ).json()
+    announcement = next(n for n in notifications if n["title"] == "Shared Announcement")
+    before = client.get("/api/v1/notifications/quantity", headers=first_headers)
+
+    response = client.post(
+        "/api/v1/notifications/",
+        json={"notification_id": announcement["id"]},
+        headers=first_headers,
+    )
+    assert response.status_code == 200
+    assert response.json()["archived"] is True
+    assert (
+        client.get("/api/v1/notifications/quantity", headers=first_headers).json()
+        == before.json() - 1
+    )
+    assert announcement["id"] not in [
+        n["id"]
+        for n in client.get(
+            "/api/v1/notifications/me",
+            params={"unarchived_only": True},
+            headers=first_headers,
+        ).json()
+    ]
+
+    # The other recipient's copy is untouched.
+    response = client.get(
+        "/api/v1/notifications/",
+        params={"notification_id": announcement["id"]},
+        headers=second_headers,
+    )
+    assert response.status_code == 200
+    assert response.json()["archived"] is False
+    assert response.json()["ownerId"] == recipient_ids[1]
+
+
+def test_notification_counters():
+    """Test that the counters follow announcements and archiving."""
+
+    headers = _headers("testuser3")
+    recipient_headers = _headers("testuser2")
+    recipient = client.get("/api/v1/users/me", headers=recipient_headers).json()[0]
+    before: dict[str, Any] = client.get(
+        "/api/v1/notifications/counters", headers=recipient_headers
+    ).json()
+    unread = client.get(
+        "/api/v1/notifications/me",
+        params={"unarchived_only": True},
+        headers=recipient_headers,
+    ).json()
+    assert before["unread"] == len(unread)
+    assert before["important"] == len([n for n in unread if n["important"]])
+
+    response = client.post(
+        "/api/v1/notifications/announce",
+        params={
+            "title": "Counted Announcement",
+            "content": "Count me.",
+            "recipient_types": "users",
+            "important": True,
+        },
+        json=[recipient["id"]],
+        headers=headers,
+    )
+    assert response.status_code == 200
+    after: dict[str, Any] = client.get(
+        "/api/v1/notifications/counters", headers=recipient_headers
+    ).json()
+    assert after["unread"] == before["unread"] + 1
+    assert after["important"] == before["important"] + 1
+    assert after["archived"] == before["archived"]
+
+    announcement = next(
+        n
+        for n in client.get(
+            "/api/v1/notifications/me", headers=recipient_headers
+        ).json()
+        if n["title"] == "Counted Announcement"
+    )
+    for _ in range(2):  # Archiving twice only counts once.
+        client.post(
+            "/api/v1/notifications/",
+            json={"notification_id": announcement["id"]},
+            headers=recipient_headers,
+        )
+
+    archived: dict[str, Any] = client.get(
+        "/api/v1/notifications/counters", headers=recipient_headers
+    ).json()
+    assert archived["unread"] == before["unread"]
+    assert archived["important"] == before["important"]
+    assert archived["archived"] == before["archived"] + 1
+    assert (
+        client.get(
+            "/api/v1/notifications/quantity",
+            params={"show_archived": True},
+            headers=recipient_headers,
+        ).json()
+        == archived["unread"] + archived["archived"]
+    )
+
+
+async def test_notification_counter_created_concurrently(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    """Test that a counter created by another transaction does not fail a write."""
+
+    headers = _headers("testuser2")
+    owner_id = client.get("/api/v1/users/me", headers=headers).json()[0]["id"]
+    before = client.get("/api/v1/notifications/counters", headers=headers).json()
+
+    # The counter is not seen by the first check, as if another transaction
+    # created it after the check ran.
+    real_exists = notification_handler.exists
+    calls: list[None] = []
+
+    def racing_exists():  # type: ignore
+        calls.append(None)
+        return real_exists().where(false()) if len(calls) == 1 else real_exists()
+
+    monkeypatch.setattr(notification_handler, "exists", racing_exists)
+    with next(get_db_session()) as session:
+        await push_notification(owner_id, "Raced", "Counted once.", session)
+
+    after = client.get("/api/v1/notifications/counters", headers=headers).json()
+    assert after["unread"] == before["unread"] + 1
+
+
+async def test_notification_retention():
+    """Test archiving and deleting old notifications in batches."""
+
+    headers = _headers("testuser1")
+    owner_id = client.get("/api/v1/users/me", headers=headers).json()[0]["id"]
+    cursor = client.get("/api/v1/changes", headers=headers).json()["cursor"]
+
+    now = datetime.now(timezone.utc)
+    with next(get_db_session()) as session:
+        # The age of the notification, and how many days ago it was archived.
+        for age, archived_days in (
+            (40, None),
+            (45, None),
+            (41, None),
+            (120, None),
+            (100, 100),
+            (200, 1),
+        ):
+            session.add(
+                Notification(
+                    ownerId=owner_id,
+                    title=f"Old Notification {age}",
+                    content="Old.",
+                    important=age == 45,
+                    archived=archived_days is not None,
+                    archivedAt=(
+                        None
+                        if archived_days is None
+                        else now - timedelta(days=archived_days)
+                    ),
+                    created=now - timedelta(days=age),
+                )
+            )
+
+        # The rows above bypass the counters, which are counted again.
+        counters = session.get(NotificationCounter, owner_id)
+        if counters is None:
+            counters = NotificationCounter(ownerId=owner_id)
+
+        counters.unread = counters.important = counters.archived = 0
+        session.add(counters)
+        session.commit()
+        report = await apply_notification_retention(session, 30, 90, batch_size=2)
+
+    assert report.archived == 4
+    assert report.deleted == 1
+    notifications: list[dict[str, Any]] = client.get(
+        "/api/v1/notifications/me", headers=headers
+    ).json()
+    titles = [n["title"] for n in notifications]
+    assert "Old Notification 100" not in titles
+    assert "Old Notification 40" in titles
+    # Archived notifications are deleted by the time since they were archived.
+    assert "Old Notification 120" in titles
+    assert "Old Notification 200" in titles
+
+    # The counters match the remaining rows.
+    unread = [n for n in notifications if not n["archived"]]
+    counters = client.get("/api/v1/notifications/counters", headers=headers).json()
+    assert counters["unread"] == len(unread)
+    assert counters["important"] == len([n for n in unread if n["important"]])
+    assert counters["archived"] == len(notifications) - len(unread)
+
+    # The archived and deleted notifications are synced through the change feed.
+    changes = client.get(
+        "/api/v1/changes", params={"since": cursor}, headers=headers
+    ).json()["changes"]
+    assert sorted(
+        change["action"]
+        for change in changes
+        if change["resource"] == "notifications" and change["action"] != "created"
+    ) == ["deleted", "updated", "updated", "updated", "updated"]
+
+    response = client.post("/api/v1/notifications/retention", headers=headers)
+    assert response.status_code == 403
@@ -0,0 +1,318 @@
+import asyncio
+import json
+from typing import Any
+
+from fastapi.testclient import TestClient
+from httpx import Response
+
+from centralserver import app
+from centralserver.internals.websocket_manager import (
+    DIVISION_REPORTS_TOPIC,
+    HEARTBEAT_WHEEL_SLOTS,
+    WebSocketConnectionManager,
+    report_topic,
+    school_topic,
+)
+
+client = TestClient(app)
+
+
+class FakeWebSocket:
+    """A stand-in for a WebSocket connection that records sent messages."""
+
+    def __init__(
+        self,
+        fail: bool = False,
+        delay: float = 0.0,
+        gate: asyncio.Event | None = None,
+    ):
+        self.fail = fail
+        self.delay = delay
+        self.gate = gate
+        self.sent: list[str] = []
+        self.close_code: int | None = None
+
+    async def accept(self) -> None:
+        pass
+
+    async def close(self, code: int = 1000, reason: str | None = None) -> None:
+        self.close_code = code
+
+    async def send_text(self, data: str) -> None:
+        if self.delay:
+            await asyncio.sleep(self.delay)
+
+        if self.gate is not None:
+            await self.gate.wait()
+
+        if self.fail:
+            raise RuntimeError("Connection lost")
+
+        self.sent.append(data)
+
+
+def _received(ws: FakeWebSocket) -> list[dict[str, Any]]:
+    """Get the messages received by a connection, unwrapping batch frames."""
+
+    messages: list[dict[str, Any]] = []
+    for frame in ws.sent:
+        message = json.loads(frame)
+        if message["type"] == "batch":
+            messages.extend(message["messages"])
+
+        else:
+            messages.append(message)
+
+    return messages
+
+
+def _request_token(username: str, password: str) -> Response:
+    """Log in a user and return the access token."""
+
+    creds: dict[str, str] = {
+        "username": username,
+        "password": password,
+    }
+
+    return client.post("/api/v1/auth/login", data=creds)
+
+
+async def test_publish_to_topics():
+    """Test that a message reaches each subscribed connection exactly once."""
+
+    manager = WebSocketConnectionManager()
+    school_ws, report_ws, both_ws, idle_ws = (FakeWebSocket() for _ in range(4))
+    for i, ws in enumerate((school_ws, report_ws, both_ws, idle_ws)):
+        assert await manager.connect(ws, f"user{i}")  # type: ignore
+
+    await manager.subscribe(school_ws, school_topic(1))  # type: ignore
+    await manager.subscribe(report_ws, report_topic(1, 2025, 1))  # type: ignore
+    await manager.subscribe(both_ws, school_topic(1))  # type: ignore
+    await manager.subscribe(both_ws, report_topic(1, 2025, 1))  # type: ignore
+    await manager.subscribe(idle_ws, school_topic(2))  # type: ignore
+
+    sent = await manager.publish(
+        (school_topic(1), report_topic(1, 2025, 1)), {"type": "report_updated"}
+    )
+    await manager.drain()
+    assert sent == 3
+    assert [len(ws.sent) for ws in (school_ws, report_ws, both_ws, idle_ws)] == [
+        1,
+        1,
+        1,
+        0,
+    ]
+    assert json.loads(both_ws.sent[0]) == {"type": "report_updated"}
+
+
+async def test_unsubscribe_and_disconnect_clean_topics():
+    """Test that topic subscriptions are removed with the connection."""
+
+    manager = WebSocketConnectionManager()
+    ws, failing_ws = FakeWebSocket(), FakeWebSocket(fail=True)
+    await manager.connect(ws, "user1")  # type: ignore
+    await manager.connect(failing_ws, "user2")  # type: ignore
+    await manager.subscribe(ws, school_topic(1))  # type: ignore
+    await manager.subscribe(ws, DIVISION_REPORTS_TOPIC)  # type: ignore
+    await manager.subscribe(failing_ws, DIVISION_REPORTS_TOPIC)  # type: ignore
+
+    await manager.unsubscribe(ws, school_topic(1))  # type: ignore
+    assert manager.get_topic_subscriber_count(school_topic(1)) == 0
+
+    # The failing connection is dropped from the topic after the send fails.
+    assert await manager.publish((DIVISION_REPORTS_TOPIC,), {"type": "ping"}) == 2
+    await manager.drain()
+    await asyncio.sleep(0)
+    assert manager.get_topic_subscriber_count(DIVISION_REPORTS_TOPIC) == 1
+
+    await manager.disconnect(ws)  # type: ignore
+    assert manager.topic_connections == {}
+    assert manager.get_total_connections() == 0
+
+
+async def test_broadcast_not_delayed_by_slow_connection():
+    """Test that a stalled connection does not hold up a broadcast to the others."""
+
+    manager = WebSocketConnectionManager(send_timeout=5.0, coalesce_window=0)
+    gate = asyncio.Event()
+    stalled_ws = FakeWebSocket(gate=gate)
+    await manager.connect(stalled_ws, "stalled")  # type: ignore
+    connections = [FakeWebSocket() for _ in range(100)]
+    for i, ws in enumerate(connections):
+        await manager.connect(ws, f"user{i}")  # type: ignore
+
+    assert await manager.broadcast_to_all({"type": "announcement"}) == 101
+    # Every other connection is served while the stalled one is still blocked.
+    for _ in range(100):
+        if all(ws.sent for ws in connections):
+            break
+
+        await asyncio.sleep(0)
+
+    assert all(ws.sent == ['{"type": "announcement"}'] for ws in connections)
+    assert stalled_ws.sent == []
+
+    gate.set()
+    await manager.drain()
+    assert stalled_ws.sent == ['{"type": "announcement"}']
+
+
+async def test_broadcast_drops_slow_connection():
+    """Test that a connection that does not accept a send in time is dropped."""
+
+    manager = WebSocketConnectionManager(send_timeout=0.05)
+    fast_ws, slow_ws = FakeWebSocket(), FakeWebSocket(delay=1.0)
+    await manager.connect(fast_ws, "user1")  # type: ignore
+    await manager.connect(slow_ws, "user2")  # type: ignore
+
+    assert await manager.broadcast_to_users(["user1", "user2"], {"type": "ping"}) == 2
+    await manager.drain()
+    await asyncio.sleep(0)
+    assert fast_ws.sent == ['{"type": "ping"}']
+    assert manager.get_user_connection_count("user2") == 0
+
+
+async def _fill_outbox(policy: str) -> tuple[WebSocketConnectionManager, FakeWebSocket]:
+    """Send five messages to a stalled connection with an outbox of two."""
+
+    manager = WebSocketConnectionManager(
+        send_timeout=5.0, queue_size=2, overflow_policy=policy
+    )
+    ws = FakeWebSocket(delay=0.2)
+    await manager.connect(ws, "user1")  # type: ignore
+    for i in range(5):
+        await manager.send_to_user("user1", {"seq": i})
+        await asyncio.sleep(0)  # Let the writer pick up the first message.
+
+    return manager, ws
+
+
+async def test_outbox_overflow_drop_oldest():
+    """Test that a full outbox discards its oldest queued message."""
+
+    manager, ws = await _fill_outbox("drop_oldest")
+    metrics = manager.get_queue_metrics()
+    assert metrics["queued_messages"] == 2
+    assert metrics["peak_queue_depth"] == 2
+    assert metrics["dropped_messages"] == 2
+
+    await manager.drain()
+    assert [m["seq"] for m in _received(ws)] == [0, 3, 4]
+
+
+async def test_outbox_overflow_drop_newest():
+    """Test that a full outbox rejects new messages."""
+
+    manager, ws = await _fill_outbox("drop_newest")
+    assert manager.get_queue_metrics()["dropped_messages"] == 2
+
+    await manager.drain()
+    assert [m["seq"] for m in _received(ws)] == [0, 1, 2]
+
+
+async def test_outbox_overflow_close():
+    """Test that a full outbox closes the connection."""
+
+    manager, ws = await _fill_outbox("close")
+    assert ws.close_code == 4002
+    assert manager.get_total_connections() == 0
+    assert manager.get_queue_metrics()["overflow_disconnects"] == 1
+
+
+async def test_burst_is_coalesced_into_batch_frame():
+    """Test that messages queued within the window are sent as one frame."""
+
+    manager = WebSocketConnectionManager(coalesce_window=0.05)
+    ws = FakeWebSocket()
+    await manager.connect(ws, "user1")  # type: ignore
+    for i in range(12):
+        await manager.send_to_user("user1", {"type": "notification", "seq": i})
+
+    await manager.drain()
+    assert len(ws.sent) == 1
+    assert json.loads(ws.sent[0])["type"] == "batch"
+    assert [m["seq"] for m in _received(ws)] == list(range(12))
+    assert manager.get_queue_metrics()["coalesced_messages"] == 12
+
+    # A message alone in its window is sent without the envelope.
+    await manager.send_to_user("user1", {"type": "notification", "seq": 12})
+    await manager.drain()
+    assert json.loads(ws.sent[1]) == {"type": "notification", "seq": 12}
+
+
+async def test_coalescing_can_be_disabled():
+    """Test that a window of zero sends every message in its own frame."""
+
+    manager = WebSocketConnectionManager(coalesce_window=0)
+    ws = FakeWebSocket()
+    await manager.connect(ws, "user1")  # type: ignore
+    for i in range(3):
+        await manager.send_to_user("user1", {"seq": i})
+
+    await manager.drain()
+    assert [json.loads(m) for m in ws.sent] == [{"seq": 0}, {"seq": 1}, {"seq": 2}]
+
+
+async def test_heartbeat_reaps_unresponsive_connections():
+    """Test that connections that miss too many pongs are reaped."""
+
+    manager = WebSocketConnectionManager(heartbeat_interval=1.0, max_missed_pongs=2)
+    alive_ws, dead_ws = FakeWebSocket(), FakeWebSocket()
+    await manager.connect(alive_ws, "user1")  # type: ignore
+    await manager.connect(dead_ws, "user2")  # type: ignore
+
+    async def turn_wheel() -> int:
+        """Advance the wheel by a full heartbeat interval."""
+
+        reaped = 0
+        for _ in range(HEARTBEAT_WHEEL_SLOTS):
+            reaped += await manager.heartbeat_tick()
+
+        await manager.drain()
+        return reaped
+
+    # Both connections are pinged once per interval; only one answers.
+    for expected_pings in (1, 2):
+        assert await turn_wheel() == 0
+        assert [json.loads(m)["type"] for m in dead_ws.sent] == [
+            "ping"
+        ] * expected_pings
+        assert len(alive_ws.sent) == expected_pings
+        manager.mark_alive(alive_ws)  # type: ignore
+
+    assert manager.get_heartbeat_metrics()["unresponsive_connections"] == 1
+    assert await turn_wheel() == 1
+    assert dead_ws.close_code == 4003
+    assert manager.get_user_connection_count("user2") == 0
+    assert manager.get_user_connection_count("user1") == 1
+
+    metrics = manager.get_heartbeat_metrics()
+    assert metrics["reaped_connections"] == 1
+    assert metrics["heartbeat_pings"] == 5
+    assert metrics["unresponsive_connections"] == 1  # Waiting on the last ping
+
+
+def test_websocket_subscribe_permissions():
+    """Test subscribing to topics through the WebSocket endpoint."""
+
+    admin_token = _request_token("testuser3", "Password123").json()["access_token"]
+    principal_token = _request_token("testuser4", "Password123").json()["access_token"]
+
+    with client.websocket_connect(
+        f"/api/v1/ws/user-updates?token={admin_token}"
+    ) as websocket:
+        assert websocket.receive_json()["type"] == "connection_established"
+        websocket.send_json({"type": "subscribe", "topic": DIVISION_REPORTS_TOPIC})
+        reply: dict[str, Any] = websocket.receive_json()
+        assert reply == {"type": "subscribed", "topic": DIVISION_REPORTS_TOPIC}
+
+    with client.websocket_connect(
+        f"/api/v1/ws/user-updates?token={principal_token}"
+    ) as websocket:
+        assert websocket.receive_json()["type"] == "connection_established"
+        websocket.send_json({"type": "subscribe", "topic": DIVISION_REPORTS_TOPIC})
+        reply = websocket.receive_json()
+        assert reply["type"] == "subscription_error"
+
+        websocket.send_json({"type": "subscribe", "topic": "nonsense"})
+        assert websocket.receive_json()["type"] == "subscription_error"
@@ -38,18 +38,11 @@ export const Navbar: React.FC = () => {
     const { triggerRefresh, isRefreshing } = useUserSyncControls();
 
     // WebSocket integration for real-time notification count updates
+    // The server pushes every change to the unread count as a counter delta
     useNotificationWebSocket({
-        onNewNotification: () => {
-            customLogger.debug("New notification received, updating count");
-            setNotificationsQuantity((prev) => prev + 1);
-        },
-        onNotificationArchived: () => {
-            customLogger.debug("Notification archived, updating count");
-            fetchNotificationsQuantity(); // Refresh to get accurate count
-        },
-        onNotificationUnarchived: () => {
-            customLogger.debug("Notification unarchived, updating count");
-            fetchNotificationsQuantity(); // Refresh to get accurate count
+        onCountersChanged: (delta) => {
+            customLogger.debug("Notification counters changed, updating count", delta);
+            setNotificationsQuantity((prev) => Math.max(prev + delta.unread, 0));
         },
         enabled: true,
     });
@@ -3,16 +3,26 @@ import { customLogger } from "@/lib/api/customLogger";
 import { Notification } from "@/lib/api/csclient";
 
 interface NotificationWebSocketEvent {
-    type: "new_notification" | "notification_archived" | "notification_unarchived";
+    type: "new_notification" | "notification_archived" | "notification_unarchived" | "notification_counters";
     notification_id: string;
     data: Record<string, unknown>;
     timestamp: number;
 }
 
+/**
+ * The change to the user's notification counters
+ */
+export interface NotificationCountersDelta {
+    unread: number;
+    important: number;
+    archived: number;
+}
+
 interface UseNotificationWebSocketProps {
     onNewNotification?: (notification: Notification) => void;
     onNotificationArchived?: (notificationId: string) => void;
     onNotificationUnarchived?: (notificationId: string) => void;
+    onCountersChanged?: (delta: NotificationCountersDelta) => void;
     enabled?: boolean;
 }
 
@@ -24,12 +34,14 @@ export function useNotificationWebSocket({
     onNewNotification,
     onNotificationArchived,
     onNotificationUnarchived,
+    onCountersChanged,
     enabled = true,
 }: UseNotificationWebSocketProps) {
     const handlersRef = useRef({
         onNewNotification,
         onNotificationArchived,
         onNotificationUnarchived,
+        onCountersChanged,
     });
 
     // Update handlers ref when props change
@@ -38,8 +50,9 @@ export function useNotificationWebSocket({
             onNewNotification,
             onNotificationArchived,
             onNotificationUnarchived,
+            onCountersChanged,
         };
-    }, [onNewNotification, onNotificationArchived, onNotificationUnarchived]);
+    }, [onNewNotification, onNotificationArchived, onNotificationUnarchived, onCountersChanged]);
 
     const handleNotificationEvent = useCallback(
         (event: CustomEvent<NotificationWebSocketEvent>) => {
@@ -69,6 +82,12 @@ export function useNotificationWebSocket({
                     }
                     break;
 
+                case "notification_counters":
+                    if (handlers.onCountersChanged) {
+                        handlers.onCountersChanged(data as unknown as NotificationCountersDelta);
+                    }
+                    break;
+
                 default:
                     customLogger.debug("Unknown notification WebSocket event type", type);
             }
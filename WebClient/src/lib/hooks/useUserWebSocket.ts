@@ -56,6 +56,19 @@ interface SchoolManagementMessage extends WebSocketMessage {
     timestamp: number;
 }
 
+interface NotificationCountersMessage extends WebSocketMessage {
+    type: "notification_counters";
+    data: { unread: number; important: number; archived: number };
+}
+
+/**
+ * Several messages coalesced by the server into one frame, in the order they were sent
+ */
+interface BatchMessage extends WebSocketMessage {
+    type: "batch";
+    messages: WebSocketMessage[];
+}
+
 interface ConnectionEstablishedMessage extends WebSocketMessage {
     type: "connection_established";
     user_id: string;
@@ -285,6 +298,21 @@ export function useUserWebSocket() {
                     break;
                 }
 
+                case "notification_counters": {
+                    const countersMsg = message as NotificationCountersMessage;
+                    window.dispatchEvent(
+                        new CustomEvent("websocket-notification", {
+                            detail: {
+                                type: "notification_counters",
+                                notification_id: "",
+                                data: countersMsg.data,
+                                timestamp: Date.now(),
+                            },
+                        })
+                    );
+                    break;
+                }
+
                 case "user_management": {
                     const userMgmtMsg = message as UserManagementMessage;
                     customLogger.info("Received user management WebSocket message", {
@@ -325,6 +353,12 @@ export function useUserWebSocket() {
                     break;
                 }
 
+                case "ping": {
+                    // Answer server heartbeats so the connection is not reaped
+                    sendMessage(JSON.stringify({ type: "pong", timestamp: Date.now() }));
+                    break;
+                }
+
                 case "pong": {
                     const pingTime = lastPingTimeRef.current;
                     if (pingTime > 0) {
@@ -338,7 +372,7 @@ export function useUserWebSocket() {
                     customLogger.debug("Unknown WebSocket message type", message.type);
             }
         },
-        [userInfo?.id, refreshUserData]
+        [userInfo?.id, refreshUserData, sendMessage]
     );
 
     /**
@@ -348,7 +382,10 @@ export function useUserWebSocket() {
         if (lastMessage?.data) {
             try {
                 const message: WebSocketMessage = JSON.parse(lastMessage.data);
-                handleMessage(message);
+                const messages = message.type === "batch" ? (message as BatchMessage).messages : [message];
+                for (const batchedMessage of messages) {
+                    handleMessage(batchedMessage);
+                }
             } catch (error) {
                 customLogger.error("Failed to parse WebSocket message", error);
             }